@@ -1,14 +1,16 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 import uvicorn
 import json
-import tempfile
 import os
+import time
 from main_integrated import LinkedInSourcingAgent
 from batch_processor import BatchJobProcessor
+from candidate_scorer import validate_weights
+from records import to_jsonable
 
 app = FastAPI(
     title="LinkedIn Sourcing Agent API",
@@ -25,8 +27,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize the agent
-agent = LinkedInSourcingAgent()
+# Initialize the agent; its caches live in CACHE_DB
+agent = LinkedInSourcingAgent(cache_db=os.getenv("CACHE_DB", "linkedin_cache.db"))
 
 # Pydantic models for request/response
 class JobDescriptionRequest(BaseModel):
@@ -51,6 +53,10 @@ class BatchJobResponse(BaseModel):
     total_candidates: int
     results: List[Dict]
 
+class RerankRequest(BaseModel):
+    weights: Dict[str, float]
+    top_k: Optional[int] = Field(None, ge=1)
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -62,6 +68,8 @@ async def root():
             "/process-job": "Process a single job description",
             "/process-pdf": "Process a job description PDF",
             "/batch-process": "Process multiple job descriptions",
+            "/candidates/{job_id}": "Stored candidates for a processed job",
+            "/candidates/{job_id}/rerank": "Re-rank stored candidates with new score weights",
             "/health": "Health check"
         }
     }
@@ -77,31 +85,26 @@ async def process_job_description(request: JobDescriptionRequest):
     Process a job description text and return candidates with scores and messages
     """
     try:
-        # Create a temporary file with the job description
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(request.job_description)
-            temp_file = f.name
+        # Parse the job description text once; no temporary file needed
+        job = agent.finder.job_description_from_text(request.job_description)
         
         # Process the job description
-        results = agent.process_job_description(
-            temp_file, 
+        results = agent.process_job(
+            job,
             max_candidates=request.max_candidates,
             max_messages=request.max_messages
         )
         
-        # Clean up temporary file
-        os.unlink(temp_file)
-        
         if "error" in results:
             raise HTTPException(status_code=400, detail=results["error"])
         
         # Format response
         response = {
-            "job_id": "job_" + str(hash(request.job_description))[:8],
+            "job_id": "job_" + job.job_id,
             "candidates_found": results["candidates_found"],
-            "top_candidates": results["top_candidates"],
-            "outreach_messages": results.get("messages", []),
-            "message_summary": results.get("message_summary", {})
+            "top_candidates": to_jsonable(results.get("top_candidates", [])),
+            "outreach_messages": to_jsonable(results.get("messages", [])),
+            "message_summary": to_jsonable(results.get("message_summary", {}))
         }
         
         return response
@@ -123,32 +126,30 @@ async def process_pdf_job(
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="File must be a PDF")
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as f:
-            content = await file.read()
-            f.write(content)
-            temp_file = f.name
+        # Extract text straight from the uploaded bytes (repeat uploads hit the PDF text cache)
+        content = await file.read()
+        text = agent.finder.extract_text_from_pdf_bytes(content)
+        if not text:
+            raise HTTPException(status_code=400, detail="Failed to extract job description from PDF")
         
-        # Process the PDF
-        results = agent.process_job_description(
-            temp_file,
+        # Process the parsed job description
+        job = agent.finder.job_description_from_text(text, source=file.filename)
+        results = agent.process_job(
+            job,
             max_candidates=max_candidates,
             max_messages=max_messages
         )
         
-        # Clean up temporary file
-        os.unlink(temp_file)
-        
         if "error" in results:
             raise HTTPException(status_code=400, detail=results["error"])
         
         # Format response
         response = {
-            "job_id": "pdf_" + file.filename.replace('.pdf', ''),
+            "job_id": "job_" + job.job_id,
             "candidates_found": results["candidates_found"],
-            "top_candidates": results["top_candidates"],
-            "outreach_messages": results.get("messages", []),
-            "message_summary": results.get("message_summary", {})
+            "top_candidates": to_jsonable(results.get("top_candidates", [])),
+            "outreach_messages": to_jsonable(results.get("messages", [])),
+            "message_summary": to_jsonable(results.get("message_summary", {}))
         }
         
         return response
@@ -162,26 +163,14 @@ async def batch_process_jobs(request: BatchJobRequest):
     Process multiple job descriptions in parallel
     """
     try:
-        # Create temporary files for each job description
-        temp_files = []
-        for i, job_desc in enumerate(request.job_descriptions):
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-                f.write(job_desc)
-                temp_files.append(f.name)
-        
-        # Initialize batch processor
-        processor = BatchJobProcessor(
-            max_workers=request.max_workers,
-            min_delay=2.0,
-            max_delay=5.0
-        )
+        # Parse each job description once up front
+        jobs = [agent.finder.job_description_from_text(job_desc) for job_desc in request.job_descriptions]
         
-        # Process jobs in batch
-        batch_results = processor.process_jobs_in_batch(temp_files)
+        # Initialize batch processor on the app's agent rather than a new one per request
+        processor = BatchJobProcessor(max_workers=request.max_workers, agent=agent)
         
-        # Clean up temporary files
-        for temp_file in temp_files:
-            os.unlink(temp_file)
+        # Process jobs in batch
+        batch_results = processor.process_jobs_in_batch(jobs)
         
         # Calculate totals
         total_candidates = sum(result["candidates_found"] for result in batch_results)
@@ -197,20 +186,43 @@ async def batch_process_jobs(request: BatchJobRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in batch processing: {str(e)}")
 
+def _stored_job_id(job_id: str) -> str:
+    """Score store key for a job_id as returned by /process-job and /process-pdf ("job_<content hash>")"""
+    return job_id[len("job_"):] if job_id.startswith("job_") else job_id
+
+def _ranked_candidates(job_id: str, weights: Optional[Dict[str, float]], top_k: Optional[int]) -> Dict:
+    start = time.perf_counter()
+    try:
+        weights = validate_weights(weights)
+        candidates = agent.score_store.rerank(_stored_job_id(job_id), weights, top_k)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job {job_id} not found. Process the job first using /process-job endpoint."
+        )
+    return {
+        "job_id": job_id,
+        "weights": weights,
+        "candidates": candidates,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+
 @app.get("/candidates/{job_id}")
-async def get_candidates(job_id: str):
+async def get_candidates(job_id: str, top_k: Optional[int] = Query(None, ge=1)):
     """
-    Get candidates for a specific job (if cached)
+    Get the stored candidates for a processed job, ranked with the current weights
     """
-    try:
-        # This would typically query a database
-        # For now, return a placeholder
-        return {
-            "job_id": job_id,
-            "message": "Candidates not found in cache. Process the job first using /process-job endpoint."
-        }
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return _ranked_candidates(job_id, agent.scorer.weights, top_k)
+
+@app.post("/candidates/{job_id}/rerank")
+async def rerank_candidates(job_id: str, request: RerankRequest):
+    """
+    Re-rank a processed job's candidates with a new weight vector, from the
+    stored per-dimension scores (no search, profile fetch or rescoring)
+    """
+    return _ranked_candidates(job_id, request.weights, request.top_k)
 
 @app.get("/stats")
 async def get_stats():
@@ -221,7 +233,11 @@ async def get_stats():
         "total_requests": 0,  # Would be tracked in production
         "successful_requests": 0,
         "average_response_time": 0,
-        "uptime": "100%"
+        "uptime": "100%",
+        "pdf_text_cache": agent.finder.pdf_cache.stats(),
+        "search_cache": agent.finder.search_cache.stats(),
+        "profile_cache": agent.scorer.profile_cache.stats(),
+        "rate_limits": agent.finder.http_client.rate_limiter.stats()
     }
 
 # Error handlers
@@ -1,52 +1,57 @@
 import os
 import json
-import time
-import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from main_integrated import LinkedInSourcingAgent
+from job_description import JobDescription
+from records import to_jsonable
 
 class BatchJobProcessor:
-    def __init__(self, max_workers: int = 3, min_delay: float = 2.0, max_delay: float = 5.0):
-        self.agent = LinkedInSourcingAgent()
+    def __init__(self, max_workers: int = 3, agent: Optional[LinkedInSourcingAgent] = None):
+        # Reuse a running agent (its scorer, caches and parser processes) when given one
+        self.agent = agent or LinkedInSourcingAgent()
         self.max_workers = max_workers
-        self.min_delay = min_delay
-        self.max_delay = max_delay
 
-    def process_single_job(self, pdf_path: str, job_id: Optional[str] = None) -> Dict:
+    def process_single_job(self, pdf_path: Union[str, JobDescription], job_id: Optional[str] = None) -> Dict:
         """
-        Process a single job description PDF and return minimal candidate data
+        Process a single job description (PDF path or parsed JobDescription) and return minimal candidate data
         """
-        print(f"\n[Batch] Processing job: {pdf_path}")
-        results = self.agent.process_job_description(pdf_path, max_candidates=10, max_messages=5)
+        print(f"\n[Batch] Processing job: {self._job_label(pdf_path)}")
+        if isinstance(pdf_path, JobDescription):
+            results = self.agent.process_job(pdf_path, max_candidates=10, max_messages=5)
+        else:
+            results = self.agent.process_job_description(pdf_path, max_candidates=10, max_messages=5)
         minimal_candidates = []
         for c in results.get('scored_candidates', []):
             minimal_candidates.append({
                 'name': c.get('name', ''),
                 'linkedin_url': c.get('linkedin_url', ''),
                 'fit_score': c.get('fit_score', 0),
-                'score_breakdown': c.get('score_breakdown', {}),
+                'score_breakdown': to_jsonable(c.get('score_breakdown', {})),
                 'headline': c.get('headline', '')
             })
         return {
-            'job_id': job_id or os.path.basename(pdf_path),
+            'job_id': job_id or self._job_label(pdf_path),
             'candidates_found': len(minimal_candidates),
             'candidates': minimal_candidates
         }
 
-    def process_jobs_in_batch(self, pdf_paths: List[str], output_file: str = "batch_results.json") -> List[Dict]:
+    def _job_label(self, job: Union[str, JobDescription]) -> str:
+        if isinstance(job, JobDescription):
+            return os.path.basename(job.source) if job.source else job.job_id
+        return os.path.basename(job)
+
+    def process_jobs_in_batch(self, pdf_paths: List[Union[str, JobDescription]], output_file: str = "batch_results.json") -> List[Dict]:
         """
-        Process multiple job descriptions in parallel, with rate limiting
+        Process multiple job descriptions in parallel.
+        Jobs are submitted at once; their HTTP calls are paced by the shared per-host rate limiter.
         """
         print(f"\n[Batch] Starting batch processing for {len(pdf_paths)} jobs...")
         results = []
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             future_to_job = {}
             for i, pdf_path in enumerate(pdf_paths):
-                # Add random delay to avoid rate limiting
-                delay = random.uniform(self.min_delay, self.max_delay)
-                print(f"[Batch] Scheduling job {i+1}/{len(pdf_paths)}: {pdf_path} (delay: {delay:.2f}s)")
-                time.sleep(delay)
+                print(f"[Batch] Scheduling job {i+1}/{len(pdf_paths)}: {self._job_label(pdf_path)}")
                 future = executor.submit(self.process_single_job, pdf_path, f"job_{i+1}")
                 future_to_job[future] = pdf_path
             for future in as_completed(future_to_job):
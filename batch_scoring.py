@@ -0,0 +1,273 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from candidate_scorer import (
+    AI_COMPANY_KEYWORDS, DEGREE_KEYWORDS, METRO_KEYWORDS, PROGRESSION_KEYWORDS,
+    STARTUP_KEYWORDS, TECHNICAL_SCHOOL_KEYWORDS, CandidateScorer, JobInput, JobRequirements, job_requirements
+)
+
+class StringColumn(NamedTuple):
+    """Dictionary-encoded strings: row i is categories[codes[i]]"""
+    categories: List[str]
+    codes: np.ndarray
+
+
+class ListColumn(NamedTuple):
+    """One list of strings per candidate: candidate i owns values rows offsets[i]:offsets[i + 1]"""
+    values: StringColumn
+    offsets: np.ndarray
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+
+class _Encoder:
+    """Builds a StringColumn by assigning each distinct string a code on first sight"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.codes: List[int] = []
+
+    def add(self, value: str):
+        self.codes.append(self.index.setdefault(value, len(self.index)))
+
+    def extend(self, values: Iterable[str]):
+        index = self.index
+        self.codes.extend(index.setdefault(value, len(index)) for value in values)
+
+    def column(self) -> StringColumn:
+        return StringColumn(list(self.index), np.array(self.codes, dtype=np.intp))
+
+
+class CandidateColumns:
+    """
+    The profile fields scoring reads, stored column-wise for a whole pool.
+
+    Strings are dictionary-encoded, so each distinct school, company, skill,
+    headline or location is classified once however many candidates share
+    it, and per-candidate work is plain array indexing. Pools kept in a
+    columnar store can be built directly from their codes; from_profiles()
+    converts profile_data dicts.
+    """
+
+    def __init__(self, headline: StringColumn, location: StringColumn,
+                 education: ListColumn, experience: ListColumn, skills: ListColumn):
+        self.headline = headline
+        self.location = location
+        self.education = education
+        self.experience = experience
+        self.skills = skills
+        self.size = len(headline.codes)
+
+    @classmethod
+    def from_profiles(cls, profiles: Iterable[Dict]) -> 'CandidateColumns':
+        headline, location = _Encoder(), _Encoder()
+        lists = {'education': _Encoder(), 'experience': _Encoder(), 'skills': _Encoder()}
+        lengths = {name: [] for name in lists}
+        for profile in profiles:
+            headline.add(profile.get('headline') or '')
+            location.add(profile.get('location') or '')
+            for name, encoder in lists.items():
+                values = profile.get(name) or ()
+                encoder.extend(values)
+                lengths[name].append(len(values))
+
+        def list_column(name: str) -> ListColumn:
+            offsets = np.zeros(len(lengths[name]) + 1, dtype=np.intp)
+            np.cumsum(lengths[name], out=offsets[1:])
+            return ListColumn(lists[name].column(), offsets)
+
+        return cls(headline.column(), location.column(),
+                   list_column('education'), list_column('experience'), list_column('skills'))
+
+
+def _lowered(categories: List[str]) -> np.ndarray:
+    # str.lower, not np.strings.lower, so case folding matches the per-candidate path exactly
+    return np.array([value.lower() for value in categories], dtype=np.dtypes.StringDType())
+
+
+def _contains_any(strings: np.ndarray, keywords: Iterable[str]) -> np.ndarray:
+    """Per string: does any keyword occur in it as a substring"""
+    found = np.zeros(len(strings), dtype=bool)
+    for keyword in keywords:
+        found |= np.strings.find(strings, keyword) >= 0
+    return found
+
+
+def _segment_max(values: np.ndarray, offsets: np.ndarray, initial: float) -> np.ndarray:
+    """Maximum of each candidate's values (at least initial)"""
+    out = np.full(len(offsets) - 1, initial, dtype=values.dtype)
+    starts = offsets[:-1]
+    nonempty = offsets[1:] > starts
+    if nonempty.any():
+        out[nonempty] = np.maximum(np.maximum.reduceat(values, starts[nonempty]), initial)
+    return out
+
+
+def _segment_sum(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    cumulative = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(values, out=cumulative[1:])
+    return cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+
+def _round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Python's round() applied elementwise.
+
+    np.round scales, rounds and divides, which differs from the correctly
+    rounded builtin in the last digit for some inputs. Totals take few
+    distinct values, so rounding each distinct value in Python is cheap.
+    """
+    distinct, inverse = np.unique(values, return_inverse=True)
+    return np.array([round(value, ndigits) for value in distinct.tolist()])[inverse]
+
+
+class BatchScorer:
+    """
+    Scores a whole candidate pool with array operations.
+
+    Gives the same six dimension scores and weighted total as
+    CandidateScorer.calculate_fit_score, bit for bit, using the scorer's
+    weights and school and company vocabularies. Each distinct string is classified once
+    with vectorized substring searches, per-candidate maxima and counts are
+    segment reductions over the list columns, and the total is summed in
+    the same order as the per-candidate path so floating-point results
+    agree. Profiles must already be fetched.
+    """
+
+    def __init__(self, scorer: Optional[CandidateScorer] = None):
+        self.scorer = scorer or CandidateScorer()
+
+    def _school_scores(self, schools: np.ndarray) -> np.ndarray:
+        scores = np.where(_contains_any(schools, self.scorer.elite_schools), 9.5,
+                          np.where(_contains_any(schools, TECHNICAL_SCHOOL_KEYWORDS), 7.5, 6.0))
+        return scores + np.where(_contains_any(schools, DEGREE_KEYWORDS), 1.0, 0.0)
+
+    def _company_scores(self, companies: np.ndarray) -> np.ndarray:
+        return np.select(
+            [_contains_any(companies, self.scorer.top_tech_companies),
+             _contains_any(companies, AI_COMPANY_KEYWORDS),
+             _contains_any(companies, STARTUP_KEYWORDS)],
+            [9.0, 8.0, 7.0],
+            6.0
+        )
+
+    @staticmethod
+    def _title_levels(titles: np.ndarray) -> np.ndarray:
+        levels = np.zeros(len(titles), dtype=np.int64)
+        for i, keyword in enumerate(PROGRESSION_KEYWORDS):
+            # Later keywords rank higher, so the last match is the maximum
+            levels[np.strings.find(titles, keyword) >= 0] = i + 1
+        return levels
+
+    @staticmethod
+    def _location_scores(locations: np.ndarray, requirements: JobRequirements) -> np.ndarray:
+        fallback = 6.0 if requirements.remote else 5.0
+        scores = np.select(
+            [_contains_any(locations, requirements.locations), _contains_any(locations, METRO_KEYWORDS)],
+            [10.0, 8.0],
+            fallback
+        )
+        return np.where(locations == '', 6.0, scores)
+
+    def score_columns(self, columns: CandidateColumns, job_description: JobInput) -> Dict[str, np.ndarray]:
+        """Arrays of the six dimension scores and 'total_score', one entry per candidate"""
+        requirements = job_requirements(job_description)
+        education, experience, skills = columns.education, columns.experience, columns.skills
+        has_education = education.lengths() > 0
+        has_experience = experience.lengths() > 0
+
+        school_scores = self._school_scores(_lowered(education.values.categories))
+        education_score = np.where(
+            has_education,
+            np.minimum(_segment_max(school_scores[education.values.codes], education.offsets, 0.0), 10.0),
+            5.0
+        )
+
+        experience_lower = _lowered(experience.values.categories)
+        levels = np.maximum(
+            _segment_max(self._title_levels(experience_lower)[experience.values.codes], experience.offsets, 0),
+            self._title_levels(_lowered(columns.headline.categories))[columns.headline.codes]
+        )
+        trajectory_score = np.where(
+            has_experience,
+            np.select([levels >= 4, levels >= 3, levels >= 2], [9.0, 7.5, 6.5], 5.0),
+            5.0
+        )
+
+        company_scores = self._company_scores(experience_lower)
+        company_score = np.where(
+            has_experience,
+            np.minimum(_segment_max(company_scores[experience.values.codes], experience.offsets, 0.0), 10.0),
+            5.0
+        )
+
+        in_job = np.fromiter(map(requirements.mentions, skills.values.categories), dtype=np.int64,
+                             count=len(skills.values.categories))
+        matching = _segment_sum(in_job[skills.values.codes], skills.offsets)
+        skills_score = np.select([matching >= 5, matching >= 3, matching >= 1], [9.5, 8.0, 6.5], 5.0)
+
+        location_score = self._location_scores(
+            _lowered(columns.location.categories), requirements
+        )[columns.location.codes]
+
+        count = experience.lengths()
+        tenure_score = np.where(
+            has_experience,
+            np.select([count <= 2, count <= 4, count <= 6], [9.0, 7.0, 5.0], 3.0),
+            5.0
+        )
+
+        scores = {
+            'education': education_score,
+            'trajectory': trajectory_score,
+            'company': company_score,
+            'skills': skills_score,
+            'location': location_score,
+            'tenure': tenure_score,
+        }
+        # Left-to-right sum of the weighted terms with the scorer's weights, exactly as calculate_fit_score adds them
+        total = np.zeros(columns.size)
+        for name, weight in self.scorer.weights.items():
+            total = total + scores[name] * weight
+        # Dimension scores are exact in binary (x.0 or x.5), so only the total needs rounding
+        scores['total_score'] = _round(total, 2)
+        return scores
+
+    def calculate_fit_scores(self, candidates: List[Dict], job_description: JobInput) -> List[Dict]:
+        """calculate_fit_score for every candidate, in input order"""
+        profiles = [candidate['profile_data'] for candidate in candidates]
+        scores = self.score_columns(CandidateColumns.from_profiles(profiles), job_description)
+        totals = scores.pop('total_score').tolist()
+        breakdowns = {name: values.tolist() for name, values in scores.items()}
+        return [
+            {
+                'total_score': totals[i],
+                'breakdown': {name: values[i] for name, values in breakdowns.items()},
+                'profile_data': profile
+            }
+            for i, profile in enumerate(profiles)
+        ]
+
+    def score_candidates(self, candidates: List[Dict], job_description: JobInput) -> List[Dict]:
+        """
+        Same ranking as CandidateScorer.score_candidates; missing profiles are
+        fetched concurrently first
+        """
+        if any('profile_data' not in c for c in candidates):
+            self.scorer.http_client.run(self.scorer.fetch_profiles(candidates))
+        results = self.calculate_fit_scores(candidates, job_description)
+        scored_candidates = [
+            {
+                'name': candidate.get('name', 'Unknown'),
+                'linkedin_url': candidate.get('linkedin_url', ''),
+                'headline': candidate.get('headline', ''),
+                'fit_score': result['total_score'],
+                'score_breakdown': result['breakdown'],
+                'profile_data': result['profile_data']
+            }
+            for candidate, result in zip(candidates, results)
+        ]
+        scored_candidates.sort(key=lambda x: x['fit_score'], reverse=True)
+        return scored_candidates
@@ -0,0 +1,934 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the sourcing pipeline
+Run all benchmarks with `python benchmarks.py`, or pick some by name:
+`python benchmarks.py pdf`
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+def timed(func: Callable, repeat: int = 3) -> float:
+    """Best-of-N wall time in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_synthetic_pdf(num_pages: int, lines_per_page: int = 45) -> bytes:
+    """Build a text-only PDF with Helvetica pages of job-description-like lines"""
+    line = "Gen AI Solution Architect with Python, PyTorch, LLM and AWS experience in Bangalore"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for page in range(num_pages):
+        ops = ["BT", "/F1 10 Tf", "12 TL", "40 800 Td"]
+        for i in range(lines_per_page):
+            ops.append(f"({line} - page {page + 1} line {i + 1}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % num_pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+def bench_pdf():
+    """Compare PDF backends, serial vs page-parallel, on bundled and synthetic PDFs"""
+    from pdf_extraction import PDFTextExtractor, available_backends
+
+    documents = {}
+    for path in ["Job_Description.pdf", "Data & AI-JD-Gen AI Solution architect.pdf"]:
+        with open(path, 'rb') as f:
+            documents[path] = f.read()
+    for pages in [50, 200]:
+        documents[f"synthetic {pages} pages"] = make_synthetic_pdf(pages)
+
+    print(f"CPU cores: {os.cpu_count()} (page-parallel only pays off with more than one)")
+    print(f"{'document':<45} {'backend':<10} {'workers':>7} {'seconds':>9} {'chars':>9}")
+    for label, data in documents.items():
+        for backend in available_backends():
+            for workers in [1, 4]:
+                extractor = PDFTextExtractor(backend=backend, workers=workers)
+                text = extractor.extract(data)[0]
+                seconds = timed(lambda: extractor.extract(data), repeat=2)
+                print(f"{label:<45} {backend:<10} {workers:>7} {seconds:>9.3f} {len(text):>9}")
+
+
+def _run_cache_workload(read: Callable, write: Callable, seconds: float = 3.0,
+                        readers: int = 4, writers: int = 4) -> Dict:
+    """Hammer a cache with concurrent readers and writers; collect read latencies"""
+    import threading
+
+    stop = threading.Event()
+    latencies: List[float] = []
+    counts = {'writes': 0, 'locked': 0}
+    lock = threading.Lock()
+    payload = json.dumps([{"name": f"Candidate {i}", "linkedin_url": f"https://www.linkedin.com/in/c{i}",
+                           "headline": "ML Engineer"} for i in range(50)])
+
+    def reader(worker: int):
+        i = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                read(f"query {worker}-{i % 200}")
+            except sqlite3.OperationalError:
+                with lock:
+                    counts['locked'] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+            i += 1
+
+    def writer(worker: int):
+        i = 0
+        while not stop.is_set():
+            try:
+                write(f"query {worker}-{i % 200}", payload)
+                with lock:
+                    counts['writes'] += 1
+            except sqlite3.OperationalError:
+                with lock:
+                    counts['locked'] += 1
+            i += 1
+
+    threads = [threading.Thread(target=reader, args=(w,)) for w in range(readers)]
+    threads += [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        'reads': len(latencies), 'writes': counts['writes'], 'locked_errors': counts['locked'],
+        'read_p50_ms': pick(0.50), 'read_p99_ms': pick(0.99), 'read_max_ms': latencies[-1] * 1000,
+    }
+
+
+def bench_sqlite():
+    """Concurrent cache reads vs writes: connect-per-call rollback journal vs the pooled WAL caches' real get()/put()"""
+    from pdf_cache import PDFTextCache
+    from profile_cache import ProfileCache
+    from search_cache import TieredCache
+
+    schema = "CREATE TABLE IF NOT EXISTS cache (query TEXT PRIMARY KEY, results TEXT, timestamp DATETIME)"
+    select = "SELECT results FROM cache WHERE query = ? AND timestamp > datetime('now', '-1 day')"
+    insert = "INSERT OR REPLACE INTO cache (query, results, timestamp) VALUES (?, ?, ?)"
+
+    legacy_path = os.path.join(tempfile.mkdtemp(), "legacy.db")
+    with sqlite3.connect(legacy_path) as conn:
+        conn.execute(schema)
+
+    def legacy_read(query):
+        with sqlite3.connect(legacy_path) as conn:
+            conn.execute(select, (query,)).fetchone()
+
+    def legacy_write(query, results):
+        with sqlite3.connect(legacy_path) as conn:
+            conn.execute(insert, (query, results, datetime.now()))
+
+    def search_cache(touch_interval):
+        # No memory tier, so every hit is a SQLite read
+        cache = TieredCache(os.path.join(tempfile.mkdtemp(), "search.db"), memory_entries=0,
+                            touch_interval=touch_interval)
+        return cache.get, lambda query, results: cache.put(query, results)
+
+    pdf = PDFTextCache(os.path.join(tempfile.mkdtemp(), "pdf.db"))
+    profiles = ProfileCache(os.path.join(tempfile.mkdtemp(), "profiles.db"))
+
+    workloads = [
+        ("connect-per-call, rollback", legacy_read, legacy_write),
+        ("search cache, touch every hit", *search_cache(0.0)),
+        ("search cache, touch after 60s", *search_cache(60.0)),
+        ("PDF text cache", lambda query: pdf.get(query, "v1"),
+         lambda query, results: pdf.put(query, results, 1, "v1")),
+        ("profile cache", profiles.get,
+         lambda query, results: profiles.put(query, {'summary': results})),
+    ]
+    print(f"{'mode':<30} {'reads':>8} {'writes':>8} {'locked':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, read, write in workloads:
+        r = _run_cache_workload(read, write)
+        print(f"{label:<30} {r['reads']:>8} {r['writes']:>8} {r['locked_errors']:>7} "
+              f"{r['read_p50_ms']:>8.3f} {r['read_p99_ms']:>8.3f} {r['read_max_ms']:>8.3f}")
+
+
+def bench_search_cache():
+    """Hot search-cache lookups: memory tier vs SQLite tier"""
+    from search_cache import TieredCache
+
+    results = [{"name": f"Candidate {i}", "linkedin_url": f"https://www.linkedin.com/in/c{i}",
+                "headline": "ML Engineer"} for i in range(10)]
+    lookups = 20000
+    for label, memory_entries in [("SQLite tier only", 0), ("memory tier", 1024)]:
+        cache = TieredCache(os.path.join(tempfile.mkdtemp(), "cache.db"), memory_entries=memory_entries)
+        for i in range(100):
+            cache.put(f"query {i}", results)
+        seconds = timed(lambda: [cache.get(f"query {i % 100}") for i in range(lookups)], repeat=1)
+        print(f"{label:<18} {seconds / lookups * 1e6:>8.1f} µs/lookup  {cache.stats()}")
+
+
+def _legacy_extract_job_terms(job_description: str) -> Dict:
+    """Pre-compiled-extractor implementation: one re.search/re.findall per pattern"""
+    # First try to extract the exact job title from common patterns
+    title_patterns = [
+        r'Role:\s*(.*?)\n',
+        r'Proposed Role:\s*(.*?)\n',
+        r'Title:\s*(.*?)\n',
+        r'Position:\s*(.*?)\n',
+        r'Job Title:\s*(.*?)\n',
+        r'AI Engineer\s*-\s*(.*?)\n'
+    ]
+
+    title = None
+    for pattern in title_patterns:
+        match = re.search(pattern, job_description, re.IGNORECASE)
+        if match:
+            title = match.group(1).strip()
+            break
+
+    # If no explicit title found, look for Gen AI Solution Architect patterns
+    if not title:
+        title_matches = re.findall(
+            r'(Gen(?:erative)?\s*AI\s*Solution\s*Architect|'
+            r'AI\s*(?:Solution\s*)?Architect|'
+            r'Artificial\s*Intelligence\s*Solution\s*Architect)',
+            job_description,
+            re.IGNORECASE
+        )
+        if title_matches:
+            title = title_matches[0]
+        else:
+            title = "Gen AI Solution Architect"  # Default fallback
+
+    # Extract skills - expanded list focused on AI/ML
+    skills = re.findall(
+        r'(Python|Java|TensorFlow|PyTorch|LLM|GPT|NLP|Natural\s*Language\s*Processing|'
+        r'Machine\s*Learning|Deep\s*Learning|Computer\s*Vision|Generative\s*AI|'
+        r'AWS|Azure|GCP|Docker|Kubernetes|Spark|Hadoop|LangChain|Hugging\s*Face|'
+        r'LLaMA|GPT-4|Transformers|Neural\s*Networks)',
+        job_description,
+        re.IGNORECASE
+    )
+    skills = list(dict.fromkeys(s.capitalize() for s in skills))  # Dedupe and standardize
+
+    # Extract locations - expanded list
+    locations = re.findall(
+        r'(San\s*Francisco|SF|New\s*York|NYC|Mountain\s*View|Remote|'
+        r'Austin|Seattle|Boston|Chicago|Pan\s*India|India|Bangalore|'
+        r'Hyderabad|Pune|Chennai|Delhi|NCR|Gurgaon)',
+        job_description,
+        re.IGNORECASE
+    )
+
+    return {
+        'title': title,
+        'skills': skills,
+        'locations': list(dict.fromkeys(locations))
+    }
+
+
+def _synthetic_job_descriptions(count: int) -> List[str]:
+    import random
+    rng = random.Random(7)
+    titles = ["Role: Senior ML Engineer", "Position: Data Scientist", "Job Title: AI Architect",
+              "Proposed Role: Gen AI Solution Architect", "AI Engineer - NLP Platform"]
+    skills = ["Python", "PyTorch", "TensorFlow", "LLM", "Machine Learning", "Deep Learning", "AWS",
+              "Kubernetes", "Hugging Face", "GPT-4", "Spark", "Computer Vision"]
+    places = ["Bangalore", "Remote", "San Francisco", "Pune", "New York", "Seattle"]
+    filler = ("We are a global technology consulting company helping enterprises reimagine "
+              "business models and accelerate innovation through digital transformation. ")
+    jds = []
+    for _ in range(count):
+        lines = [rng.choice(titles), f"Location: {rng.choice(places)}"]
+        lines += [filler * 3 + f"Experience with {', '.join(rng.sample(skills, 4))}." for _ in range(8)]
+        jds.append("\n".join(lines) + "\n")
+    return jds
+
+
+def bench_terms():
+    """Search-term extraction: per-pattern regex scans vs compiled single-pass extractor"""
+    from term_extractor import get_term_extractor
+
+    extractor = get_term_extractor()
+    with open("Data & AI-JD-Gen AI Solution architect.pdf", 'rb') as f:
+        from pdf_extraction import PDFTextExtractor
+        bundled = PDFTextExtractor().extract(f.read())[0]
+    long_jd = bundled * 200
+    batch = _synthetic_job_descriptions(5000)
+
+    cases = [
+        ("bundled JD (%d chars)" % len(bundled), [bundled], 200),
+        ("long JD (%d chars)" % len(long_jd), [long_jd], 3),
+        ("batch of %d JDs" % len(batch), batch, 1),
+    ]
+    print(f"{'workload':<32} {'legacy s':>10} {'compiled s':>11} {'speedup':>8} {'JDs/s':>10}")
+    for label, texts, repeat in cases:
+        legacy = timed(lambda: [_legacy_extract_job_terms(t) for t in texts for _ in range(repeat)], repeat=1)
+        compiled = timed(lambda: [extractor.extract(t) for t in texts for _ in range(repeat)], repeat=1)
+        print(f"{label:<32} {legacy:>10.4f} {compiled:>11.4f} {legacy / compiled:>7.1f}x "
+              f"{len(texts) * repeat / compiled:>10.0f}")
+
+
+SERP_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "serp")
+
+
+def bench_serp():
+    """Results-page parsing: full BeautifulSoup tree vs strainer vs streaming parser, per fixture page"""
+    from serp_parser import PARSERS
+
+    names = list(PARSERS)
+    print(f"{'page':<28} {'KB':>6} " + ' '.join(f"{name + ' ms':>12}" for name in names) + f" {'speedup':>8} {'same':>5}")
+    totals = dict.fromkeys(names, 0.0)
+    for filename in sorted(os.listdir(SERP_FIXTURES)):
+        with open(os.path.join(SERP_FIXTURES, filename), encoding='utf-8') as f:
+            html = f.read()
+        times = {}
+        for name, parser in PARSERS.items():
+            times[name] = timed(lambda: parser.parse(html, 10), repeat=5)
+            totals[name] += times[name]
+        same = PARSERS['stream'].parse(html, 10) == PARSERS['soup'].parse(html, 10)
+        print(f"{filename:<28} {len(html) / 1024:>6.0f} " + ' '.join(f"{times[n] * 1000:>12.2f}" for n in names)
+              + f" {times['soup'] / times['stream']:>7.1f}x {'yes' if same else 'NO':>5}")
+    print(f"{'total':<28} {'':>6} " + ' '.join(f"{totals[n] * 1000:>12.2f}" for n in names)
+          + f" {totals['soup'] / totals['stream']:>7.1f}x")
+
+
+def make_synthetic_profile_page(positions: int = 12, seed: int = 0) -> str:
+    """LinkedIn-style public profile HTML: inline scripts, experience, education and skills sections"""
+    import random
+    rng = random.Random(seed)
+    companies = ["Google", "Microsoft", "Infosys", "OpenAI", "Accenture", "Databricks", "Startup Labs", "TCS"]
+    schools = ["Stanford University", "IIT Bombay", "MIT", "University of Pune", "Georgia Tech"]
+    phrases = [
+        "Built retrieval-augmented generation pipelines with LangChain and GPT-4 on Azure",
+        "Led a team of 8 engineers shipping PyTorch models to Kubernetes on AWS",
+        "Designed feature stores in Spark and Airflow for real-time recommendations",
+        "Fine-tuned BERT and LLaMA models for document understanding in R&D",
+        "Migrated C++ inference services to CUDA, cutting GPU costs by 40%",
+        "Mentored analysts on scikit-learn, pandas and NumPy best practices",
+        "Drove stakeholder alignment for a transformation programme across regions",
+    ]
+    script = "window.__como_rehydration__ = " + json.dumps([{"k": i, "v": rng.random()} for i in range(3000)])
+    experience = ''.join(
+        f'<li class="experience-item"><h3>{rng.choice(companies)}</h3><h4>Senior Engineer</h4>'
+        f'<p class="show-more-less-text">{" ".join(rng.sample(phrases, 4))}</p></li>'
+        for _ in range(positions)
+    )
+    education = ''.join(f'<li><h3>{school}</h3><h4>M.S. Computer Science</h4></li>'
+                        for school in rng.sample(schools, 2))
+    skills = ''.join(f'<li>{skill}</li>' for skill in ["Python", "Machine Learning", "Deep Learning", "MLflow",
+                                                          "Hugging Face", "Docker", "TensorFlow", "Matlab"])
+    return (
+        f'<html><head><title>Asha Rao | LinkedIn</title><script>{script}</script></head><body>'
+        f'<div class="text-body-medium">AI Architect | LLMs, MLOps | Ex-Google</div>'
+        f'<span class="text-body-small">Bengaluru, Karnataka, India</span>'
+        f'<section id="about"><p>{" ".join(phrases * 3)}</p></section>'
+        f'<section id="experience"><ul>{experience}</ul></section>'
+        f'<section id="education"><ul>{education}</ul></section>'
+        f'<section id="skills"><ul>{skills}</ul></section></body></html>'
+    )
+
+
+def _synthetic_skill_vocabulary(count: int) -> List[str]:
+    """Skill-like phrases of 1-3 words, padded out from the scorer's real vocabulary"""
+    import random
+    from candidate_scorer import CandidateScorer
+    rng = random.Random(14)
+    real = sorted(CandidateScorer().ai_ml_skills)
+    stems = ["data", "cloud", "graph", "vector", "stream", "edge", "neural", "quantum", "model", "signal",
+             "search", "agent", "prompt", "policy", "sensor", "robot", "speech", "vision", "fraud", "risk"]
+    suffixes = ["ops", "net", "db", "flow", "kit", "lab", "hub", "core", "ml", "ai", "js", "io"]
+    vocab = set(real)
+    while len(vocab) < count:
+        words = [rng.choice(stems) + rng.choice(suffixes) for _ in range(rng.choice((1, 1, 2, 3)))]
+        vocab.add(' '.join(words) if rng.random() < 0.8 else '-'.join(words))
+    return sorted(vocab)
+
+
+def bench_skills():
+    """Profile skill detection: per-skill substring scans vs the token-trie SkillMatcher"""
+    from bs4 import BeautifulSoup
+    from skill_matcher import SkillMatcher
+
+    pages = [
+        ("typical profile", make_synthetic_profile_page(positions=12)),
+        ("long profile", make_synthetic_profile_page(positions=150, seed=1)),
+    ]
+    vocabularies = [(n, _synthetic_skill_vocabulary(n)) for n in (60, 1000, 10000, 50000)]
+
+    print(f"{'page':<16} {'text KB':>8} {'skills':>7} {'build s':>8} {'substring ms':>13} "
+          f"{'matcher ms':>11} {'speedup':>8} {'found':>12}")
+    for label, html in pages:
+        soup = BeautifulSoup(html, 'html.parser')
+        legacy_text = soup.get_text().lower()
+        text = soup.get_text(' ')
+        for size, vocab in vocabularies:
+            start = time.perf_counter()
+            matcher = SkillMatcher(vocab)
+            build = time.perf_counter() - start
+            substring = timed(lambda: [skill for skill in vocab if skill in legacy_text])
+            matched = timed(lambda: matcher.find(text))
+            found_legacy = len([skill for skill in vocab if skill in legacy_text])
+            found = len(matcher.find(text))
+            print(f"{label:<16} {len(text) / 1024:>8.0f} {size:>7} {build:>8.3f} {substring * 1000:>13.2f} "
+                  f"{matched * 1000:>11.2f} {substring / matched:>7.1f}x {f'{found_legacy} -> {found}':>12}")
+
+
+SYNTHETIC_SCHOOLS = [
+    "Stanford University", "MIT", "University of Washington", "State College", "IIT Bombay",
+    "Georgia Institute of Technology", "Community College", "Coding Bootcamp", "UC Berkeley - Computer Science",
+]
+SYNTHETIC_COMPANIES = [
+    "Google", "Acme Inc", "Senior Engineer at DataCo", "Lead ML Engineer, Nvidia", "Principal Scientist",
+    "Bank of Somewhere", "Director of AI, Retail Corp", "Startup Labs", "Consultant", "Head of Platform",
+]
+SYNTHETIC_SKILLS = [
+    "python", "pytorch", "aws", "llm", "kubernetes", "java", "excel", "spark", "r", "c++", "sql", "docker",
+]
+SYNTHETIC_LOCATIONS = [
+    "San Francisco, CA", "Bay Area", "New York, NY", "Bengaluru, India", "Berlin", "Remote", "", "Austin, TX",
+]
+SYNTHETIC_HEADLINES = ["ML Engineer", "Senior Data Scientist", "Engineering Manager", "Student", ""]
+
+
+def iter_synthetic_profiles(count: int, seed: int = 0) -> Iterator[Dict]:
+    """profile_data dicts drawn from small vocabularies, as a scored pool looks after deduplication"""
+    import random
+
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {
+            'headline': rng.choice(SYNTHETIC_HEADLINES),
+            'location': rng.choice(SYNTHETIC_LOCATIONS),
+            'education': rng.sample(SYNTHETIC_SCHOOLS, rng.randint(0, 3)),
+            'experience': rng.sample(SYNTHETIC_COMPANIES, rng.randint(0, 8)),
+            'skills': rng.sample(SYNTHETIC_SKILLS, rng.randint(0, 8)),
+        }
+
+
+def make_synthetic_profiles(count: int, seed: int = 0) -> List[Dict]:
+    return list(iter_synthetic_profiles(count, seed))
+
+
+def make_synthetic_columns(count: int, seed: int = 0):
+    """The same kind of pool as make_synthetic_profiles, generated straight into CandidateColumns"""
+    import numpy as np
+    from batch_scoring import CandidateColumns, ListColumn, StringColumn
+
+    rng = np.random.default_rng(seed)
+
+    def strings(vocabulary: List[str], rows: int) -> StringColumn:
+        return StringColumn(vocabulary, rng.integers(0, len(vocabulary), rows))
+
+    def lists(vocabulary: List[str], max_length: int) -> ListColumn:
+        lengths = rng.integers(0, max_length + 1, count)
+        offsets = np.zeros(count + 1, dtype=np.intp)
+        np.cumsum(lengths, out=offsets[1:])
+        return ListColumn(strings(vocabulary, int(offsets[-1])), offsets)
+
+    return CandidateColumns(
+        strings(SYNTHETIC_HEADLINES, count), strings(SYNTHETIC_LOCATIONS, count),
+        lists(SYNTHETIC_SCHOOLS, 3), lists(SYNTHETIC_COMPANIES, 8), lists(SYNTHETIC_SKILLS, 8)
+    )
+
+
+def bench_batch_scoring():
+    """Candidate scoring: calculate_fit_score per candidate vs the NumPy BatchScorer"""
+    from batch_scoring import BatchScorer, CandidateColumns
+    from candidate_scorer import CandidateScorer
+
+    tmpdir = tempfile.mkdtemp()
+    scorer = CandidateScorer(cache_db=os.path.join(tmpdir, "cache.db"))
+    batch = BatchScorer(scorer)
+    job = "Senior ML Engineer in San Francisco or remote. Python, PyTorch, AWS, LLM, Kubernetes, Spark."
+
+    print(f"{'rows':>9} {'per-candidate/s':>16} {'dicts->columns/s':>17} {'batch/s':>12} {'speedup':>8}")
+    for rows in (1_000, 100_000, 1_000_000):
+        if rows <= 100_000:
+            candidates = [{'profile_data': p} for p in make_synthetic_profiles(rows)]
+            per_candidate = timed(lambda: [scorer.calculate_fit_score(c, job) for c in candidates], repeat=1)
+            profiles = [c['profile_data'] for c in candidates]
+            encode = timed(lambda: CandidateColumns.from_profiles(profiles), repeat=1)
+            columns = CandidateColumns.from_profiles(profiles)
+            per_candidate_rate = f"{rows / per_candidate:,.0f}"
+            encode_rate = f"{rows / encode:,.0f}"
+        else:
+            # A million dicts is not how such a pool is stored; score columnar input directly
+            columns = make_synthetic_columns(rows)
+            per_candidate = None
+            per_candidate_rate = encode_rate = "-"
+        vectorized = timed(lambda: batch.score_columns(columns, job))
+        speedup = f"{per_candidate / vectorized:.0f}x" if per_candidate else "-"
+        print(f"{rows:>9,} {per_candidate_rate:>16} {encode_rate:>17} {rows / vectorized:>12,.0f} {speedup:>8}")
+
+
+def bench_job_requirements():
+    """Per-candidate scoring vs job description length: text rescanned per candidate vs JobRequirements"""
+    from candidate_scorer import CandidateScorer, JobRequirements
+
+    tmpdir = tempfile.mkdtemp()
+    scorer = CandidateScorer(cache_db=os.path.join(tmpdir, "cache.db"))
+    candidates = [{'profile_data': p} for p in make_synthetic_profiles(2_000)]
+    paragraph = ("We build ML platforms for enterprise customers with Python, PyTorch and AWS. "
+                 "The team is based in Seattle and works closely with product and research. ")
+
+    print(f"{'JD KB':>6} {'rescan/s':>10} {'compiled/s':>11} {'speedup':>8}")
+    for repeats in (10, 100, 1000):
+        text = paragraph * repeats
+        # Compiling per candidate is the work every score_* call used to repeat on the raw text
+        rescan = timed(lambda: [scorer.calculate_fit_score(c, JobRequirements.compile(text)) for c in candidates],
+                       repeat=1)
+        requirements = JobRequirements.compile(text)
+        compiled = timed(lambda: [scorer.calculate_fit_score(c, requirements) for c in candidates])
+        print(f"{len(text) / 1024:>6.0f} {len(candidates) / rescan:>10,.0f} {len(candidates) / compiled:>11,.0f} "
+              f"{rescan / compiled:>7.1f}x")
+
+
+def bench_ranking():
+    """Large pools: score_candidates (score everything, sort) vs rank_candidates (streaming top-K)"""
+    import contextlib
+    import tracemalloc
+    from candidate_scorer import CandidateScorer
+
+    tmpdir = tempfile.mkdtemp()
+    scorer = CandidateScorer(cache_db=os.path.join(tmpdir, "cache.db"))
+    job = "Senior ML Engineer in San Francisco or remote. Python, PyTorch, AWS, LLM, Kubernetes, Spark."
+    about = "Builds data platforms and ML systems. " * 40  # roughly the size of a real parsed profile
+
+    def pool(count: int):
+        """Candidates streamed from storage, each with its parsed profile"""
+        for i, profile in enumerate(iter_synthetic_profiles(count)):
+            yield {'name': f"Candidate {i}", 'linkedin_url': f"https://www.linkedin.com/in/candidate-{i}",
+                   'profile_data': dict(profile, about=about + str(i))}
+
+    def measure(run: Callable):
+        tracemalloc.start()
+        start = time.perf_counter()
+        first = run(start)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return elapsed, first, peak
+
+    def sort_all(count: int):
+        def run(start: float):
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                scorer.score_candidates(list(pool(count)), job)[:10]
+            return time.perf_counter() - start  # nothing to show until everything is sorted
+        return run
+
+    def stream(count: int):
+        def run(start: float):
+            first = None
+            for _ in scorer.rank_candidates(pool(count), job, top_k=10, batch_size=500):
+                first = first or time.perf_counter() - start
+            return first
+        return run
+
+    print(f"{'pool':>8} {'mode':<8} {'total s':>8} {'first board s':>14} {'peak MB':>8}")
+    for count in (10_000, 50_000):
+        for mode, run in (("sort", sort_all(count)), ("stream", stream(count))):
+            elapsed, first, peak = measure(run)
+            print(f"{count:>8,} {mode:<8} {elapsed:>8.2f} {first:>14.3f} {peak / 1e6:>8.1f}")
+
+
+def bench_records():
+    """Memory of 100k scored candidates: nested dicts vs slotted records with interned strings"""
+    import gc
+    import tracemalloc
+    from records import Candidate
+
+    count = 100_000
+    breakdown = {'education': 9.5, 'trajectory': 7.5, 'company': 9.0, 'skills': 8.0, 'location': 10.0, 'tenure': 7.0}
+    # Profiles round-trip through JSON, as they come out of the profile cache, so no strings are shared yet
+    payload = json.dumps([
+        {'name': f"Candidate {i}", 'linkedin_url': f"https://www.linkedin.com/in/candidate-{i}",
+         'headline': profile['headline'], 'fit_score': 7.25, 'score_breakdown': breakdown,
+         'profile_data': dict(profile, name=f"Candidate {i}", summary='')}
+        for i, profile in enumerate(iter_synthetic_profiles(count))
+    ])
+
+    def measure(build: Callable):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        kept = build()
+        elapsed = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        return size, elapsed
+
+    dict_bytes, dict_time = measure(lambda: json.loads(payload))
+    record_bytes, record_time = measure(lambda: [Candidate.from_dict(c) for c in json.loads(payload)])
+    print(f"{'representation':<16} {'MB':>7} {'bytes/candidate':>16} {'build s':>8}")
+    print(f"{'dicts':<16} {dict_bytes / 1e6:>7.1f} {dict_bytes / count:>16,.0f} {dict_time:>8.2f}")
+    print(f"{'records':<16} {record_bytes / 1e6:>7.1f} {record_bytes / count:>16,.0f} {record_time:>8.2f}")
+    print(f"reduction: {1 - record_bytes / dict_bytes:.0%}")
+
+
+def _parse_profile_cpu(html: str, skills) -> float:
+    """Parse one profile page, returning the CPU seconds it took in this (worker) process"""
+    from profile_parser import parse_profile_html
+    start = time.process_time()
+    parse_profile_html(html, skills)
+    return time.process_time() - start
+
+
+def bench_profile_parsing():
+    """Profile HTML parsing: inline vs thread pool vs process pool, with CPU utilisation"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from candidate_scorer import CandidateScorer
+
+    cores = os.cpu_count() or 1
+    skills = CandidateScorer(cache_db=os.path.join(tempfile.mkdtemp(), "cache.db")).skill_vocabulary
+    pages = [make_synthetic_profile_page(positions=12, seed=i) for i in range(48)]
+
+    def run(label: str, workers: int, make_executor: Optional[Callable]):
+        executor = make_executor(workers) if make_executor else None
+        if executor:
+            list(executor.map(_parse_profile_cpu, pages[:workers], [skills] * workers))  # start the workers
+        parent_cpu, start = time.process_time(), time.perf_counter()
+        if executor:
+            worker_cpu = list(executor.map(_parse_profile_cpu, pages, [skills] * len(pages)))
+        else:
+            worker_cpu = [_parse_profile_cpu(page, skills) for page in pages]
+        wall = time.perf_counter() - start
+        parent_cpu = time.process_time() - parent_cpu
+        # Threads already count in this process's CPU time; worker processes report theirs per page
+        cpu = parent_cpu + (sum(worker_cpu) if isinstance(executor, ProcessPoolExecutor) else 0)
+        if executor:
+            executor.shutdown()
+        print(f"{label:<10} {workers:>8} {len(pages) / wall:>8.1f} {wall:>7.2f} {cpu / wall:>10.2f} "
+              f"{cpu / (wall * cores):>12.0%}")
+
+    def processes(workers: int):
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+
+    print(f"{cores} CPU core(s), {len(pages)} pages of {len(pages[0]) / 1024:.0f} KB")
+    print(f"{'mode':<10} {'workers':>8} {'pages/s':>8} {'wall s':>7} {'busy cores':>10} {'utilisation':>12}")
+    run("inline", 1, None)
+    for workers in sorted({2, cores}):
+        run("threads", workers, ThreadPoolExecutor)
+    for workers in sorted({1, 2, cores}):
+        run("processes", workers, processes)
+
+def bench_rerank():
+    """Re-ranking a job's stored candidates with new weights (no search, fetch or rescoring)"""
+    from score_store import ScoreStore
+
+    store = ScoreStore(os.path.join(tempfile.mkdtemp(), "cache.db"))
+    levels = [5.0, 6.0, 6.5, 7.5, 8.0, 9.0, 9.5, 10.0]
+    weights = {'education': 0.1, 'trajectory': 0.1, 'company': 0.1, 'skills': 0.5, 'location': 0.1, 'tenure': 0.1}
+
+    print(f"{'candidates':>10} {'save ms':>8} {'rerank ms':>10} {'top 10 ms':>10}")
+    for count in (10, 1_000, 50_000):
+        scored = [
+            {'name': f"Candidate {i}", 'linkedin_url': f"https://www.linkedin.com/in/candidate-{i}", 'headline': '',
+             'score_breakdown': {name: levels[(i * (k + 3)) % len(levels)] for k, name in enumerate(weights)}}
+            for i in range(count)
+        ]
+        job_id = f"job-{count}"
+        save = timed(lambda: store.save(job_id, scored), repeat=1)
+        rerank = timed(lambda: store.rerank(job_id, weights))
+        top = timed(lambda: store.rerank(job_id, weights, top_k=10))
+        print(f"{count:>10,} {save * 1000:>8.1f} {rerank * 1000:>10.2f} {top * 1000:>10.2f}")
+
+
+def bench_messages():
+    """100k outreach messages: per-message format + regex cleanup vs precompiled templates"""
+    import random
+    from message_generator import MessageGenerator
+    from message_renderer import score_tier
+
+    count = 100_000
+    levels = [5.0, 6.5, 7.5, 8.0, 9.0, 10.0]
+    candidates = [
+        {'name': f"Candidate {i}", 'linkedin_url': f"https://www.linkedin.com/in/candidate-{i}",
+         'fit_score': levels[i % len(levels)] - 0.5 * (i % 3),
+         'score_breakdown': {name: levels[(i * (k + 3)) % len(levels)]
+                             for k, name in enumerate(('education', 'trajectory', 'company', 'skills', 'location', 'tenure'))},
+         'profile_data': profile}
+        for i, profile in enumerate(iter_synthetic_profiles(count))
+    ]
+    generator = MessageGenerator()
+    job = "Software Engineer, ML Research at Windsurf (Codeium)"
+
+    def legacy():
+        # Highlights extracted twice, every template re-parsed, every message cleaned with a regex
+        messages = []
+        for candidate in candidates:
+            highlights = generator.extract_candidate_highlights(candidate, job)
+            score = candidate['fit_score']
+            category = "high_score" if score >= 8.0 else "medium_score" if score >= 6.0 else "low_score"
+            try:
+                opening = random.choice(generator.templates[category]).format(**highlights)
+            except KeyError:
+                opening = f"Hi {highlights['name']}, I came across your profile and was impressed by your background."
+            message = f"{opening}\n\n{generator.generate_job_context(job)}\n\n{random.choice(generator.cta_templates)}"
+            messages.append({
+                'candidate_name': candidate['name'],
+                'linkedin_url': candidate['linkedin_url'],
+                'fit_score': score,
+                'message': re.sub(r'\n\s*\n\s*\n', '\n\n', message).strip(),
+                'score_breakdown': candidate['score_breakdown'],
+                'key_highlights': generator.extract_candidate_highlights(candidate, job)
+            })
+        return messages
+
+    def compiled():
+        return generator.generate_messages_for_candidates(candidates, job, max_messages=count)
+
+    # Rendering alone, from highlights extracted beforehand
+    highlights = [(generator.extract_candidate_highlights(c, job), score_tier(c['fit_score'])) for c in candidates]
+
+    def legacy_render():
+        messages = []
+        for values, category in highlights:
+            try:
+                opening = random.choice(generator.templates[category]).format(**values)
+            except KeyError:
+                opening = f"Hi {values['name']}, I came across your profile and was impressed by your background."
+            message = f"{opening}\n\n{generator.generate_job_context(job)}\n\n{random.choice(generator.cta_templates)}"
+            messages.append(re.sub(r'\n\s*\n\s*\n', '\n\n', message).strip())
+        return messages
+
+    def compiled_render():
+        renderer = generator.renderer
+        return [renderer.render(category, values, generator.generate_job_context(job)) for values, category in highlights]
+
+    random.seed(7)
+    expected = legacy()
+    random.seed(7)
+    assert compiled() == expected
+    del expected
+    print(f"{'mode':<22} {'seconds':>8} {'messages/s':>11}")
+    for label, old, new in (("end to end", legacy, compiled), ("rendering only", legacy_render, compiled_render)):
+        old_time = timed(old)
+        new_time = timed(new)
+        print(f"{label + ', legacy':<22} {old_time:>8.2f} {count / old_time:>11,.0f}")
+        print(f"{label + ', compiled':<22} {new_time:>8.2f} {count / new_time:>11,.0f}  ({old_time / new_time:.1f}x)")
+    print("identical messages for the same seed")
+
+
+def bench_outreach_export():
+    """Exporting a campaign: message list + json.dump(indent=2) vs streaming NDJSON / CSV (peak memory)"""
+    import tracemalloc
+    from message_generator import MessageGenerator
+    from outreach_export import export_messages
+    from records import to_jsonable
+
+    generator = MessageGenerator()
+    job = "Software Engineer, ML Research at Windsurf (Codeium)"
+    breakdown = {'education': 9.5, 'trajectory': 7.5, 'company': 9.0, 'skills': 8.0, 'location': 10.0, 'tenure': 7.0}
+    directory = tempfile.mkdtemp()
+
+    def candidates(count: int) -> Iterator[Dict]:
+        for i, profile in enumerate(iter_synthetic_profiles(count)):
+            yield {'name': f"Candidate {i}", 'linkedin_url': f"https://www.linkedin.com/in/candidate-{i}",
+                   'fit_score': 5.0 + i % 5, 'score_breakdown': breakdown, 'profile_data': profile}
+
+    def collect(count: int):
+        messages = generator.generate_messages_for_candidates(candidates(count), job, count, as_records=True)
+        with open(os.path.join(directory, "results.json"), 'w') as f:
+            json.dump(to_jsonable({'messages': messages}), f, indent=2, default=str)
+
+    def stream(extension: str):
+        return lambda count: export_messages(generator.iter_messages(candidates(count), job),
+                                             os.path.join(directory, f"messages{extension}"))
+
+    print(f"{'messages':>9} {'mode':<10} {'seconds':>8} {'peak MB':>8}")
+    for count in (1_000, 20_000):
+        for mode, run in (("json list", collect), ("ndjson", stream(".ndjson")), ("csv", stream(".csv"))):
+            tracemalloc.start()
+            start = time.perf_counter()
+            run(count)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{count:>9,} {mode:<10} {elapsed:>8.2f} {peak / 1e6:>8.1f}")
+
+
+def bench_message_analysis():
+    """Message effectiveness summary: lower() per indicator and three loops vs one lower() and one loop"""
+    import random
+    from message_analyzer import MessageAnalyzer
+    from message_generator import MessageGenerator
+
+    generator = MessageGenerator()
+    job = "Software Engineer, ML Research at Windsurf (Codeium)"
+    rng = random.Random(0)
+    messages = generator.generate_messages_for_candidates(
+        [{'name': f"Candidate {i}", 'linkedin_url': '', 'fit_score': rng.uniform(3, 10), 'score_breakdown': {},
+          'profile_data': profile} for i, profile in enumerate(iter_synthetic_profiles(20_000))],
+        job, max_messages=20_000)
+
+    def legacy_analysis(message: str) -> Dict:
+        return {
+            'length': len(message),
+            'personalization_score': sum(1 for indicator in [
+                'your experience', 'your background', 'your work', 'your expertise',
+                'your skills', 'your role', 'your profile'] if indicator in message.lower()),
+            'professional_tone': True,
+            'has_call_to_action': any(cta in message.lower() for cta in ['would you', 'are you', 'i\'d love', 'i\'d appreciate', 'open to']),
+            'mentions_company': 'windsurf' in message.lower() or 'codeium' in message.lower(),
+            'mentions_role': 'ml research' in message.lower() or 'software engineer' in message.lower(),
+            'mentions_skills': any(skill in message.lower() for skill in ['python', 'ml', 'ai', 'llm', 'pytorch', 'tensorflow'])
+        }
+
+    def legacy_summary():
+        # Three loops over the messages, as create_message_summary did
+        scores = [msg['fit_score'] for msg in messages]
+        distribution = {'high': 0, 'medium': 0, 'low': 0}
+        for msg in messages:
+            score = msg['fit_score']
+            distribution['high' if score >= 8.0 else 'medium' if score >= 6.0 else 'low'] += 1
+        analysis = [{'candidate': msg['candidate_name'], 'score': msg['fit_score'],
+                     'analysis': legacy_analysis(msg['message'])} for msg in messages]
+        return {'total_messages': len(messages), 'average_score': sum(scores) / len(scores),
+                'score_distribution': distribution, 'message_analysis': analysis}
+
+    analyzer = MessageAnalyzer()
+    assert analyzer.summarize(messages) == legacy_summary()
+    old = timed(legacy_summary)
+    new = timed(lambda: analyzer.summarize(messages))
+    print(f"{len(messages):,} messages, {sum(map(len, (m['message'] for m in messages))) / len(messages):.0f} chars on average")
+    print(f"{'mode':<12} {'seconds':>8} {'messages/s':>11}")
+    print(f"{'legacy':<12} {old:>8.3f} {len(messages) / old:>11,.0f}")
+    print(f"{'one pass':<12} {new:>8.3f} {len(messages) / new:>11,.0f}  ({old / new:.1f}x)")
+
+
+def bench_variations():
+    """A/B variants: N random generate_personalized_message calls vs the distinct-variant enumerator"""
+    import random
+    from message_generator import MessageGenerator
+
+    generator = MessageGenerator()
+    job = "Software Engineer, ML Research at Windsurf (Codeium)"
+    candidate = {'name': "Candidate", 'fit_score': 8.5, 'score_breakdown': {'skills': 9.0},
+                 'profile_data': next(iter_synthetic_profiles(1))}
+
+    def legacy(count: int) -> List[str]:
+        return [generator.generate_personalized_message(candidate, job) for _ in range(count)]
+
+    print(f"{'templates x CTAs':>16} {'asked':>6} {'legacy ms':>10} {'distinct':>9} {'enumerator ms':>14} {'distinct':>9}")
+    for templates, ctas, count in ((3, 4, 6), (3, 4, 12), (100, 100, 1_000)):
+        generator.templates['high_score'] = [f"Hi {{name}}, your {{key_skill}} work ({i}) stood out." for i in range(templates)]
+        generator.cta_templates = [f"Would you be open to a chat ({i})?" for i in range(ctas)]
+        random.seed(0)
+        old = timed(lambda: legacy(count))
+        new = timed(lambda: generator.generate_message_variations(candidate, job, count, seed=0))
+        print(f"{templates:>7} x {ctas:<6} {count:>6,} {old * 1000:>10.2f} {len(set(legacy(count))):>9,} "
+              f"{new * 1000:>14.2f} {len(generator.generate_message_variations(candidate, job, count, seed=0)):>9,}")
+
+
+def bench_render_cache():
+    """100k messages with and without the render cache, by profile variety and template shape"""
+    import random
+    from message_generator import MessageGenerator
+
+    count = 100_000
+    job = "Software Engineer, ML Research at Windsurf (Codeium)"
+    breakdown = {'education': 5.0, 'trajectory': 6.0, 'company': 5.0, 'skills': 6.0, 'location': 5.0, 'tenure': 7.0}
+    pools = {
+        # Like sourcing_results.json: every profile empty, one breakdown for all
+        'empty': [{'name': f"Candidate {i}", 'fit_score': 5.6, 'score_breakdown': breakdown, 'profile_data': {}}
+                  for i in range(count)],
+        'varied': [{'name': f"Candidate {i}", 'fit_score': 5.6, 'score_breakdown': breakdown, 'profile_data': profile}
+                   for i, profile in enumerate(iter_synthetic_profiles(count))],
+    }
+    multi_line = [
+        "Hi {name},\n\nI noticed your work on {key_skill} at {company_experience}.\n\n\nIt stood out.",
+        "Hello {name},\n\nYour {education_background} background caught my eye.",
+        "Hi {name},\n\n\nYour experience at {top_company} is a great fit.",
+    ]
+
+    print("rendering only (highlights extracted beforehand), seconds per 100k messages")
+    print(f"{'profiles':<9} {'templates':<12} {'uncached s':>10} {'cached s':>9} {'speedup':>8} {'hit rate':>9} {'bypassed':>9}")
+    for label, candidates in pools.items():
+        highlights = [MessageGenerator().extract_candidate_highlights(c, job) for c in candidates]
+        for shape, templates in (("single-line", None), ("multi-line", multi_line)):
+            runs = {}
+            for size in (0, 4096):
+                generator = MessageGenerator(render_cache_size=size)
+                if templates:
+                    generator.templates['low_score'] = templates
+                renderer = generator.renderer
+                job_context = generator.generate_job_context(job)
+
+                def render():
+                    random.seed(0)
+                    return [renderer.render('low_score', h, job_context) for h in highlights]
+
+                runs[size] = (timed(render), hash(tuple(render())), generator.render_cache)
+            assert runs[0][1] == runs[4096][1]
+            print(f"{label:<9} {shape:<12} {runs[0][0]:>10.2f} {runs[4096][0]:>9.2f} {runs[0][0] / runs[4096][0]:>7.1f}x "
+                  f"{runs[4096][2].stats()['hit_rate']:>9.1%} {str(runs[4096][2].stats()['bypassed']):>9}")
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "pdf": bench_pdf,
+    "sqlite": bench_sqlite,
+    "search_cache": bench_search_cache,
+    "terms": bench_terms,
+    "serp": bench_serp,
+    "skills": bench_skills,
+    "batch_scoring": bench_batch_scoring,
+    "job_requirements": bench_job_requirements,
+    "ranking": bench_ranking,
+    "records": bench_records,
+    "profile_parsing": bench_profile_parsing,
+    "rerank": bench_rerank,
+    "messages": bench_messages,
+    "outreach_export": bench_outreach_export,
+    "message_analysis": bench_message_analysis,
+    "variations": bench_variations,
+    "render_cache": bench_render_cache,
+}
+
+
+def main(names: List[str]):
+    for name in names or list(BENCHMARKS):
+        print(f"\n=== {name}: {BENCHMARKS[name].__doc__}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,103 @@
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class CacheDatabase:
+    """
+    Thread-safe access to the SQLite cache file.
+
+    Each thread keeps one long-lived connection (sqlite3 connections cannot be
+    shared across threads), opened in WAL mode so readers never wait for a
+    writer. A thread's connection is closed once the thread has ended, so
+    short-lived worker pools do not leave connections behind. Connections keep a compiled-statement cache, so the constant SQL
+    strings used by the caches are prepared once per thread and reused.
+    Writes use BEGIN IMMEDIATE, which takes the write lock up front: a
+    contended writer waits up to busy_timeout instead of failing with
+    'database is locked' when upgrading a read transaction.
+    """
+
+    def __init__(self, path: str = "linkedin_cache.db", busy_timeout: float = 5.0,
+                 cached_statements: int = 256):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,  # autocommit; transactions are explicit
+                cached_statements=self.cached_statements,
+                check_same_thread=False  # only used by its own thread, but close() may run elsewhere
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+            # Thread objects are freed once the thread has ended and nothing refers to it
+            weakref.finalize(threading.current_thread(), self._release, conn)
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def query_one(self, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        return self.connection().execute(sql, params).fetchone()
+
+    def query_all(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        return self.connection().execute(sql, params).fetchall()
+
+    def execute(self, sql: str, params: Tuple = ()):
+        """Run a single write statement in its own transaction"""
+        with self.transaction() as conn:
+            conn.execute(sql, params)
+
+    def executemany(self, sql: str, rows: Iterable[Tuple]):
+        with self.transaction() as conn:
+            conn.executemany(sql, rows)
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction that takes the write lock immediately"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        """Close every connection opened by any thread"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+_databases: Dict[str, CacheDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(path: str = "linkedin_cache.db") -> CacheDatabase:
+    """Shared CacheDatabase per file, so all caches reuse the same connections"""
+    with _databases_lock:
+        if path not in _databases:
+            _databases[path] = CacheDatabase(path)
+        return _databases[path]
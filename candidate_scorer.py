@@ -1,12 +1,161 @@
-import re
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
-import time
-import random
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
+from http_client import SharedHttpClient, get_shared_client
+from job_description import JobDescription
+from profile_cache import ProfileCache, canonical_profile_url
+from profile_parser import parse_profile_html
+from ranking import TopKRanker
+from records import Candidate, ProfileData, ScoreBreakdown, intern_text
+from skill_matcher import SkillMatcher
+
+# Keyword lists behind the score_* heuristics (shared with batch_scoring)
+TECHNICAL_SCHOOL_KEYWORDS = ['university', 'college', 'institute']
+DEGREE_KEYWORDS = ['computer science', 'engineering', 'ai', 'ml', 'data science']
+PROGRESSION_KEYWORDS = ['senior', 'lead', 'principal', 'director', 'manager', 'head']
+AI_COMPANY_KEYWORDS = ['ai', 'ml', 'data', 'analytics', 'intelligence']
+STARTUP_KEYWORDS = ['inc', 'corp', 'ltd', 'startup', 'tech']
+LOCATION_KEYWORDS = ['san francisco', 'sf', 'new york', 'nyc', 'mountain view',
+                     'remote', 'austin', 'seattle', 'boston', 'chicago', 'india']
+METRO_KEYWORDS = ['california', 'bay area', 'silicon valley']
+
+# Weight of each dimension in the fit score; totals are summed in this order
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    'education': 0.20,
+    'trajectory': 0.20,
+    'company': 0.15,
+    'skills': 0.25,
+    'location': 0.10,
+    'tenure': 0.10,
+}
+
+
+def validate_weights(weights: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Complete weight vector in DEFAULT_WEIGHTS order; dimensions left out
+    weigh 0. Weights are used as given, so keep them summing to 1 to stay on
+    the 0-10 scale.
+    """
+    if weights is None:
+        return dict(DEFAULT_WEIGHTS)
+    unknown = set(weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown score dimensions: {', '.join(sorted(unknown))}. "
+                         f"Choose from: {', '.join(DEFAULT_WEIGHTS)}")
+    validated = {name: float(weights.get(name, 0.0)) for name in DEFAULT_WEIGHTS}
+    if any(weight < 0 for weight in validated.values()) or not any(validated.values()):
+        raise ValueError("Weights must be non-negative and not all zero")
+    return validated
+
+
+def weighted_total(breakdown: Dict[str, float], weights: Dict[str, float]) -> float:
+    """Fit score from dimension scores, rounded like calculate_fit_score"""
+    total = 0.0
+    for name, weight in weights.items():
+        total += breakdown[name] * weight
+    return round(total, 2)
+
+
+@dataclass
+class JobRequirements:
+    """
+    What the score_* methods need from a job description, compiled once per job.
+
+    text is the lowercased job text, locations are the LOCATION_KEYWORDS it
+    mentions, and remote is set when it says "remote" or "anywhere".
+    Candidate skills are tested with mentions(): skills known to occur (the
+    job's extracted skills) sit in a hash set, and any other skill is
+    searched for once and remembered, so scoring a candidate does not
+    rescan the text.
+    """
+    text: str
+    locations: Tuple[str, ...] = ()
+    remote: bool = False
+    skills: FrozenSet[str] = frozenset()
+    _mentions: Dict[str, bool] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def compile(cls, text: str, skills: Iterable[str] = ()) -> 'JobRequirements':
+        """Compile job text, optionally with the skills already extracted from it"""
+        text = text.lower()
+        return cls(
+            text=text,
+            locations=tuple(loc for loc in LOCATION_KEYWORDS if loc in text),
+            remote='remote' in text or 'anywhere' in text,
+            skills=frozenset(skill for skill in skills if skill in text)
+        )
+
+    def mentions(self, skill: str) -> bool:
+        """Whether skill occurs in the lowercased job text, exactly as `skill in text`"""
+        if skill in self.skills:
+            return True
+        found = self._mentions.get(skill)
+        if found is None:
+            found = self._mentions[skill] = skill in self.text
+        return found
+
+
+@lru_cache(maxsize=32)
+def _compile(text: str, skills: Tuple[str, ...]) -> JobRequirements:
+    return JobRequirements.compile(text, skills)
+
+
+def job_requirements(job: Union[JobRequirements, JobDescription, str]) -> JobRequirements:
+    """
+    JobRequirements for a job given in any form. Compiled requirements are
+    reused for the same job, so per-candidate calls stay cheap.
+    """
+    if isinstance(job, JobRequirements):
+        return job
+    if isinstance(job, JobDescription):
+        return _compile(job.text, tuple(job.skills))
+    return _compile(job or "", ())
+
+
+JobInput = Union[JobRequirements, JobDescription, str]
+
+
+_parse_pools: Dict[int, ProcessPoolExecutor] = {}
+_parse_pools_lock = threading.Lock()
+
+
+def _get_parse_pool(workers: int) -> ProcessPoolExecutor:
+    """Parser process pools are shared per worker count and live for the whole process"""
+    with _parse_pools_lock:
+        if workers not in _parse_pools:
+            # spawn, not fork: this process runs the shared client's loop thread
+            _parse_pools[workers] = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+        return _parse_pools[workers]
+
+
+@atexit.register
+def _shutdown_parse_pools():
+    for pool in _parse_pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+
 
 class CandidateScorer:
-    def __init__(self):
+    def __init__(self, http_client: Optional[SharedHttpClient] = None, max_concurrency: int = 8,
+                 cache_db: str = "linkedin_cache.db", profile_cache: Optional[ProfileCache] = None,
+                 parse_workers: Optional[int] = None, weights: Optional[Dict[str, float]] = None):
+        self._http_client = http_client
+        # Dimension weights for the fit score (DEFAULT_WEIGHTS unless tuned)
+        self.weights = validate_weights(weights)
+        # Profile fetches allowed in flight at once; the shared limiter still paces each host
+        self.max_concurrency = max_concurrency
+        # Processes parsing profile pages; by default every core but the one doing network I/O,
+        # and 0 (or a single-core machine) parses on the event loop's thread pool instead
+        self.parse_workers = max(0, (os.cpu_count() or 1) - 1) if parse_workers is None else parse_workers
+        # Parsed profiles persist across jobs; stale ones are revalidated with conditional requests
+        self.profile_cache = profile_cache or ProfileCache(cache_db)
+        self._in_flight: Dict[str, asyncio.Future] = {}
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
@@ -41,83 +190,98 @@ class CandidateScorer:
             'bert', 'gpt-3', 'gpt-4', 'llama', 'claude', 'stable diffusion',
             'autocad', 'solidworks', 'matlab', 'r', 'julia', 'c++', 'cuda', 'gpu'
         }
+        # Whole-word matcher over the skills above, built once; parser processes build their own
+        self.skill_vocabulary = frozenset(self.ai_ml_skills)
+        self.skill_matcher = SkillMatcher(self.skill_vocabulary)
+
+    @property
+    def http_client(self) -> SharedHttpClient:
+        """Pooled, rate-limited client shared with the profile finder"""
+        if self._http_client is None:
+            self._http_client = get_shared_client()
+        return self._http_client
+
+    @property
+    def parse_executor(self) -> Optional[Executor]:
+        """
+        Process pool for profile parsing, started on first use and shared by
+        every scorer with the same parse_workers (None: the loop's default thread pool)
+        """
+        return _get_parse_pool(self.parse_workers) if self.parse_workers else None
 
     def extract_profile_data(self, linkedin_url: str) -> Dict:
         """
         Extract detailed profile data from LinkedIn URL
         Returns profile information for scoring
         """
+        return self.http_client.run(self.extract_profile_data_async(linkedin_url))
+
+    async def extract_profile_data_async(self, linkedin_url: str) -> Dict:
+        """
+        extract_profile_data on the shared client loop.
+
+        Fresh cached profiles are returned without a request. Stale ones are
+        revalidated with If-None-Match/If-Modified-Since, and a 304 reuses the
+        stored data. Concurrent lookups of the same profile share one fetch.
+        """
+        key = canonical_profile_url(linkedin_url)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_profile(linkedin_url))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # One cancelled caller must not cancel the fetch others are waiting on
+        return await asyncio.shield(future)
+
+    async def _fetch_profile(self, linkedin_url: str) -> Dict:
+        cached = self.profile_cache.get(linkedin_url)
+        if cached and cached['fresh']:
+            return cached['profile_data']
+
+        headers = dict(self.headers)
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
         try:
-            # Add delay to avoid rate limiting
-            time.sleep(random.uniform(1, 3))
-            
-            response = requests.get(linkedin_url, headers=self.headers, timeout=10)
+            # Paced by the shared per-host rate limiter
+            response = await self.http_client.get(linkedin_url, headers=headers, timeout=10)
+            if response.status_code == 304 and cached:
+                self.profile_cache.refresh(linkedin_url)
+                return cached['profile_data']
             if response.status_code != 200:
-                return {}
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract basic profile information
-            profile_data = {
-                'name': '',
-                'headline': '',
-                'location': '',
-                'education': [],
-                'experience': [],
-                'skills': [],
-                'summary': ''
-            }
-            
-            # Extract name (from title or meta tags)
-            title_tag = soup.find('title')
-            if title_tag:
-                title_text = title_tag.get_text()
-                if '|' in title_text:
-                    profile_data['name'] = title_text.split('|')[0].strip()
-            
-            # Extract headline
-            headline_elem = soup.find('div', {'class': 'text-body-medium'}) or \
-                          soup.find('h2', {'class': 'pv-text-details__left-panel'})
-            if headline_elem:
-                profile_data['headline'] = headline_elem.get_text().strip()
-            
-            # Extract location
-            location_elem = soup.find('span', {'class': 'text-body-small'}) or \
-                          soup.find('div', {'class': 'pv-text-details__left-panel'})
-            if location_elem:
-                profile_data['location'] = location_elem.get_text().strip()
-            
-            # Extract education (simplified - look for education section)
-            education_section = soup.find('section', {'id': 'education'}) or \
-                              soup.find('section', string=re.compile('education', re.I))
-            if education_section:
-                schools = education_section.find_all('h3') or education_section.find_all('div', {'class': 'pv-entity__school-name'})
-                for school in schools:
-                    profile_data['education'].append(school.get_text().strip())
-            
-            # Extract experience (simplified)
-            experience_section = soup.find('section', {'id': 'experience'}) or \
-                               soup.find('section', string=re.compile('experience', re.I))
-            if experience_section:
-                companies = experience_section.find_all('h3') or experience_section.find_all('div', {'class': 'pv-entity__company-name'})
-                for company in companies:
-                    profile_data['experience'].append(company.get_text().strip())
-            
-            # Extract skills from headline and summary
-            all_text = soup.get_text().lower()
-            found_skills = []
-            for skill in self.ai_ml_skills:
-                if skill in all_text:
-                    found_skills.append(skill)
-            profile_data['skills'] = found_skills
-            
+                # Outdated data beats none
+                return cached['profile_data'] if cached else {}
+            # Parsing is CPU-bound: it runs in the parser processes, off the loop and the GIL
+            profile = await asyncio.get_running_loop().run_in_executor(
+                self.parse_executor, parse_profile_html, response.text, self.skill_vocabulary
+            )
+            profile_data = profile.to_dict()
+            self.profile_cache.put(linkedin_url, profile_data, response.headers.get('ETag'),
+                                   response.headers.get('Last-Modified'))
             return profile_data
             
         except Exception as e:
             print(f"Error extracting profile data from {linkedin_url}: {e}")
-            return {}
+            return cached['profile_data'] if cached else {}
+
+    async def fetch_profiles(self, candidates: List[Dict], max_concurrency: Optional[int] = None):
+        """Fill in missing profile_data for all candidates, at most max_concurrency fetches at a time"""
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
 
-    def score_education(self, education: List[str], job_description: str) -> float:
+        async def fetch(candidate: Dict):
+            async with semaphore:
+                candidate['profile_data'] = await self.extract_profile_data_async(candidate['linkedin_url'])
+
+        await asyncio.gather(*(fetch(c) for c in candidates if 'profile_data' not in c))
+
+    def parse_profile_page(self, html: str) -> Dict:
+        """Profile fields for scoring, from a profile page's HTML"""
+        return parse_profile_html(html, self.skill_vocabulary).to_dict()
+
+    def score_education(self, education: List[str], job_description: JobInput) -> float:
         """
         Score education based on school prestige and relevance
         Returns score 1-10
@@ -133,13 +297,13 @@ class CandidateScorer:
             if any(elite in school_lower for elite in self.elite_schools):
                 score = 9.5
             # Check for strong technical schools
-            elif any(tech in school_lower for tech in ['university', 'college', 'institute']):
+            elif any(tech in school_lower for tech in TECHNICAL_SCHOOL_KEYWORDS):
                 score = 7.5
             else:
                 score = 6.0
             
             # Bonus for relevant degrees
-            if any(degree in school_lower for degree in ['computer science', 'engineering', 'ai', 'ml', 'data science']):
+            if any(degree in school_lower for degree in DEGREE_KEYWORDS):
                 score += 1.0
             
             max_score = max(max_score, score)
@@ -155,10 +319,10 @@ class CandidateScorer:
             return 5.0
         
         # Analyze progression in titles
-        progression_keywords = ['senior', 'lead', 'principal', 'director', 'manager', 'head']
+        progression_keywords = PROGRESSION_KEYWORDS
         current_level = 0
         
-        for exp in experience + [headline]:
+        for exp in [*experience, headline]:
             exp_lower = exp.lower()
             for i, keyword in enumerate(progression_keywords):
                 if keyword in exp_lower:
@@ -174,7 +338,7 @@ class CandidateScorer:
         else:
             return 5.0
 
-    def score_company_relevance(self, experience: List[str], job_description: str) -> float:
+    def score_company_relevance(self, experience: List[str], job_description: JobInput) -> float:
         """
         Score company relevance based on tech companies and industry match
         Returns score 1-10
@@ -190,10 +354,10 @@ class CandidateScorer:
             if any(top_company in company_lower for top_company in self.top_tech_companies):
                 score = 9.0
             # Check for AI/ML companies
-            elif any(ai_company in company_lower for ai_company in ['ai', 'ml', 'data', 'analytics', 'intelligence']):
+            elif any(ai_company in company_lower for ai_company in AI_COMPANY_KEYWORDS):
                 score = 8.0
             # Check for startup/tech indicators
-            elif any(startup in company_lower for startup in ['inc', 'corp', 'ltd', 'startup', 'tech']):
+            elif any(startup in company_lower for startup in STARTUP_KEYWORDS):
                 score = 7.0
             else:
                 score = 6.0
@@ -202,18 +366,17 @@ class CandidateScorer:
         
         return min(max_score, 10.0)
 
-    def score_experience_match(self, skills: List[str], headline: str, job_description: str) -> float:
+    def score_experience_match(self, skills: List[str], headline: str, job_description: JobInput) -> float:
         """
         Score experience match based on skills and job requirements
         Returns score 1-10
         """
-        job_lower = job_description.lower()
-        headline_lower = headline.lower()
+        requirements = job_requirements(job_description)
         
         # Count matching skills
         matching_skills = 0
         for skill in skills:
-            if skill in job_lower:
+            if requirements.mentions(skill):
                 matching_skills += 1
         
         # Score based on skill matches
@@ -226,7 +389,7 @@ class CandidateScorer:
         else:
             return 5.0
 
-    def score_location_match(self, location: str, job_description: str) -> float:
+    def score_location_match(self, location: str, job_description: JobInput) -> float:
         """
         Score location match based on job requirements
         Returns score 1-10
@@ -235,28 +398,19 @@ class CandidateScorer:
             return 6.0  # Remote-friendly default
         
         location_lower = location.lower()
-        job_lower = job_description.lower()
-        
-        # Extract location from job description
-        job_locations = []
-        location_keywords = ['san francisco', 'sf', 'new york', 'nyc', 'mountain view', 
-                           'remote', 'austin', 'seattle', 'boston', 'chicago', 'india']
-        
-        for loc in location_keywords:
-            if loc in job_lower:
-                job_locations.append(loc)
+        requirements = job_requirements(job_description)
         
         # Check for exact match
-        for job_loc in job_locations:
+        for job_loc in requirements.locations:
             if job_loc in location_lower:
                 return 10.0
         
         # Check for metro area match
-        if any(metro in location_lower for metro in ['california', 'bay area', 'silicon valley']):
+        if any(metro in location_lower for metro in METRO_KEYWORDS):
             return 8.0
         
         # Check for remote-friendly
-        if 'remote' in job_lower or 'anywhere' in job_lower:
+        if requirements.remote:
             return 6.0
         
         return 5.0
@@ -281,11 +435,13 @@ class CandidateScorer:
         else:
             return 3.0  # Frequent job changes
 
-    def calculate_fit_score(self, candidate: Dict, job_description: str) -> Dict:
+    def calculate_fit_score(self, candidate: Dict, job_description: JobInput) -> Dict:
         """
         Calculate comprehensive fit score for a candidate
         Returns score breakdown and total score
         """
+        job_description = job_requirements(job_description)
+        
         # Extract profile data if not already available
         if 'profile_data' not in candidate:
             candidate['profile_data'] = self.extract_profile_data(candidate['linkedin_url'])
@@ -300,52 +456,100 @@ class CandidateScorer:
         location_score = self.score_location_match(profile_data.get('location', ''), job_description)
         tenure_score = self.score_tenure(profile_data.get('experience', []))
         
-        # Calculate weighted total score
-        total_score = (
-            education_score * 0.20 +      # 20%
-            trajectory_score * 0.20 +     # 20%
-            company_score * 0.15 +        # 15%
-            experience_score * 0.25 +     # 25%
-            location_score * 0.10 +       # 10%
-            tenure_score * 0.10           # 10%
-        )
+        breakdown = {
+            'education': education_score,
+            'trajectory': trajectory_score,
+            'company': company_score,
+            'skills': experience_score,
+            'location': location_score,
+            'tenure': tenure_score
+        }
         
         return {
-            'total_score': round(total_score, 2),
-            'breakdown': {
-                'education': round(education_score, 2),
-                'trajectory': round(trajectory_score, 2),
-                'company': round(company_score, 2),
-                'skills': round(experience_score, 2),
-                'location': round(location_score, 2),
-                'tenure': round(tenure_score, 2)
-            },
+            'total_score': weighted_total(breakdown, self.weights),
+            'breakdown': {name: round(score, 2) for name, score in breakdown.items()},
             'profile_data': profile_data
         }
 
-    def score_candidates(self, candidates: List[Dict], job_description: str) -> List[Dict]:
+    def score_candidates(self, candidates: List[Dict], job_description: JobInput,
+                         concurrent: bool = True, max_concurrency: Optional[int] = None,
+                         as_records: bool = False) -> List[Union[Dict, Candidate]]:
         """
-        Score all candidates and return sorted results
+        Score all candidates and return sorted results.
+        With concurrent=True, missing profiles are fetched up to max_concurrency at
+        a time before scoring, so fetch latency overlaps instead of adding up.
+        Ties keep input order, so the ranking is the same either way.
+        The job is compiled into JobRequirements once for the whole batch.
+        With as_records=True the results are compact Candidate records instead of dicts.
         """
+        job_description = job_requirements(job_description)
         scored_candidates = []
         
+        if concurrent and any('profile_data' not in c for c in candidates):
+            self.http_client.run(self.fetch_profiles(candidates, max_concurrency))
+        
         for candidate in candidates:
             print(f"Scoring candidate: {candidate.get('name', 'Unknown')}")
             
             score_result = self.calculate_fit_score(candidate, job_description)
-            
-            scored_candidate = {
-                'name': candidate.get('name', 'Unknown'),
-                'linkedin_url': candidate.get('linkedin_url', ''),
-                'headline': candidate.get('headline', ''),
-                'fit_score': score_result['total_score'],
-                'score_breakdown': score_result['breakdown'],
-                'profile_data': score_result['profile_data']
-            }
-            
-            scored_candidates.append(scored_candidate)
+            if as_records:
+                scored_candidates.append(self._scored_record(candidate, score_result))
+            else:
+                scored_candidates.append(self._scored_candidate(candidate, score_result))
         
-        # Sort by fit score (highest first)
+        # Sort by fit score (highest first); the sort is stable, so ties keep input order
         scored_candidates.sort(key=lambda x: x['fit_score'], reverse=True)
         
-        return scored_candidates 
\ No newline at end of file
+        return scored_candidates
+
+    def rank_candidates(self, candidates: Iterable[Dict], job_description: JobInput, top_k: int = 10,
+                        batch_size: int = 50, max_concurrency: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Streaming alternative to score_candidates for large pools.
+
+        Candidates are read batch_size at a time: the batch's missing profiles
+        are fetched concurrently, every candidate is scored into a TopKRanker,
+        and the current leaderboard {'top_candidates', 'summary'} is yielded.
+        Only the top_k leaders keep their profile_data, so memory stays flat
+        in pool size; a leader pushed out later loses it too, including in
+        leaderboards already yielded. The last leaderboard's top_candidates
+        equal score_candidates(candidates, job)[:top_k]. Input dicts are not
+        modified.
+        """
+        requirements = job_requirements(job_description)
+        ranker = TopKRanker(top_k)
+        candidates = iter(candidates)
+        while True:
+            batch = [dict(candidate) for candidate in islice(candidates, batch_size)]
+            if not batch and ranker.summary.count:
+                return
+            if any('profile_data' not in c for c in batch):
+                self.http_client.run(self.fetch_profiles(batch, max_concurrency))
+            for candidate in batch:
+                ranker.push(self._scored_candidate(candidate, self.calculate_fit_score(candidate, requirements)))
+            yield ranker.leaderboard()
+            if not batch:
+                return
+
+    @staticmethod
+    def _scored_candidate(candidate: Dict, score_result: Dict) -> Dict:
+        return {
+            'name': candidate.get('name', 'Unknown'),
+            'linkedin_url': candidate.get('linkedin_url', ''),
+            'headline': candidate.get('headline', ''),
+            'fit_score': score_result['total_score'],
+            'score_breakdown': score_result['breakdown'],
+            'profile_data': score_result['profile_data']
+        }
+
+    @staticmethod
+    def _scored_record(candidate: Dict, score_result: Dict) -> Candidate:
+        profile = score_result['profile_data']
+        return Candidate(
+            name=candidate.get('name', 'Unknown'),
+            linkedin_url=candidate.get('linkedin_url', ''),
+            headline=intern_text(candidate.get('headline', '')),
+            fit_score=score_result['total_score'],
+            score_breakdown=ScoreBreakdown.from_dict(score_result['breakdown']),
+            profile_data=profile if isinstance(profile, ProfileData) else ProfileData.from_dict(profile)
+        ) 
\ No newline at end of file
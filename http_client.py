@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from typing import Dict, Optional
+
+import httpx
+
+from rate_limiter import RateLimiter
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+class SharedHttpClient:
+    """
+    Pooled keep-alive HTTP client shared by every search in the process.
+
+    The client lives on a dedicated event loop running in a daemon thread, so
+    sync callers (worker threads, FastAPI handlers) and async callers on any
+    other loop can all multiplex their requests over the same connection pool.
+    Every request waits on the per-host RateLimiter first, and its response
+    status feeds back into that host's rate.
+    """
+
+    def __init__(self, headers: Optional[Dict] = None, max_connections: int = 20,
+                 timeout: float = 15.0, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._transport = transport
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="shared-http-client", daemon=True)
+        self._thread.start()
+        # The AsyncClient must be created on the loop that will drive it
+        self._client = self.run(self._create_client())
+
+    async def _create_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections
+        )
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=limits,
+            follow_redirects=True,
+            transport=self._transport
+        )
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def run(self, coro):
+        """Run a coroutine on the client loop from synchronous code and wait for it"""
+        if self._in_client_loop():
+            coro.close()
+            raise RuntimeError("SharedHttpClient.run() cannot be called from the client's own event loop")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def call(self, coro):
+        """Await a coroutine on the client loop from any event loop"""
+        if self._in_client_loop():
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """Issue a rate-limited GET over the shared connection pool"""
+        return await self.call(self._limited_get(url, **kwargs))
+
+    def get_sync(self, url: str, **kwargs) -> httpx.Response:
+        """Blocking get() for code running outside any event loop"""
+        return self.run(self._limited_get(url, **kwargs))
+
+    async def _limited_get(self, url: str, **kwargs) -> httpx.Response:
+        await self.rate_limiter.acquire(url)
+        response = await self._client.get(url, **kwargs)
+        self.rate_limiter.record(url, response.status_code, response.headers.get('Retry-After'))
+        return response
+
+    def close(self):
+        """Close pooled connections and stop the client loop"""
+        if self._loop.is_closed():
+            return
+        self.run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def _in_client_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+
+_shared_client: Optional[SharedHttpClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_client() -> SharedHttpClient:
+    """Return the process-wide HTTP client, creating it on first use"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = SharedHttpClient()
+        return _shared_client
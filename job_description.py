@@ -0,0 +1,44 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
+
+
+def compute_content_hash(text: str) -> str:
+    """Stable SHA-256 of the job description text, used as the job identity"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class JobDescription:
+    """
+    A job description parsed once per pipeline run.
+
+    Holds the raw text plus everything derived from it, so the finder,
+    the scorer and the message generator never re-read or re-parse the source.
+    """
+    text: str
+    title: str
+    skills: List[str] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+    search_terms: str = ""
+    content_hash: str = ""
+    source: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.content_hash:
+            self.content_hash = compute_content_hash(self.text)
+
+    @property
+    def job_id(self) -> str:
+        """Short deterministic identifier derived from the content hash"""
+        return self.content_hash[:12]
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def job_text(job: Union[JobDescription, str]) -> str:
+    """Return the raw text for either a JobDescription or a plain string"""
+    if isinstance(job, JobDescription):
+        return job.text
+    return job or ""
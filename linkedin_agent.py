@@ -1,54 +1,62 @@
 
-import re
-import requests
-import PyPDF2
-from bs4 import BeautifulSoup
+import asyncio
+import httpx
 from urllib.parse import quote
-from typing import List, Dict, Optional
-import sqlite3
-from datetime import datetime
-import json
+from collections import deque
+from typing import AsyncIterator, Deque, Iterator, List, Dict, Optional
 import os
-import time
-import random
+from http_client import SharedHttpClient, get_shared_client
+from job_description import JobDescription
+from pdf_cache import PDFTextCache, hash_pdf_bytes
+from pdf_extraction import PDFTextExtractor
+from search_cache import get_search_cache
+from serp_parser import SERPParser, get_parser
+from term_extractor import get_term_extractor
+
+# Broader queries tried when a job's own search terms find nobody
+FALLBACK_SEARCH_TERMS = [
+    "AI Solution Architect Python",
+    "Machine Learning Engineer Python",
+    "AI Engineer Python",
+    "Data Scientist Python",
+    "Software Engineer AI"
+]
 
 class LinkedInProfileFinder:
-    def __init__(self):
-        self.cache_db = "linkedin_cache.db"
+    def __init__(self, http_client: Optional[SharedHttpClient] = None, cache_db: str = "linkedin_cache.db",
+                 pdf_extractor: Optional[PDFTextExtractor] = None, serp_parser: Optional[SERPParser] = None):
+        self.cache_db = cache_db
         self._init_db()
+        self.pdf_cache = PDFTextCache(cache_db)
+        # Compiled once per process from job_vocabularies.json
+        self.term_extractor = get_term_extractor()
+        # Backend and page-parallelism are chosen per deployment (PDF_BACKEND / PDF_WORKERS)
+        self.pdf_extractor = pdf_extractor or PDFTextExtractor.from_env()
+        # Results-page parser is swappable per deployment (SERP_PARSER)
+        self.serp_parser = serp_parser or get_parser()
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
+        self._http_client = http_client
+    
+    @property
+    def http_client(self) -> SharedHttpClient:
+        """Pooled client shared by all searches (process-wide unless one was injected)"""
+        if self._http_client is None:
+            self._http_client = get_shared_client()
+        return self._http_client
     
     def _init_db(self):
-        """Initialize SQLite database for caching"""
-        with sqlite3.connect(self.cache_db) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS cache (
-                    query TEXT PRIMARY KEY,
-                    results TEXT,
-                    timestamp DATETIME
-                )
-            """)
+        """Initialize SQLite-backed caches"""
+        self.search_cache = get_search_cache(self.cache_db)
     
     def _get_from_cache(self, query: str) -> Optional[List[Dict]]:
-        """Retrieve cached search results"""
-        with sqlite3.connect(self.cache_db) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT results FROM cache WHERE query = ? AND timestamp > datetime('now', '-1 day')",
-                (query,)
-            )
-            result = cursor.fetchone()
-            return json.loads(result[0]) if result else None
+        """Retrieve cached search results (memory tier first, then SQLite)"""
+        return self.search_cache.get(query, 'search')
     
     def _save_to_cache(self, query: str, results: List[Dict]):
         """Save search results to cache"""
-        with sqlite3.connect(self.cache_db) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO cache (query, results, timestamp) VALUES (?, ?, ?)",
-                (query, json.dumps(results), datetime.now())
-            )
+        self.search_cache.put(query, results, 'search')
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text content from a PDF file with improved error handling"""
@@ -65,119 +73,93 @@ class LinkedInProfileFinder:
                 return text
             
             with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                
-                # Check if PDF is encrypted
-                if reader.is_encrypted:
-                    try:
-                        reader.decrypt('')  # Try empty password
-                    except:
-                        print("Error: PDF is encrypted and cannot be read")
-                        return text
-                
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                        
+                data = file.read()
         except Exception as e:
             print(f"Error reading PDF: {str(e)}")
-        return text.strip()
+            return text
+        return self.extract_text_from_pdf_bytes(data)
     
-    def extract_search_terms(self, job_description: str) -> str:
+    def extract_text_from_pdf_bytes(self, data: bytes) -> str:
         """
-        Improved search term extraction specifically for Gen AI Solution Architect roles
+        Extract text from raw PDF bytes, reusing cached text for identical files
         """
-        # First try to extract the exact job title from common patterns
-        title_patterns = [
-            r'Role:\s*(.*?)\n',
-            r'Proposed Role:\s*(.*?)\n', 
-            r'Title:\s*(.*?)\n',
-            r'Position:\s*(.*?)\n',
-            r'Job Title:\s*(.*?)\n',
-            r'AI Engineer\s*-\s*(.*?)\n'
-        ]
+        sha256 = hash_pdf_bytes(data)
+        # Cache entries are tied to the backend that produced them
+        extractor_version = self.pdf_extractor.version
+        cached = self.pdf_cache.get(sha256, extractor_version)
+        if cached:
+            return cached['text']
         
-        title = None
-        for pattern in title_patterns:
-            match = re.search(pattern, job_description, re.IGNORECASE)
-            if match:
-                title = match.group(1).strip()
-                break
-                
-        # If no explicit title found, look for Gen AI Solution Architect patterns
-        if not title:
-            title_matches = re.findall(
-                r'(Gen(?:erative)?\s*AI\s*Solution\s*Architect|'
-                r'AI\s*(?:Solution\s*)?Architect|'
-                r'Artificial\s*Intelligence\s*Solution\s*Architect)',
-                job_description,
-                re.IGNORECASE
-            )
-            if title_matches:
-                title = title_matches[0]
-            else:
-                title = "Gen AI Solution Architect"  # Default fallback
-
-        # Extract skills - expanded list focused on AI/ML
-        skills = re.findall(
-            r'(Python|Java|TensorFlow|PyTorch|LLM|GPT|NLP|Natural\s*Language\s*Processing|'
-            r'Machine\s*Learning|Deep\s*Learning|Computer\s*Vision|Generative\s*AI|'
-            r'AWS|Azure|GCP|Docker|Kubernetes|Spark|Hadoop|LangChain|Hugging\s*Face|'
-            r'LLaMA|GPT-4|Transformers|Neural\s*Networks)',
-            job_description,
-            re.IGNORECASE
-        )
-        skills = list(set([s.capitalize() for s in skills]))  # Dedupe and standardize
+        try:
+            text, page_count = self.pdf_extractor.extract(data)
+        except Exception as e:
+            print(f"Error reading PDF: {str(e)}")
+            return ""
         
-        # Extract locations - expanded list
-        locations = re.findall(
-            r'(San\s*Francisco|SF|New\s*York|NYC|Mountain\s*View|Remote|'
-            r'Austin|Seattle|Boston|Chicago|Pan\s*India|India|Bangalore|'
-            r'Hyderabad|Pune|Chennai|Delhi|NCR|Gurgaon)',
-            job_description,
-            re.IGNORECASE
+        # Cache even empty results (e.g. scanned PDFs) so repeats skip parsing
+        self.pdf_cache.put(sha256, text, page_count, extractor_version)
+        return text
+    
+    def extract_job_terms(self, job_description: str) -> Dict:
+        """
+        Extract the job title, skills and locations from job description text
+        Returns a dict with 'title', 'skills' and 'locations'
+        """
+        return self.term_extractor.extract(job_description)
+    
+    def format_search_terms(self, title: str, skills: List[str], locations: List[str]) -> str:
+        """
+        Build the Google search string from extracted job terms
+        """
+        return self.term_extractor.format_search_terms(title, skills, locations)
+    
+    def extract_search_terms(self, job_description: str) -> str:
+        """
+        Improved search term extraction specifically for Gen AI Solution Architect roles
+        """
+        job_terms = self.extract_job_terms(job_description)
+        return self.format_search_terms(job_terms['title'], job_terms['skills'], job_terms['locations'])
+    
+    def job_description_from_text(self, text: str, source: Optional[str] = None) -> JobDescription:
+        """Parse job description text once into a JobDescription"""
+        job_terms = self.extract_job_terms(text)
+        return JobDescription(
+            text=text,
+            title=job_terms['title'],
+            skills=job_terms['skills'],
+            locations=job_terms['locations'],
+            search_terms=self.format_search_terms(job_terms['title'], job_terms['skills'], job_terms['locations']),
+            source=source
         )
-        
-        # Format search terms - be less specific to find more results
-        terms = []
-        
-        # Add title (but make it less specific)
-        if title:
-            # Simplify the title for better search results
-            if "Gen AI" in title or "Generative AI" in title:
-                terms.append("AI Solution Architect")
-            else:
-                terms.append(title)
-        
-        # Add key skills (limit to most common ones)
-        if skills:
-            # Focus on broader, more common skills
-            common_skills = [s for s in skills if s.lower() in ['python', 'machine learning', 'ai', 'ml', 'tensorflow', 'pytorch']]
-            terms.extend(common_skills[:3])
-        
-        # Add location if found
-        if locations:
-            terms.append(locations[0])
-            
-        # Clean up terms and remove empty/none values
-        terms = [t for t in terms if t and str(t).strip()]
-        
-        # If still too specific, add some broader terms
-        if len(terms) < 3:
-            terms.extend(['AI', 'Machine Learning'])
-            
-        return " ".join(terms)
+    
+    def parse_job_description(self, pdf_path: str) -> Optional[JobDescription]:
+        """Read a job description PDF once and parse it; None if no text could be extracted"""
+        text = self.extract_text_from_pdf(pdf_path)
+        if not text:
+            return None
+        return self.job_description_from_text(text, source=pdf_path)
     
     def search_linkedin_via_google(self, search_terms: str, max_results: int = 10) -> List[Dict]:
+        """
+        Blocking wrapper around search_linkedin_async for sync callers.
+        The search itself runs on the shared HTTP client's event loop.
+        """
+        return self.http_client.run(self.search_linkedin_async(search_terms, max_results))
+    
+    async def search_linkedin_async(self, search_terms: str, max_results: int = 10, start: int = 0) -> List[Dict]:
         """
         Robust LinkedIn profile search via Google with:
-        - Realistic delays to avoid blocking
-        - Multiple selector patterns
+        - Per-host token-bucket pacing that backs off on 429/503
+        - One pooled keep-alive client shared by all in-flight searches
+        - Anchor-only results parsing (see serp_parser)
         - Better error handling
+        start is the zero-based result offset, for fetching later pages.
         """
+        # Later pages are cached separately from the first
+        cache_key = search_terms if start == 0 else f"{search_terms} [start={start}]"
+        
         # Check cache first
-        cached_results = self._get_from_cache(search_terms)
+        cached_results = self._get_from_cache(cache_key)
         if cached_results:
             return cached_results
         
@@ -185,89 +167,143 @@ class LinkedInProfileFinder:
         query = f'site:linkedin.com/in {search_terms}'
         encoded_query = quote(query)
         search_url = f"https://www.google.com/search?q={encoded_query}&num={max_results}"
+        if start:
+            search_url += f"&start={start}"
         
         try:
-            # Add realistic delay to mimic human behavior
-            time.sleep(random.uniform(2, 5))
-            
-            response = requests.get(search_url, headers=self.headers, timeout=15)
+            # Paced by the shared per-host rate limiter instead of a fixed sleep
+            response = await self.http_client.get(search_url, headers=self.headers)
             response.raise_for_status()
             
             # Debug: Print response status and content preview
             print(f"Response status: {response.status_code}")
             print(f"Response content preview: {response.text[:500]}...")
             
-            # Parse results with more comprehensive selectors
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            
-            # Method 1: Find all links containing linkedin.com/in
-            all_links = soup.find_all('a', href=True)
-            linkedin_links = [link for link in all_links if 'linkedin.com/in/' in link['href']]
-            
-            print(f"Found {len(linkedin_links)} LinkedIn links in HTML")
-            
-            for link in linkedin_links[:max_results]:
-                url = link['href']
-                
-                # Clean URL - remove Google redirect parameters
-                if url.startswith('/url?q='):
-                    url = url.split('/url?q=')[1].split('&')[0]
-                elif '&ved=' in url:
-                    url = url.split('&ved=')[0]
-                
-                # Get title from link text or parent elements
-                title = link.get_text().strip()
-                if not title:
-                    # Try to find title in parent elements
-                    parent = link.parent
-                    if parent:
-                        title_elem = parent.find('h3') or parent.find('div', class_='title')
-                        if title_elem:
-                            title = title_elem.get_text().strip()
-                
-                # Extract name and headline
-                if '|' in title:
-                    name, headline = title.split('|', 1)
-                elif ' - ' in title:
-                    name, headline = title.split(' - ', 1)
-                else:
-                    name = title
-                    headline = ""
-                
-                name = name.strip()
-                headline = headline.strip()
-                
-                # Skip if no meaningful name
-                if len(name) < 2:
-                    continue
-                
-                results.append({
-                    "name": name,
-                    "linkedin_url": url,
-                    "headline": headline
-                })
+            # Only result links and their titles are parsed; no full DOM is built
+            results = self.serp_parser.parse(response.text, max_results)
+            print(f"Found {len(results)} LinkedIn profiles in HTML")
             
             # Cache results
             if results:
-                self._save_to_cache(search_terms, results)
+                self._save_to_cache(cache_key, results)
             
             return results
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Network error searching LinkedIn: {e}")
             return []
         except Exception as e:
             print(f"Error parsing search results: {e}")
             return []
     
-    def find_profiles_from_pdf(self, pdf_path: str, max_results: int = 10) -> List[Dict]:
+    async def iter_profiles_async(self, search_terms: str, page_size: int = 10, max_pages: int = 5,
+                                  prefetch: int = 1) -> AsyncIterator[Dict]:
+        """
+        Yield profiles for a search page by page, each as soon as its page is parsed.
+
+        Up to prefetch later pages are requested while the consumer works
+        through the current one. Profiles already seen on an earlier page are
+        skipped, and paging stops at the first page with nothing new, after
+        max_pages, or as soon as the consumer stops iterating (pages still in
+        flight are then cancelled).
+        """
+        pending: Deque[asyncio.Future] = deque()
+        next_page = 0
+
+        def request_pages(in_flight: int):
+            nonlocal next_page
+            while next_page < max_pages and len(pending) < in_flight:
+                pending.append(asyncio.ensure_future(
+                    self.search_linkedin_async(search_terms, page_size, start=next_page * page_size)
+                ))
+                next_page += 1
+
+        seen = set()
+        try:
+            request_pages(prefetch + 1)
+            while pending:
+                profiles = await pending.popleft()
+                new_profiles = [p for p in profiles if p['linkedin_url'] not in seen]
+                if not new_profiles:
+                    return
+                request_pages(prefetch)
+                for profile in new_profiles:
+                    seen.add(profile['linkedin_url'])
+                    yield profile
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def iter_profiles(self, search_terms: str, page_size: int = 10, max_pages: int = 5,
+                      prefetch: int = 1) -> Iterator[Dict]:
+        """
+        Blocking iterator over iter_profiles_async for sync callers.
+        Prefetched pages keep loading on the client loop between items.
+        """
+        profiles = self.iter_profiles_async(search_terms, page_size, max_pages, prefetch)
+        try:
+            while True:
+                try:
+                    yield self.http_client.run(profiles.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.http_client.run(profiles.aclose())
+
+    def search_many(self, search_terms_list: List[str], max_results: int = 10) -> List[List[Dict]]:
+        """Run several searches concurrently on the shared event loop, results in input order"""
+        async def _gather():
+            return await asyncio.gather(*(
+                self.search_linkedin_async(terms, max_results) for terms in search_terms_list
+            ))
+        return self.http_client.run(_gather())
+    
+    async def search_first_sufficient(self, search_terms_list: List[str], max_results: int = 10,
+                                      min_results: int = 1) -> List[Dict]:
+        """
+        Race several searches; the first to return at least min_results profiles wins
+        and the rest are cancelled (including any still queued at the rate limiter).
+        If none is sufficient, the largest result found is returned.
+        """
+        tasks = [asyncio.ensure_future(self.search_linkedin_async(terms, max_results)) for terms in search_terms_list]
+        best: List[Dict] = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                profiles = await next_done
+                if len(profiles) >= min_results:
+                    return profiles
+                if len(profiles) > len(best):
+                    best = profiles
+            return best
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def search_merged(self, search_terms_list: List[str], max_results: int = 10) -> List[Dict]:
+        """
+        Run several searches concurrently and merge their profiles, deduplicated by
+        URL, until max_results are collected; searches still pending then are cancelled.
+        """
+        tasks = [asyncio.ensure_future(self.search_linkedin_async(terms, max_results)) for terms in search_terms_list]
+        merged: Dict[str, Dict] = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for profile in await next_done:
+                    merged.setdefault(profile['linkedin_url'], profile)
+                    if len(merged) >= max_results:
+                        return list(merged.values())
+            return list(merged.values())
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def find_profiles_from_pdf(self, pdf_path: str, max_results: int = 10, fallback: str = "race") -> List[Dict]:
         """Main function to find LinkedIn profiles from a job description PDF"""
         print(f"\nAttempting to read PDF from: {pdf_path}")
         
-        # Step 1: Extract text from PDF
-        job_description = self.extract_text_from_pdf(pdf_path)
-        if not job_description:
+        # Step 1: Extract text from PDF and parse it
+        job = self.parse_job_description(pdf_path)
+        if not job:
             print("\nFailed to extract text from PDF. Possible reasons:")
             print("- File is not a valid PDF")
             print("- PDF is password protected")
@@ -277,10 +313,24 @@ class LinkedInProfileFinder:
         
         print("\nSuccessfully extracted text from PDF")
         print("\nSample of extracted text (first 300 chars):")
-        print(job_description[:300] + "...")
+        print(job.text[:300] + "...")
+        
+        return self.find_profiles(job, max_results, fallback)
+    
+    def find_profiles(self, job: JobDescription, max_results: int = 10, fallback: str = "race") -> List[Dict]:
+        """
+        Find LinkedIn profiles for an already-parsed job description.
+
+        If the job's own search terms find nobody, the fallback queries run
+        concurrently: fallback="race" keeps the first query that finds anyone
+        and cancels the others, fallback="merge" combines unique profiles
+        across queries up to max_results.
+        """
+        if fallback not in ("race", "merge"):
+            raise ValueError(f"Unknown fallback strategy '{fallback}'. Choose from: race, merge")
         
-        # Step 2: Extract search terms
-        search_terms = self.extract_search_terms(job_description)
+        # Step 2: Search terms were extracted when the job was parsed
+        search_terms = job.search_terms
         if not search_terms:
             print("\nNo search terms extracted from job description")
             return []
@@ -292,21 +342,12 @@ class LinkedInProfileFinder:
         
         if not profiles:
             print("\nNo profiles found with primary search terms. Trying fallback terms...")
-            # Try multiple fallback strategies
-            fallback_terms_list = [
-                "AI Solution Architect Python",
-                "Machine Learning Engineer Python",
-                "AI Engineer Python",
-                "Data Scientist Python",
-                "Software Engineer AI"
-            ]
-            
-            for fallback_terms in fallback_terms_list:
-                print(f"Trying: {fallback_terms}")
-                profiles = self.search_linkedin_via_google(fallback_terms, max_results)
-                if profiles:
-                    print(f"Found {len(profiles)} profiles with fallback terms")
-                    break
+            if fallback == "merge":
+                profiles = self.http_client.run(self.search_merged(FALLBACK_SEARCH_TERMS, max_results))
+            else:
+                profiles = self.http_client.run(self.search_first_sufficient(FALLBACK_SEARCH_TERMS, max_results))
+            if profiles:
+                print(f"Found {len(profiles)} profiles with fallback terms")
         
         return profiles
 
@@ -331,8 +372,7 @@ class LinkedInProfileFinder:
 
 
 # import requests
-# from bs4 import BeautifulSoup
-# import PyPDF2
+# # import PyPDF2
 # import re
 # import pdfplumber
 # import pdf2image
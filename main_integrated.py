@@ -8,15 +8,22 @@ Combines profile discovery, candidate scoring, and message generation
 from linkedin_agent import LinkedInProfileFinder
 from candidate_scorer import CandidateScorer
 from message_generator import MessageGenerator
+from job_description import JobDescription
+from outreach_export import export_messages
+from records import json_default, to_jsonable
+from score_store import ScoreStore
 import json
 import os
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 
 class LinkedInSourcingAgent:
-    def __init__(self):
-        self.finder = LinkedInProfileFinder()
-        self.scorer = CandidateScorer()
+    def __init__(self, cache_db: str = "linkedin_cache.db"):
+        # Every cache (searches, PDF text, profiles, scores) lives in cache_db
+        self.finder = LinkedInProfileFinder(cache_db=cache_db)
+        self.scorer = CandidateScorer(cache_db=cache_db)
         self.message_gen = MessageGenerator()
+        # Per-dimension scores per (job, candidate), for re-ranking with new weights without rescoring
+        self.score_store = ScoreStore(cache_db)
     
     def process_job_description(self, pdf_path: str, max_candidates: int = 10, max_messages: int = 5) -> Dict:
         """
@@ -26,22 +33,31 @@ class LinkedInSourcingAgent:
         print("🚀 LinkedIn Sourcing Agent - Complete Pipeline")
         print("=" * 60)
         
-        # Step 1: Extract job description
+        # Step 1: Extract and parse job description (once for the whole pipeline)
         print(f"\n📄 Step 1: Extracting job description from {pdf_path}")
-        job_description = self.finder.extract_text_from_pdf(pdf_path)
+        job = self.finder.parse_job_description(pdf_path)
         
-        if not job_description:
+        if not job:
             return {"error": "Failed to extract job description from PDF"}
         
+        return self.process_job(job, max_candidates=max_candidates, max_messages=max_messages)
+    
+    def process_job(self, job: JobDescription, max_candidates: int = 10, max_messages: int = 5) -> Dict:
+        """
+        Run the pipeline for an already-parsed job description
+        Every stage reuses the same JobDescription instead of re-reading the source
+        """
+        job_description = job.text
         print(f"✅ Extracted {len(job_description)} characters")
         print(f"📝 Sample: {job_description[:200]}...")
         
         # Step 2: Find LinkedIn profiles
         print(f"\n🔍 Step 2: Finding LinkedIn profiles (max: {max_candidates})")
-        candidates = self.finder.find_profiles_from_pdf(pdf_path, max_results=max_candidates)
+        candidates = self.finder.find_profiles(job, max_results=max_candidates)
         
         if not candidates:
             return {
+                "job_id": job.job_id,
                 "job_description": job_description[:500],
                 "candidates_found": 0,
                 "scored_candidates": [],
@@ -53,23 +69,31 @@ class LinkedInSourcingAgent:
         
         # Step 3: Score candidates
         print(f"\n📊 Step 3: Scoring candidates using fit score algorithm")
-        scored_candidates = self.scorer.score_candidates(candidates, job_description)
+        # Compact records from here on; they become JSON only at the API boundary (records.to_jsonable)
+        scored_candidates = self.scorer.score_candidates(candidates, job, as_records=True)
+        candidates_found = len(candidates)
+        del candidates  # the search dicts are not needed once scored
+        self.score_store.save(job.job_id, scored_candidates)
         
         print(f"✅ Scored {len(scored_candidates)} candidates")
         
         # Step 4: Generate personalized messages
         print(f"\n💬 Step 4: Generating personalized outreach messages (max: {max_messages})")
-        messages = self.message_gen.generate_messages_for_candidates(scored_candidates, job_description, max_messages)
+        messages = self.message_gen.generate_messages_for_candidates(scored_candidates, job, max_messages, as_records=True)
         
         print(f"✅ Generated {len(messages)} personalized messages")
+        render_cache = self.message_gen.render_cache.stats() if self.message_gen.render_cache else None
+        if render_cache and render_cache['hits'] + render_cache['misses']:
+            print(f"   Render cache hit rate: {render_cache['hit_rate']:.0%} ({render_cache['entries']} distinct bodies)")
         
         # Step 5: Create message summary
-        message_summary = self.message_gen.create_message_summary(messages)
+        message_summary = self.message_gen.create_message_summary(messages, job)
         
         # Step 6: Prepare results
         results = {
+            "job_id": job.job_id,
             "job_description": job_description[:500] + "...",
-            "candidates_found": len(candidates),
+            "candidates_found": candidates_found,
             "scored_candidates": scored_candidates,
             "top_candidates": scored_candidates[:5],  # Top 5 for quick reference
             "messages": messages,
@@ -165,11 +189,23 @@ class LinkedInSourcingAgent:
         """Save results to JSON file"""
         try:
             with open(output_file, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+                # Encoded straight from the records, without a JSON-ready copy of the whole result
+                json.dump(results, f, indent=2, default=json_default)
             print(f"\n💾 Results saved to {output_file}")
         except Exception as e:
             print(f"Error saving results: {e}")
     
+    def export_messages(self, scored_candidates: Iterable[Dict], job: JobDescription, output_file: str,
+                        max_messages: Optional[int] = None) -> int:
+        """
+        Stream outreach messages to an NDJSON (.ndjson/.jsonl) or CSV file
+        Each message is written as soon as it is rendered, so campaigns of any size run in constant memory
+        """
+        messages = self.message_gen.iter_messages(scored_candidates, job, max_messages)
+        count = export_messages(messages, output_file)
+        print(f"\n💾 {count} messages exported to {output_file}")
+        return count
+    
     def get_api_response_format(self, results: Dict) -> Dict:
         """Format results for API response including messages"""
         if 'error' in results:
@@ -188,7 +224,7 @@ class LinkedInSourcingAgent:
                 "name": candidate['name'],
                 "linkedin_url": candidate['linkedin_url'],
                 "fit_score": candidate['fit_score'],
-                "score_breakdown": candidate['score_breakdown'],
+                "score_breakdown": to_jsonable(candidate['score_breakdown']),
                 "headline": candidate['headline']
             }
             api_response['top_candidates'].append(api_candidate)
@@ -200,7 +236,7 @@ class LinkedInSourcingAgent:
                 "linkedin_url": message_data['linkedin_url'],
                 "fit_score": message_data['fit_score'],
                 "message": message_data['message'],
-                "key_highlights": message_data.get('key_highlights', {})
+                "key_highlights": to_jsonable(message_data.get('key_highlights', {}))
             }
             api_response['outreach_messages'].append(api_message)
         
@@ -1,10 +1,27 @@
 import re
 import json
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 import random
+from job_description import JobDescription
+from message_analyzer import SKILL_INDICATORS, MessageAnalyzer, MessageIndicators
+from message_renderer import MessageRenderer, RenderCache, score_tier
+from records import OutreachMessage, ScoreBreakdown
+
+# Any of these in a company name makes it the one highlighted
+TOP_COMPANY_PATTERN = re.compile('google|microsoft|apple|amazon|meta|openai|anthropic')
+
+# The job the outreach messages are written for, unless a per-job config is passed in
+DEFAULT_JOB_CONTEXT = {
+    "company": "Windsurf (Codeium)",
+    "role": "Software Engineer, ML Research",
+    "location": "Mountain View, CA (or remote)",
+    "salary_range": "$140-300k + equity",
+    "focus": "training LLMs for code generation"
+}
 
 class MessageGenerator:
-    def __init__(self):
+    def __init__(self, render_cache_size: int = 4096, job_context: Optional[Dict[str, str]] = None):
         # Professional tone templates
         self.templates = {
             "high_score": [
@@ -33,16 +50,14 @@ class MessageGenerator:
             "Are you open to exploring this opportunity further?"
         ]
         
-        # Job-specific details
-        self.job_context = {
-            "company": "Windsurf (Codeium)",
-            "role": "Software Engineer, ML Research",
-            "location": "Mountain View, CA (or remote)",
-            "salary_range": "$140-300k + equity",
-            "focus": "training LLMs for code generation"
-        }
+        # Job-specific details: company, role, location, salary_range and focus
+        self.job_context = {**DEFAULT_JOB_CONTEXT, **(job_context or {})}
+        # Rendered bodies per highlight set (name substituted last); 0 disables it
+        self.render_cache = RenderCache(render_cache_size) if render_cache_size else None
+        self._renderer: Optional[MessageRenderer] = None
+        self._analyzer: Optional[MessageAnalyzer] = None
 
-    def extract_candidate_highlights(self, candidate: Dict, job_description: str) -> Dict:
+    def extract_candidate_highlights(self, candidate: Dict, job_description: Union[JobDescription, str]) -> Dict:
         """
         Extract key highlights from candidate profile for personalization
         """
@@ -76,9 +91,8 @@ class MessageGenerator:
         if experience:
             highlights['company_experience'] = experience[0]
             # Find top company
-            top_companies = ['google', 'microsoft', 'apple', 'amazon', 'meta', 'openai', 'anthropic']
             for company in experience:
-                if any(top in company.lower() for top in top_companies):
+                if TOP_COMPANY_PATTERN.search(company.lower()):
                     highlights['top_company'] = company
                     break
             if not highlights['top_company']:
@@ -110,7 +124,7 @@ class MessageGenerator:
         
         return highlights
 
-    def generate_job_context(self, job_description: str) -> str:
+    def generate_job_context(self, job_description: Union[JobDescription, str]) -> str:
         """
         Generate job context paragraph
         """
@@ -120,55 +134,69 @@ I'm reaching out because we're hiring for a {self.job_context['role']} position
 The role focuses on {self.job_context['focus']} and offers {self.job_context['salary_range']} in {self.job_context['location']}.
 """
 
-    def generate_personalized_message(self, candidate: Dict, job_description: str) -> str:
+    @property
+    def renderer(self) -> MessageRenderer:
+        """Compiled templates, rebuilt whenever templates or cta_templates are changed"""
+        if self._renderer is None or not self._renderer.compiled_from(self.templates, self.cta_templates):
+            if self.render_cache is not None:
+                self.render_cache.clear()
+            self._renderer = MessageRenderer(self.templates, self.cta_templates, self.render_cache)
+        return self._renderer
+
+    def generate_personalized_message(self, candidate: Dict, job_description: Union[JobDescription, str],
+                                      highlights: Optional[Dict] = None) -> str:
         """
         Generate a personalized LinkedIn message for a candidate
+        Pass highlights when they were already extracted for this candidate
         """
-        highlights = self.extract_candidate_highlights(candidate, job_description)
+        if highlights is None:
+            highlights = self.extract_candidate_highlights(candidate, job_description)
         score = candidate.get('fit_score', 5.0)
         
-        # Choose template based on score
-        if score >= 8.0:
-            template_category = "high_score"
-        elif score >= 6.0:
-            template_category = "medium_score"
-        else:
-            template_category = "low_score"
-        
-        # Select random template
-        template = random.choice(self.templates[template_category])
-        
-        # Fill template with candidate details
-        try:
-            personalized_opening = template.format(**highlights)
-        except KeyError:
-            # Fallback if template formatting fails
-            personalized_opening = f"Hi {highlights['name']}, I came across your profile and was impressed by your background."
-        
-        # Add job context
+        # Random template for the score tier, filled with candidate details, then job context and a random CTA
+        return self.renderer.render(score_tier(score), highlights, self.generate_job_context(job_description))
+
+    def iter_messages(self, scored_candidates: Iterable[Dict], job_description: Union[JobDescription, str],
+                      max_messages: Optional[int] = None) -> Iterator[OutreachMessage]:
+        """
+        Yield an OutreachMessage per candidate as soon as it is rendered
+        Candidates are read lazily (any iterable, e.g. a generator), so a campaign
+        can be streamed to disk without holding every message in memory
+        """
+        # The job context paragraph is the same for every candidate
+        renderer = self.renderer
         job_context = self.generate_job_context(job_description)
-        
-        # Add call-to-action
-        cta = random.choice(self.cta_templates)
-        
-        # Combine into full message
-        message = f"{personalized_opening}\n\n{job_context}\n\n{cta}"
-        
-        # Clean up formatting
-        message = re.sub(r'\n\s*\n\s*\n', '\n\n', message)  # Remove extra line breaks
-        message = message.strip()
-        
-        return message
+        for candidate in islice(scored_candidates, max_messages):
+            # Highlights are extracted once, for both the message and key_highlights
+            highlights = self.extract_candidate_highlights(candidate, job_description)
+            breakdown = candidate.get('score_breakdown')
+            yield OutreachMessage(
+                candidate_name=candidate.get('name', 'Unknown'),
+                linkedin_url=candidate.get('linkedin_url', ''),
+                fit_score=candidate.get('fit_score', 0),
+                message=renderer.render(score_tier(candidate.get('fit_score', 5.0)), highlights, job_context),
+                score_breakdown=breakdown if isinstance(breakdown, ScoreBreakdown) or not breakdown
+                else ScoreBreakdown.from_dict(breakdown),
+                key_highlights=highlights
+            )
 
-    def generate_messages_for_candidates(self, scored_candidates: List[Dict], job_description: str, max_messages: int = 5) -> List[Dict]:
+    def generate_messages_for_candidates(self, scored_candidates: List[Dict], job_description: Union[JobDescription, str], max_messages: int = 5,
+                                         as_records: bool = False) -> List[Union[Dict, OutreachMessage]]:
         """
         Generate personalized messages for top candidates
+        With as_records=True each message is an OutreachMessage record sharing the candidate's breakdown
         """
+        if as_records:
+            return list(self.iter_messages(scored_candidates, job_description, max_messages))
+        
         messages = []
+        renderer = self.renderer
+        job_context = self.generate_job_context(job_description)
         
         # Generate messages for top candidates
         for candidate in scored_candidates[:max_messages]:
-            message = self.generate_personalized_message(candidate, job_description)
+            highlights = self.extract_candidate_highlights(candidate, job_description)
+            message = renderer.render(score_tier(candidate.get('fit_score', 5.0)), highlights, job_context)
             
             message_data = {
                 'candidate_name': candidate.get('name', 'Unknown'),
@@ -176,60 +204,52 @@ The role focuses on {self.job_context['focus']} and offers {self.job_context['sa
                 'fit_score': candidate.get('fit_score', 0),
                 'message': message,
                 'score_breakdown': candidate.get('score_breakdown', {}),
-                'key_highlights': self.extract_candidate_highlights(candidate, job_description)
+                'key_highlights': highlights
             }
             
             messages.append(message_data)
         
         return messages
 
-    def generate_message_variations(self, candidate: Dict, job_description: str, num_variations: int = 3) -> List[str]:
+    def iter_message_variations(self, candidate: Dict, job_description: Union[JobDescription, str],
+                                seed: Optional[int] = None) -> Iterator[str]:
+        """
+        Lazily yield distinct messages for a candidate, one per (opening template, CTA) pair of its score tier
+        The same seed gives the same variants in the same order; highlights are extracted once
+        """
+        highlights = self.extract_candidate_highlights(candidate, job_description)
+        category = score_tier(candidate.get('fit_score', 5.0))
+        return self.renderer.variants(category, highlights, self.generate_job_context(job_description),
+                                      random.Random(seed))
+
+    def generate_message_variations(self, candidate: Dict, job_description: Union[JobDescription, str], num_variations: int = 3,
+                                    seed: Optional[int] = None) -> List[str]:
         """
         Generate multiple message variations for A/B testing
+        Variations are all different, so fewer than num_variations come back once the tier's templates run out
         """
-        variations = []
-        
-        for _ in range(num_variations):
-            message = self.generate_personalized_message(candidate, job_description)
-            variations.append(message)
-        
-        return variations
+        return list(islice(self.iter_message_variations(candidate, job_description, seed), num_variations))
+
+    def message_analyzer(self, job_description: Union[JobDescription, str, None] = None) -> MessageAnalyzer:
+        """
+        Analyzer looking for the company and role of the job the messages are written for:
+        those in self.job_context, plus a JobDescription's title and skills when one is given
+        """
+        role = self.job_context['role']
+        skills = None
+        if isinstance(job_description, JobDescription):
+            role = f"{role}, {job_description.title}" if job_description.title else role
+            skills = (*SKILL_INDICATORS, *job_description.skills) if job_description.skills else None
+        indicators = MessageIndicators.for_job(self.job_context['company'], role, skills)
+        if self._analyzer is None or self._analyzer.indicators != indicators:
+            self._analyzer = MessageAnalyzer(indicators)
+        return self._analyzer
 
-    def analyze_message_effectiveness(self, message: str) -> Dict:
+    def analyze_message_effectiveness(self, message: str, job_description: Union[JobDescription, str, None] = None) -> Dict:
         """
         Analyze message for effectiveness indicators
         """
-        analysis = {
-            'length': len(message),
-            'personalization_score': 0,
-            'professional_tone': True,
-            'has_call_to_action': False,
-            'mentions_company': False,
-            'mentions_role': False,
-            'mentions_skills': False
-        }
-        
-        # Check personalization (mentions specific details)
-        personalization_indicators = [
-            'your experience', 'your background', 'your work', 'your expertise',
-            'your skills', 'your role', 'your profile'
-        ]
-        analysis['personalization_score'] = sum(1 for indicator in personalization_indicators if indicator in message.lower())
-        
-        # Check for call-to-action
-        cta_indicators = ['would you', 'are you', 'i\'d love', 'i\'d appreciate', 'open to']
-        analysis['has_call_to_action'] = any(cta in message.lower() for cta in cta_indicators)
-        
-        # Check for company mention
-        analysis['mentions_company'] = 'windsurf' in message.lower() or 'codeium' in message.lower()
-        
-        # Check for role mention
-        analysis['mentions_role'] = 'ml research' in message.lower() or 'software engineer' in message.lower()
-        
-        # Check for skills mention
-        analysis['mentions_skills'] = any(skill in message.lower() for skill in ['python', 'ml', 'ai', 'llm', 'pytorch', 'tensorflow'])
-        
-        return analysis
+        return self.message_analyzer(job_description).analyze(message)
 
     def format_message_for_linkedin(self, message: str) -> str:
         """
@@ -247,38 +267,8 @@ The role focuses on {self.job_context['focus']} and offers {self.job_context['sa
         
         return message.strip()
 
-    def create_message_summary(self, messages: List[Dict]) -> Dict:
+    def create_message_summary(self, messages: Iterable[Dict], job_description: Union[JobDescription, str, None] = None) -> Dict:
         """
         Create a summary of generated messages
         """
-        summary = {
-            'total_messages': len(messages),
-            'average_score': 0,
-            'score_distribution': {'high': 0, 'medium': 0, 'low': 0},
-            'message_analysis': []
-        }
-        
-        if messages:
-            scores = [msg['fit_score'] for msg in messages]
-            summary['average_score'] = sum(scores) / len(scores)
-            
-            # Score distribution
-            for msg in messages:
-                score = msg['fit_score']
-                if score >= 8.0:
-                    summary['score_distribution']['high'] += 1
-                elif score >= 6.0:
-                    summary['score_distribution']['medium'] += 1
-                else:
-                    summary['score_distribution']['low'] += 1
-            
-            # Analyze each message
-            for msg in messages:
-                analysis = self.analyze_message_effectiveness(msg['message'])
-                summary['message_analysis'].append({
-                    'candidate': msg['candidate_name'],
-                    'score': msg['fit_score'],
-                    'analysis': analysis
-                })
-        
-        return summary 
\ No newline at end of file
+        return self.message_analyzer(job_description).summarize(messages)
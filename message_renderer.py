@@ -0,0 +1,293 @@
+import random
+import re
+import threading
+from operator import itemgetter
+from string import Formatter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Runs of three or more line breaks (with whitespace between) collapse to one blank line
+EXTRA_LINE_BREAKS = re.compile(r'\n\s*\n\s*\n')
+
+
+def clean_message(message: str) -> str:
+    """The formatting cleanup every outreach message gets"""
+    return EXTRA_LINE_BREAKS.sub('\n\n', message).strip()
+
+
+def score_tier(score: float) -> str:
+    """Template category for a fit score"""
+    if score >= 8.0:
+        return "high_score"
+    elif score >= 6.0:
+        return "medium_score"
+    return "low_score"
+
+
+def fallback_opening(highlights: Dict) -> str:
+    return f"Hi {highlights['name']}, I came across your profile and was impressed by your background."
+
+
+# Stands in for the candidate's name in cached messages; the real name is substituted last
+NAME_PLACEHOLDER = '\x00name\x00'
+
+
+def name_substitutable(name) -> bool:
+    """
+    Whether a name can be swapped into an already cleaned message. A name
+    without line breaks that starts and ends with a visible character can
+    never take part in the blank-line cleanup or the final strip().
+    """
+    return isinstance(name, str) and bool(name) and '\n' not in name \
+        and not name[0].isspace() and not name[-1].isspace()
+
+
+class RenderCache:
+    """
+    Bounded LRU of rendered messages, stored split around the name.
+
+    Keyed by (tier, template, CTA, job context, values of the highlights the
+    template fills other than the name): candidates whose highlights agree
+    on those share one entry, and a hit is a single str.join with the name.
+    Lookups, inserts and counters are guarded by one lock, so a generator
+    can be shared by threads (e.g. the batch processor's workers).
+
+    A miss costs about two direct renders, so when fewer than min_hit_rate
+    of the first sample lookups hit (profiles too varied to repeat), the
+    cache sets bypassed and the renderer stops consulting it until clear().
+    """
+
+    def __init__(self, maxsize: int = 4096, min_hit_rate: float = 0.75, sample: int = 1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.min_hit_rate = min_hit_rate
+        self.sample = sample
+        self.bypassed = False
+        self._sampled = 0
+        self._sample_hits = 0
+        # A plain dict keeps the LRU order: a hit re-inserts its key at the end
+        self._entries: Dict[Tuple, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            pieces = self._entries.pop(key, None)
+            if self._sampled < self.sample:
+                self._sampled += 1
+                self._sample_hits += pieces is not None
+                if self._sampled == self.sample and self._sample_hits < self.min_hit_rate * self.sample:
+                    self.bypassed = True
+            if pieces is None:
+                self.misses += 1
+                return None
+            self._entries[key] = pieces
+            self.hits += 1
+            return pieces
+
+    def put(self, key: Tuple, pieces: Tuple[str, ...]):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = pieces
+            while len(self._entries) > self.maxsize:
+                del self._entries[next(iter(self._entries))]
+                self.evictions += 1
+
+    def clear(self):
+        """Drop the entries (e.g. after the templates changed) and sample afresh; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self.bypassed = False
+            self._sampled = self._sample_hits = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'bypassed': self.bypassed
+            }
+
+
+def shuffled_range(count: int, rng: random.Random) -> Iterator[int]:
+    """
+    0..count-1 in random order, drawn lazily: a Fisher-Yates shuffle whose
+    swaps are kept in a dict, so taking k values costs O(k) whatever count is
+    """
+    swapped: Dict[int, int] = {}
+    for i in range(count):
+        j = rng.randrange(i, count)
+        yield swapped.get(j, j)
+        swapped[j] = swapped.get(i, i)
+
+
+class CompiledTemplate:
+    """
+    A str.format template parsed once into alternating literals and field names.
+
+    render() joins the literals with the field values instead of re-parsing
+    the format string. Templates using conversions, format specs or
+    attribute/index lookups keep using str.format.
+    """
+    __slots__ = ('template', 'head', 'parts', 'simple', 'keyed_fields', 'keyed_values')
+
+    def __init__(self, template: str):
+        self.template = template
+        self.simple = True
+        literals = ['']
+        fields = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            literals[-1] += literal
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier():
+                self.simple = False
+            fields.append(field)
+            literals.append('')
+        self.head = literals[0]
+        # (field, literal following it) pairs
+        self.parts: List[Tuple[str, str]] = list(zip(fields, literals[1:]))
+        # The fields a rendered body depends on, apart from the name
+        self.keyed_fields = tuple(dict.fromkeys(field for field in fields if field != 'name'))
+        # Their values as a tuple, in one C call
+        if len(self.keyed_fields) > 1:
+            self.keyed_values = itemgetter(*self.keyed_fields)
+        elif self.keyed_fields:
+            self.keyed_values = lambda values, field=self.keyed_fields[0]: (values[field],)
+        else:
+            self.keyed_values = lambda values: ()
+
+    def render(self, values: Dict) -> str:
+        """template.format(**values); raises KeyError for a missing field just the same"""
+        if not self.simple:
+            return self.template.format(**values)
+        text = self.head
+        for field, literal in self.parts:
+            value = values[field]
+            text += (value if type(value) is str else format(value)) + literal
+        return text
+
+
+class MessageRenderer:
+    """
+    Opening templates and calls to action compiled once for fast rendering.
+
+    A message is opening + job context + CTA, cleaned up by clean_message().
+    The job-context-and-CTA tail is cleaned once per distinct job context,
+    so a render is a template fill and a concatenation. That shortcut is
+    exact only while the cleanup pattern cannot reach into the opening, so
+    openings containing a line break, or starting with whitespace, take the
+    full cleanup path. Random choices are made in the same order as before
+    (template, then CTA), so seeded runs produce the same messages. With a
+    RenderCache, each (template, CTA) body is rendered once per distinct
+    highlight set: candidates whose highlights differ only in the name, or
+    in fields the template does not use, reuse one body with their name
+    substituted last.
+    """
+
+    def __init__(self, templates: Dict[str, Sequence[str]], cta_templates: Sequence[str],
+                 cache: Optional[RenderCache] = None):
+        self.source: Tuple = (
+            {category: list(options) for category, options in templates.items()},
+            list(cta_templates)
+        )
+        self.templates = {category: [CompiledTemplate(t) for t in options]
+                          for category, options in templates.items()}
+        self._template_indices = {category: range(len(options)) for category, options in self.templates.items()}
+        self.cta_templates = list(cta_templates)
+        self._cta_indices = range(len(self.cta_templates))
+        self._tails: Dict[str, List[Optional[str]]] = {}
+        self.cache = cache
+
+    def compiled_from(self, templates: Dict[str, Sequence[str]], cta_templates: Sequence[str]) -> bool:
+        """Whether this renderer still matches the given template lists"""
+        return self.source[0] == templates and self.source[1] == cta_templates
+
+    def tails(self, job_context: str) -> List[Optional[str]]:
+        """Cleaned '\\n\\n' + job_context + '\\n\\n' + CTA per CTA (None when it cannot be precomputed)"""
+        tails = self._tails.get(job_context)
+        if tails is None:
+            tails = []
+            for cta in self.cta_templates:
+                tail = EXTRA_LINE_BREAKS.sub('\n\n', f"\n\n{job_context}\n\n{cta}").rstrip()
+                tails.append(tail if tail.strip() else None)
+            if len(self._tails) > 64:
+                self._tails.clear()
+            self._tails[job_context] = tails
+        return tails
+
+    def opening(self, template: CompiledTemplate, highlights: Dict) -> str:
+        try:
+            return template.render(highlights)
+        except KeyError:
+            # Fallback if template formatting fails
+            return fallback_opening(highlights)
+
+    def render(self, category: str, highlights: Dict, job_context: str,
+               rng: random.Random = random) -> str:
+        templates = self.templates[category]
+        template_index = rng.choice(self._template_indices[category])
+        cta_index = rng.choice(self._cta_indices)
+        template = templates[template_index]
+        name = highlights.get('name')
+        if self.cache is None or self.cache.bypassed or not template.simple or not name_substitutable(name):
+            return self.assemble(self.opening(template, highlights), job_context, cta_index)
+
+        try:
+            values = template.keyed_values(highlights)
+        except KeyError:
+            values = None  # the fallback opening only uses the name
+        key = (category, template_index, cta_index, job_context, values)
+        try:
+            pieces = self.cache.get(key)
+        except TypeError:
+            # An unhashable highlight (e.g. a list) fills this template
+            return self.assemble(self.opening(template, highlights), job_context, cta_index)
+        if pieces is not None:
+            return name.join(pieces)
+        try:
+            # Only cached when the placeholder is unambiguous (no highlight or template contains it)
+            cacheable = '\x00' not in template.template and (values is None or '\x00' not in ''.join(values))
+        except TypeError:
+            cacheable = False  # a non-string highlight, whose formatting is not checked
+        if not cacheable:
+            return self.assemble(self.opening(template, highlights), job_context, cta_index)
+        opening = self.opening(template, {**highlights, 'name': NAME_PLACEHOLDER})
+        pieces = tuple(self.assemble(opening, job_context, cta_index).split(NAME_PLACEHOLDER))
+        self.cache.put(key, pieces)
+        return name.join(pieces)
+
+    def assemble(self, opening: str, job_context: str, cta_index: int) -> str:
+        tail = self.tails(job_context)[cta_index]
+        if tail is None or '\n' in opening or not opening or opening[0].isspace():
+            return clean_message(f"{opening}\n\n{job_context}\n\n{self.cta_templates[cta_index]}")
+        return opening + tail
+
+    def variants(self, category: str, highlights: Dict, job_context: str,
+                 rng: Optional[random.Random] = None) -> Iterator[str]:
+        """
+        Distinct messages of a tier, lazily, in random order: each
+        (opening template, CTA) pair is visited at most once and a message
+        equal to one already yielded (e.g. two templates falling back to the
+        same opening) is skipped. Each opening is filled at most once.
+        """
+        rng = rng or random.Random()
+        templates = self.templates[category]
+        openings: Dict[int, str] = {}
+        seen = set()
+        ctas = len(self.cta_templates)
+        for pair in shuffled_range(len(templates) * ctas, rng):
+            template_index, cta_index = divmod(pair, ctas)
+            if template_index not in openings:
+                openings[template_index] = self.opening(templates[template_index], highlights)
+            message = self.assemble(openings[template_index], job_context, cta_index)
+            if message not in seen:
+                seen.add(message)
+                yield message
@@ -0,0 +1,95 @@
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import IO, Dict, Iterable, Union
+
+from candidate_scorer import DEFAULT_WEIGHTS
+from records import OutreachMessage, to_jsonable
+
+MessageLike = Union[Dict, OutreachMessage]
+
+# One column per score dimension; key_highlights is kept as a JSON string
+CSV_FIELDS = ('candidate_name', 'linkedin_url', 'fit_score', *DEFAULT_WEIGHTS, 'message', 'key_highlights')
+
+
+class MessageWriter(ABC):
+    """
+    Writes outreach messages (dicts or OutreachMessage records) to an open
+    text file one at a time.
+
+    Nothing is collected: each message is serialized as it arrives and the
+    file is flushed every flush_every messages, so memory stays flat however
+    long the campaign, and a partial export is readable while it runs.
+    """
+
+    def __init__(self, file: IO[str], flush_every: int = 100):
+        if flush_every < 1:
+            raise ValueError("flush_every must be at least 1")
+        self.file = file
+        self.flush_every = flush_every
+        self.count = 0
+
+    def write(self, message: MessageLike):
+        self._write(message)
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.file.flush()
+
+    def write_all(self, messages: Iterable[MessageLike]) -> int:
+        """Write every message, then flush; returns the number written so far"""
+        for message in messages:
+            self.write(message)
+        self.file.flush()
+        return self.count
+
+    @abstractmethod
+    def _write(self, message: MessageLike):
+        """Serialize one message to self.file"""
+
+
+class NDJSONWriter(MessageWriter):
+    """One JSON object per line"""
+
+    def _write(self, message: MessageLike):
+        self.file.write(json.dumps(to_jsonable(message), ensure_ascii=False, default=str))
+        self.file.write('\n')
+
+
+class CSVWriter(MessageWriter):
+    """A header row, then one row per message with the score breakdown flattened"""
+
+    def __init__(self, file: IO[str], flush_every: int = 100):
+        super().__init__(file, flush_every)
+        self._csv = csv.writer(file)
+        self._csv.writerow(CSV_FIELDS)
+
+    def _write(self, message: MessageLike):
+        breakdown = message.get('score_breakdown') or {}
+        self._csv.writerow([
+            message.get('candidate_name', ''),
+            message.get('linkedin_url', ''),
+            message.get('fit_score', ''),
+            *(breakdown.get(name, '') for name in DEFAULT_WEIGHTS),
+            message.get('message', ''),
+            json.dumps(to_jsonable(message.get('key_highlights') or {}), ensure_ascii=False)
+        ])
+
+
+WRITERS = {
+    '.ndjson': NDJSONWriter,
+    '.jsonl': NDJSONWriter,
+    '.csv': CSVWriter,
+}
+
+
+def export_messages(messages: Iterable[MessageLike], output_file: str, flush_every: int = 100) -> int:
+    """
+    Stream messages to output_file, in the format its extension names
+    (.ndjson/.jsonl or .csv). Returns the number of messages written.
+    """
+    extension = os.path.splitext(output_file)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Unsupported export format '{extension}' (use {', '.join(WRITERS)})")
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        return WRITERS[extension](f, flush_every).write_all(messages)
@@ -0,0 +1,126 @@
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from cache_db import get_database
+
+SELECT_ENTRY = "SELECT text, page_count, extractor_version, last_accessed FROM pdf_text_cache WHERE sha256 = ?"
+TOUCH_ENTRY = "UPDATE pdf_text_cache SET last_accessed = ? WHERE sha256 = ?"
+INSERT_ENTRY = (
+    "INSERT OR REPLACE INTO pdf_text_cache "
+    "(sha256, text, page_count, extractor_version, size_bytes, created_at, last_accessed) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+TOTAL_SIZE = "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM pdf_text_cache"
+LRU_ENTRIES = "SELECT sha256, size_bytes FROM pdf_text_cache ORDER BY last_accessed ASC"
+DELETE_ENTRY = "DELETE FROM pdf_text_cache WHERE sha256 = ?"
+
+
+def hash_pdf_bytes(data: bytes) -> str:
+    """SHA-256 of the raw PDF bytes, used as the cache key"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class PDFTextCache:
+    """
+    Content-addressed cache of extracted PDF text.
+
+    Entries are keyed by the SHA-256 of the PDF bytes, so re-uploading the same
+    file under any name skips parsing. An entry only counts as a hit when it was
+    produced by the current extractor version. The table is bounded by total
+    text size and evicts least-recently-used entries first. A hit only
+    rewrites the access time once it is touch_interval seconds old, so reads
+    of hot entries stay plain SELECTs that never wait for the write lock.
+    """
+
+    def __init__(self, db_path: str = "linkedin_cache.db", max_bytes: int = 50 * 1024 * 1024,
+                 touch_interval: float = 60.0):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.db = get_database(db_path)
+        self._init_db()
+
+    def _init_db(self):
+        """Create the text cache table"""
+        with self.db.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pdf_text_cache (
+                    sha256 TEXT PRIMARY KEY,
+                    text TEXT,
+                    page_count INTEGER,
+                    extractor_version TEXT,
+                    size_bytes INTEGER,
+                    created_at DATETIME,
+                    last_accessed DATETIME
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_pdf_text_cache_last_accessed ON pdf_text_cache (last_accessed)"
+            )
+
+    def get(self, sha256: str, extractor_version: str) -> Optional[Dict]:
+        """Return the cached entry for these PDF bytes, or None on a miss"""
+        row = self.db.query_one(SELECT_ENTRY, (sha256,))
+        if row and row[2] == extractor_version:
+            now = datetime.now()
+            # Stored as 'YYYY-MM-DD HH:MM:SS.ffffff', which compares like the time it holds
+            if row[3] is None or str(row[3]) <= str(now - timedelta(seconds=self.touch_interval)):
+                self.db.execute(TOUCH_ENTRY, (now, sha256))
+            self._count(hit=True)
+            return {'text': row[0], 'page_count': row[1], 'extractor_version': row[2]}
+        self._count(hit=False)
+        return None
+
+    def put(self, sha256: str, text: str, page_count: int, extractor_version: str):
+        """Store extracted text and evict old entries beyond the size budget"""
+        size_bytes = len(text.encode('utf-8'))
+        if size_bytes > self.max_bytes:
+            return
+        now = datetime.now()
+        with self.db.transaction() as conn:
+            conn.execute(INSERT_ENTRY, (sha256, text, page_count, extractor_version, size_bytes, now, now))
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least-recently-used entries until the table fits in max_bytes"""
+        total = conn.execute(TOTAL_SIZE).fetchone()[1]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for sha256, size_bytes in conn.execute(LRU_ENTRIES).fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((sha256,))
+            total -= size_bytes
+        conn.executemany(DELETE_ENTRY, evicted)
+        with self._lock:
+            self.evictions += len(evicted)
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict:
+        """Hit/miss counters plus current table size"""
+        entries, total_bytes = self.db.query_one(TOTAL_SIZE)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': entries,
+                'total_bytes': total_bytes,
+                'max_bytes': self.max_bytes
+            }
@@ -0,0 +1,217 @@
+import io
+import os
+import atexit
+import multiprocessing
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version as package_version, PackageNotFoundError
+from typing import Dict, List, Sequence, Tuple
+
+
+class PDFBackend(ABC):
+    """
+    Interface for a text extraction library.
+
+    Backends work on raw PDF bytes and a list of zero-based page numbers so a
+    document can be split across worker processes and re-joined in order.
+    """
+    name = "base"
+    package = ""
+
+    def is_available(self) -> bool:
+        try:
+            self._import()
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def version(self) -> str:
+        """Identifies the extractor in cache entries"""
+        try:
+            return f"{self.name}-{package_version(self.package)}"
+        except PackageNotFoundError:
+            return f"{self.name}-unknown"
+
+    @abstractmethod
+    def _import(self):
+        """Import and return the library module; raises ImportError if it is not installed"""
+
+    @abstractmethod
+    def page_count(self, data: bytes) -> int:
+        """Number of pages in the document"""
+
+    @abstractmethod
+    def extract_pages(self, data: bytes, page_numbers: Sequence[int]) -> List[str]:
+        """Return the text of each requested page, in the order requested"""
+
+
+class PyPDF2Backend(PDFBackend):
+    """Pure-Python PyPDF2 extraction (the historical default)"""
+    name = "pypdf2"
+    package = "PyPDF2"
+
+    def _import(self):
+        import PyPDF2
+        return PyPDF2
+
+    def _reader(self, data: bytes):
+        PyPDF2 = self._import()
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        # Check if PDF is encrypted
+        if reader.is_encrypted:
+            try:
+                reader.decrypt('')  # Try empty password
+            except Exception:
+                raise ValueError("PDF is encrypted and cannot be read")
+        return reader
+
+    def page_count(self, data: bytes) -> int:
+        return len(self._reader(data).pages)
+
+    def extract_pages(self, data: bytes, page_numbers: Sequence[int]) -> List[str]:
+        reader = self._reader(data)
+        return [reader.pages[i].extract_text() or "" for i in page_numbers]
+
+
+class PdfminerBackend(PDFBackend):
+    """pdfminer.six layout-aware extraction"""
+    name = "pdfminer"
+    package = "pdfminer.six"
+
+    def _import(self):
+        from pdfminer import high_level
+        return high_level
+
+    def page_count(self, data: bytes) -> int:
+        from pdfminer.pdfpage import PDFPage
+        return sum(1 for _ in PDFPage.get_pages(io.BytesIO(data)))
+
+    def extract_pages(self, data: bytes, page_numbers: Sequence[int]) -> List[str]:
+        high_level = self._import()
+        # pdfminer terminates every page with a form feed
+        text = high_level.extract_text(io.BytesIO(data), page_numbers=list(page_numbers))
+        pages = text.split('\x0c')
+        return (pages + [""] * len(page_numbers))[:len(page_numbers)]
+
+
+class PypdfiumBackend(PDFBackend):
+    """PDFium (C++) extraction via pypdfium2, the fastest local option"""
+    name = "pypdfium2"
+    package = "pypdfium2"
+
+    def _import(self):
+        import pypdfium2
+        return pypdfium2
+
+    def page_count(self, data: bytes) -> int:
+        pdf = self._import().PdfDocument(data)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def extract_pages(self, data: bytes, page_numbers: Sequence[int]) -> List[str]:
+        pdf = self._import().PdfDocument(data)
+        try:
+            texts = []
+            for i in page_numbers:
+                page = pdf[i]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range().replace('\r\n', '\n'))
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            pdf.close()
+
+
+BACKENDS: Dict[str, PDFBackend] = {
+    backend.name: backend for backend in (PyPDF2Backend(), PdfminerBackend(), PypdfiumBackend())
+}
+
+
+def get_backend(name: str) -> PDFBackend:
+    """Look up a registered backend by name"""
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown PDF backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    if not backend.is_available():
+        raise ValueError(f"PDF backend '{name}' is not installed (pip install {backend.package})")
+    return backend
+
+
+def available_backends() -> List[str]:
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def _extract_chunk(backend_name: str, data: bytes, page_numbers: List[int]) -> List[str]:
+    """Process-pool entry point: extract one contiguous run of pages"""
+    return BACKENDS[backend_name].extract_pages(data, page_numbers)
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pools are shared per worker count and live for the whole process"""
+    with _pools_lock:
+        if workers not in _pools:
+            # spawn, not fork: the API process also runs the shared HTTP client's loop thread
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pools[workers]
+
+
+@atexit.register
+def _shutdown_pools():
+    for pool in _pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class PDFTextExtractor:
+    """
+    Extracts PDF text with a selectable backend.
+
+    With workers > 1, documents of at least min_parallel_pages pages are split
+    into contiguous page chunks, extracted in a process pool and joined in
+    page order. Smaller documents are extracted inline, where pool overhead
+    would dominate.
+    """
+
+    def __init__(self, backend: str = "pypdf2", workers: int = 1, min_parallel_pages: int = 8):
+        self.backend = get_backend(backend)
+        self.workers = max(1, workers)
+        self.min_parallel_pages = min_parallel_pages
+
+    @classmethod
+    def from_env(cls) -> "PDFTextExtractor":
+        """Per-deployment selection via PDF_BACKEND / PDF_WORKERS"""
+        return cls(
+            backend=os.getenv("PDF_BACKEND", "pypdf2"),
+            workers=int(os.getenv("PDF_WORKERS", "1")),
+        )
+
+    @property
+    def version(self) -> str:
+        return self.backend.version
+
+    def extract(self, data: bytes) -> Tuple[str, int]:
+        """Return (text, page_count); pages are newline-joined and the result stripped"""
+        page_count = self.backend.page_count(data)
+        pages = list(range(page_count))
+
+        if self.workers > 1 and page_count >= self.min_parallel_pages:
+            chunk_size = -(-page_count // self.workers)
+            chunks = [pages[i:i + chunk_size] for i in range(0, page_count, chunk_size)]
+            pool = _get_pool(self.workers)
+            futures = [pool.submit(_extract_chunk, self.backend.name, data, chunk) for chunk in chunks]
+            page_texts = [text for future in futures for text in future.result()]
+        else:
+            page_texts = self.backend.extract_pages(data, pages)
+
+        text = "".join(page_text + "\n" for page_text in page_texts if page_text)
+        return text.strip(), page_count
+
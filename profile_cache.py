@@ -0,0 +1,154 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import unquote, urlsplit
+
+from cache_db import get_database
+
+SELECT_ENTRY = (
+    "SELECT profile_data, fetched_at, etag, last_modified, last_accessed FROM profile_cache WHERE url = ?"
+)
+TOUCH_ENTRY = "UPDATE profile_cache SET fetched_at = ?, last_accessed = ? WHERE url = ?"
+ACCESS_ENTRY = "UPDATE profile_cache SET last_accessed = ? WHERE url = ?"
+INSERT_ENTRY = (
+    "INSERT OR REPLACE INTO profile_cache "
+    "(url, profile_data, fetched_at, etag, last_modified, size_bytes, last_accessed) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+TOTAL_SIZE = "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM profile_cache"
+LRU_ENTRIES = "SELECT url, size_bytes FROM profile_cache ORDER BY last_accessed ASC"
+DELETE_ENTRY = "DELETE FROM profile_cache WHERE url = ?"
+
+
+def canonical_profile_url(url: str) -> str:
+    """
+    One key per LinkedIn profile, however the URL was written.
+
+    Country subdomains, http/https, query strings, fragments, trailing
+    slashes, percent-encoding and letter case all map to
+    https://www.linkedin.com/in/<slug>. Other URLs only lose their query and
+    fragment.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    path = unquote(parts.path).rstrip('/')
+    if host == 'linkedin.com' or host.endswith('.linkedin.com'):
+        segments = [s for s in path.split('/') if s]
+        if len(segments) >= 2 and segments[0].lower() == 'in':
+            return f"https://www.linkedin.com/in/{segments[1].lower()}"
+    return f"{parts.scheme or 'https'}://{host}{path}"
+
+
+class ProfileCache:
+    """
+    Persistent store of parsed profile data, keyed by canonical profile URL.
+
+    Each entry keeps the parsed profile_data, when it was fetched and the
+    response's ETag/Last-Modified validators. Entries younger than ttl are
+    served as-is; older ones are returned marked stale, so the caller can
+    revalidate them with a conditional request and call refresh() on a 304.
+    The table is bounded by total size and evicts least-recently-used
+    entries first. A hit only rewrites the access time once it is
+    touch_interval seconds old, so reads of hot entries stay plain SELECTs.
+    """
+
+    def __init__(self, db_path: str = "linkedin_cache.db", ttl: float = 3 * 24 * 60 * 60,
+                 max_bytes: int = 50 * 1024 * 1024, touch_interval: float = 60.0):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.db = get_database(db_path)
+        self._lock = threading.Lock()
+        self._stats = {'fresh_hits': 0, 'stale_hits': 0, 'misses': 0, 'revalidated': 0, 'evictions': 0}
+        self._init_db()
+
+    def _init_db(self):
+        with self.db.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS profile_cache (
+                    url TEXT PRIMARY KEY,
+                    profile_data TEXT,
+                    fetched_at REAL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    size_bytes INTEGER,
+                    last_accessed REAL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_profile_cache_last_accessed ON profile_cache (last_accessed)"
+            )
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Return {'profile_data', 'fetched_at', 'etag', 'last_modified', 'fresh'}
+        for the profile, or None if it was never fetched
+        """
+        key = canonical_profile_url(url)
+        row = self.db.query_one(SELECT_ENTRY, (key,))
+        if row is None:
+            self._count('misses')
+            return None
+        now = time.time()
+        fresh = now - row[1] < self.ttl
+        if row[4] is None or now - row[4] >= self.touch_interval:
+            self.db.execute(ACCESS_ENTRY, (now, key))
+        self._count('fresh_hits' if fresh else 'stale_hits')
+        return {
+            'profile_data': json.loads(row[0]),
+            'fetched_at': row[1],
+            'etag': row[2],
+            'last_modified': row[3],
+            'fresh': fresh
+        }
+
+    def put(self, url: str, profile_data: Dict, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a freshly fetched profile and evict old entries beyond the size budget"""
+        payload = json.dumps(profile_data)
+        if len(payload) > self.max_bytes:
+            return
+        now = time.time()
+        with self.db.transaction() as conn:
+            conn.execute(INSERT_ENTRY, (canonical_profile_url(url), payload, now, etag, last_modified,
+                                        len(payload), now))
+            self._evict(conn)
+
+    def refresh(self, url: str):
+        """Mark an entry fresh again after the server answered 304 Not Modified"""
+        now = time.time()
+        self.db.execute(TOUCH_ENTRY, (now, now, canonical_profile_url(url)))
+        self._count('revalidated')
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least-recently-used entries until the table fits in max_bytes"""
+        total = conn.execute(TOTAL_SIZE).fetchone()[1]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for url, size_bytes in conn.execute(LRU_ENTRIES).fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= size_bytes
+        conn.executemany(DELETE_ENTRY, evicted)
+        with self._lock:
+            self._stats['evictions'] += len(evicted)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict:
+        """Hit/miss/revalidation counters plus current table size"""
+        entries, total_bytes = self.db.query_one(TOTAL_SIZE)
+        with self._lock:
+            lookups = self._stats['fresh_hits'] + self._stats['stale_hits'] + self._stats['misses']
+            return dict(
+                self._stats,
+                fresh_hit_rate=round(self._stats['fresh_hits'] / lookups, 4) if lookups else 0.0,
+                entries=entries,
+                total_bytes=total_bytes,
+                max_bytes=self.max_bytes
+            )
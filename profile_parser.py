@@ -0,0 +1,78 @@
+import re
+from functools import lru_cache
+from typing import FrozenSet
+
+from bs4 import BeautifulSoup
+
+from records import ProfileData
+from skill_matcher import SkillMatcher
+
+# Section fallbacks when the page has no section#education / section#experience
+EDUCATION_PATTERN = re.compile('education', re.I)
+EXPERIENCE_PATTERN = re.compile('experience', re.I)
+
+
+@lru_cache(maxsize=8)
+def _skill_matcher(skills: FrozenSet[str]) -> SkillMatcher:
+    # Built once per vocabulary in each process
+    return SkillMatcher(skills)
+
+
+def parse_profile_html(html: str, skills: FrozenSet[str] = frozenset()) -> ProfileData:
+    """
+    Profile fields for scoring, from a profile page's HTML.
+
+    Pure and CPU-bound: it only reads its arguments, so it can run in a
+    worker process, away from the threads doing network I/O. skills is the
+    vocabulary searched for in the page text.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    name = headline = location = ''
+    education = []
+    experience = []
+
+    # Extract name (from title or meta tags)
+    title_tag = soup.find('title')
+    if title_tag:
+        title_text = title_tag.get_text()
+        if '|' in title_text:
+            name = title_text.split('|')[0].strip()
+
+    # Extract headline
+    headline_elem = soup.find('div', {'class': 'text-body-medium'}) or \
+        soup.find('h2', {'class': 'pv-text-details__left-panel'})
+    if headline_elem:
+        headline = headline_elem.get_text().strip()
+
+    # Extract location
+    location_elem = soup.find('span', {'class': 'text-body-small'}) or \
+        soup.find('div', {'class': 'pv-text-details__left-panel'})
+    if location_elem:
+        location = location_elem.get_text().strip()
+
+    # Extract education (simplified - look for education section)
+    education_section = soup.find('section', {'id': 'education'}) or \
+        soup.find('section', string=EDUCATION_PATTERN)
+    if education_section:
+        schools = education_section.find_all('h3') or education_section.find_all('div', {'class': 'pv-entity__school-name'})
+        education = [school.get_text().strip() for school in schools]
+
+    # Extract experience (simplified)
+    experience_section = soup.find('section', {'id': 'experience'}) or \
+        soup.find('section', string=EXPERIENCE_PATTERN)
+    if experience_section:
+        companies = experience_section.find_all('h3') or experience_section.find_all('div', {'class': 'pv-entity__company-name'})
+        experience = [company.get_text().strip() for company in companies]
+
+    # Extract skills from headline and summary (text of separate elements must not run together)
+    found_skills = _skill_matcher(skills).find(soup.get_text(' ')) if skills else []
+
+    return ProfileData(
+        name=name,
+        headline=headline,
+        location=location,
+        education=tuple(education),
+        experience=tuple(experience),
+        skills=tuple(found_skills),
+        summary=''
+    )
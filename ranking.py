@@ -0,0 +1,82 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+# Score bands used by the message summary
+HIGH_SCORE = 8.0
+MEDIUM_SCORE = 6.0
+
+
+class ScoreSummary:
+    """Running statistics over every fit score seen, in constant memory"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.distribution = {'high': 0, 'medium': 0, 'low': 0}
+
+    def add(self, score: float):
+        self.count += 1
+        self.total += score
+        self.min = score if self.min is None else min(self.min, score)
+        self.max = score if self.max is None else max(self.max, score)
+        if score >= HIGH_SCORE:
+            self.distribution['high'] += 1
+        elif score >= MEDIUM_SCORE:
+            self.distribution['medium'] += 1
+        else:
+            self.distribution['low'] += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            'scored': self.count,
+            'average_score': round(self.total / self.count, 2) if self.count else 0,
+            'min_score': self.min,
+            'max_score': self.max,
+            'score_distribution': dict(self.distribution),
+        }
+
+
+class TopKRanker:
+    """
+    Keeps the k best scored candidates seen so far, plus a ScoreSummary of all.
+
+    Candidates live in a min-heap keyed by (fit_score, -arrival), so the
+    root is the one to drop next: the lowest score, and among equal scores
+    the latest arrival. The leaderboard therefore matches a stable sort of
+    the whole pool cut to k, with ties in input order. A candidate that
+    does not make it, or is pushed out later, loses its profile_data at
+    once, so memory is bounded by k whatever the pool size.
+    """
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.summary = ScoreSummary()
+        self._heap: List[Tuple[float, int, Dict]] = []
+        self._arrivals = 0
+
+    def push(self, scored_candidate: Dict) -> bool:
+        """Offer a scored candidate; returns whether it is on the leaderboard now"""
+        score = scored_candidate['fit_score']
+        self.summary.add(score)
+        self._arrivals += 1
+        entry = (score, -self._arrivals, scored_candidate)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            dropped = heapq.heapreplace(self._heap, entry)[2]
+        else:
+            dropped = scored_candidate
+        dropped.pop('profile_data', None)
+        return dropped is not scored_candidate
+
+    def top(self) -> List[Dict]:
+        """Current leaderboard, best first"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def leaderboard(self) -> Dict:
+        return {'top_candidates': self.top(), 'summary': self.summary.to_dict()}
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Requests per second and burst size per host; subdomains share their parent's bucket.
+# Matches the old fixed sleeps: 2-5 s between Google searches, 1-3 s between profile fetches.
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, float]] = {
+    'google.com': (0.3, 1),
+    'linkedin.com': (0.5, 2),
+}
+DEFAULT_RATE = (2.0, 5)
+
+# Responses that mean "slow down"
+THROTTLE_STATUSES = frozenset((429, 503))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket for one host with AIMD rate adaptation.
+
+    Tokens refill at the current rate up to burst. A throttling response halves
+    the current rate (never below min_rate) and pauses the bucket, for
+    Retry-After when the server sends one; every successful response then
+    adds back a fraction of max_rate, so the rate climbs back to the
+    configured budget but never past it. Waiters are served in arrival order.
+
+    Buckets are only touched from the shared HTTP client's event loop, so they
+    need no thread locks.
+    """
+
+    def __init__(self, max_rate: float, burst: float = 1, min_rate: Optional[float] = None,
+                 backoff_factor: float = 0.5, recovery: float = 0.05):
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else max_rate / 16
+        self.backoff_factor = backoff_factor
+        self.recovery = recovery
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self._queue: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent, then take a token"""
+        if self._queue is None:
+            self._queue = asyncio.Lock()
+        async with self._queue:
+            start = time.monotonic()
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.requests += 1
+                    self.wait_seconds += now - start
+                    return
+                else:
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+
+    def record(self, status_code: int, retry_after: Optional[float] = None):
+        """Adapt the rate to a response status"""
+        now = time.monotonic()
+        self._refill(now)
+        if status_code in THROTTLE_STATUSES:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            self.tokens = min(self.tokens, 0.0)
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self.paused_until = max(self.paused_until, now + pause)
+        elif status_code < 400:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
+
+    def stats(self) -> Dict:
+        return {
+            'rate': round(self.rate, 4),
+            'max_rate': self.max_rate,
+            'burst': self.burst,
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'wait_seconds': round(self.wait_seconds, 3),
+            'paused_for': round(max(0.0, self.paused_until - time.monotonic()), 3),
+        }
+
+
+class RateLimiter:
+    """
+    Per-host token buckets shared by every request on the shared HTTP client.
+
+    host_rates maps a domain to (requests per second, burst); a host uses the
+    most specific configured domain it belongs to ("in.linkedin.com" uses
+    "linkedin.com"), and unlisted hosts get default_rate.
+    """
+
+    def __init__(self, host_rates: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_rate: Tuple[float, float] = DEFAULT_RATE):
+        self.host_rates = dict(DEFAULT_HOST_RATES if host_rates is None else host_rates)
+        self.default_rate = default_rate
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _domain(self, host: str) -> Optional[str]:
+        parts = host.lower().split('.')
+        for i in range(len(parts)):
+            domain = '.'.join(parts[i:])
+            if domain in self.host_rates:
+                return domain
+        return None
+
+    def bucket(self, url: str) -> TokenBucket:
+        """The bucket governing requests to this URL's host"""
+        host = urlsplit(url).hostname or ''
+        key = self._domain(host) or host
+        if key not in self._buckets:
+            rate, burst = self.host_rates.get(key, self.default_rate)
+            self._buckets[key] = TokenBucket(rate, burst)
+        return self._buckets[key]
+
+    async def acquire(self, url: str):
+        await self.bucket(url).acquire()
+
+    def record(self, url: str, status_code: int, retry_after: Optional[str] = None):
+        self.bucket(url).record(status_code, parse_retry_after(retry_after))
+
+    def current_rate(self, url_or_host: str) -> float:
+        """Requests per second currently allowed for a URL or host"""
+        url = url_or_host if '//' in url_or_host else f"//{url_or_host}"
+        return self.bucket(url).rate
+
+    def stats(self) -> Dict[str, Dict]:
+        return {key: bucket.stats() for key, bucket in list(self._buckets.items())}
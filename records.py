@@ -0,0 +1,137 @@
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+
+def intern_text(value: Optional[str]) -> str:
+    """One shared copy of a string that recurs across candidates (schools, companies, skills...)"""
+    return sys.intern(value) if value else ''
+
+
+def intern_all(values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values or ())
+
+
+class Record:
+    """
+    Read access under the field names, like the dicts records replace.
+
+    record['fit_score'], record.get('profile_data', {}) and
+    'profile_data' in record work as they did on the dicts, so code
+    that only reads candidates takes either. A field that is None counts
+    as a missing key. to_dict() gives back the JSON-ready dict.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key, None) if key in self.__dataclass_fields__ else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def keys(self) -> Iterator[str]:
+        return (f.name for f in fields(self) if getattr(self, f.name) is not None)
+
+    def to_dict(self) -> Dict:
+        return {key: to_jsonable(getattr(self, key)) for key in self.keys()}
+
+
+@dataclass(slots=True)
+class ProfileData(Record):
+    """The parsed profile fields scoring and messaging read; other keys are not kept"""
+    name: str = ''
+    headline: str = ''
+    location: str = ''
+    education: Tuple[str, ...] = ()
+    experience: Tuple[str, ...] = ()
+    skills: Tuple[str, ...] = ()
+    summary: str = ''
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ProfileData':
+        return cls(
+            name=data.get('name') or '',
+            headline=intern_text(data.get('headline')),
+            location=intern_text(data.get('location')),
+            education=intern_all(data.get('education')),
+            experience=intern_all(data.get('experience')),
+            skills=intern_all(data.get('skills')),
+            summary=data.get('summary') or ''
+        )
+
+
+@dataclass(slots=True)
+class ScoreBreakdown(Record):
+    education: float
+    trajectory: float
+    company: float
+    skills: float
+    location: float
+    tenure: float
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ScoreBreakdown':
+        return cls(data['education'], data['trajectory'], data['company'],
+                   data['skills'], data['location'], data['tenure'])
+
+
+@dataclass(slots=True)
+class Candidate(Record):
+    """A search result, and once scored its fit score, breakdown and profile"""
+    name: str
+    linkedin_url: str
+    headline: str = ''
+    fit_score: Optional[float] = None
+    score_breakdown: Optional[ScoreBreakdown] = None
+    profile_data: Optional[ProfileData] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Candidate':
+        breakdown = data.get('score_breakdown')
+        profile = data.get('profile_data')
+        return cls(
+            name=data.get('name') or 'Unknown',
+            linkedin_url=data.get('linkedin_url') or '',
+            headline=intern_text(data.get('headline')),
+            fit_score=data.get('fit_score'),
+            score_breakdown=ScoreBreakdown.from_dict(breakdown) if breakdown else None,
+            profile_data=(profile if isinstance(profile, ProfileData) else ProfileData.from_dict(profile))
+            if profile is not None else None
+        )
+
+
+@dataclass(slots=True)
+class OutreachMessage(Record):
+    candidate_name: str
+    linkedin_url: str
+    fit_score: float
+    message: str
+    score_breakdown: Optional[ScoreBreakdown] = None
+    key_highlights: Optional[Dict] = None
+
+
+def to_jsonable(value: Any) -> Any:
+    """Records (also inside lists, tuples and dicts) turned into plain JSON-ready values"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """default= hook for json.dump: records are converted one at a time, as the encoder reaches them"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    return str(value)
@@ -0,0 +1,103 @@
+import time
+from typing import Dict, Iterable, List, Optional
+
+from cache_db import get_database
+from candidate_scorer import DEFAULT_WEIGHTS, validate_weights, weighted_total
+from profile_cache import canonical_profile_url
+
+DIMENSIONS = tuple(DEFAULT_WEIGHTS)
+
+INSERT_SCORE = (
+    "INSERT OR REPLACE INTO candidate_scores "
+    f"(job_id, linkedin_url, position, name, headline, {', '.join(DIMENSIONS)}, scored_at) "
+    f"VALUES (?, ?, ?, ?, ?, {', '.join('?' * len(DIMENSIONS))}, ?)"
+)
+SELECT_JOB = (
+    f"SELECT linkedin_url, name, headline, {', '.join(DIMENSIONS)} "
+    "FROM candidate_scores WHERE job_id = ? ORDER BY position"
+)
+DELETE_JOB = "DELETE FROM candidate_scores WHERE job_id = ?"
+JOB_COUNTS = "SELECT job_id, COUNT(*) FROM candidate_scores GROUP BY job_id"
+
+
+class ScoreStore:
+    """
+    Per-dimension scores of every candidate scored for a job, keyed by
+    (job_id, canonical profile URL).
+
+    The fit score is not stored: rerank() recomputes it from the stored
+    breakdowns with any weight vector, so tuning weights needs no search,
+    no profile fetch and no rescoring. Ties keep the order the candidates
+    were saved in.
+    """
+
+    def __init__(self, db_path: str = "linkedin_cache.db"):
+        self.db = get_database(db_path)
+        self._init_db()
+
+    def _init_db(self):
+        with self.db.transaction() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS candidate_scores (
+                    job_id TEXT,
+                    linkedin_url TEXT,
+                    position INTEGER,
+                    name TEXT,
+                    headline TEXT,
+                    {', '.join(f'{name} REAL' for name in DIMENSIONS)},
+                    scored_at REAL,
+                    PRIMARY KEY (job_id, linkedin_url)
+                )
+            """)
+
+    def save(self, job_id: str, scored_candidates: Iterable[Dict], replace: bool = True):
+        """
+        Store the breakdowns of scored candidates (dicts or Candidate records).
+        With replace=True earlier results for the job are dropped first.
+        """
+        now = time.time()
+        rows = []
+        for position, candidate in enumerate(scored_candidates):
+            breakdown = candidate['score_breakdown']
+            rows.append((job_id, canonical_profile_url(candidate.get('linkedin_url', '')), position,
+                         candidate.get('name', 'Unknown'), candidate.get('headline', ''),
+                         *(breakdown[name] for name in DIMENSIONS), now))
+        with self.db.transaction() as conn:
+            if replace:
+                conn.execute(DELETE_JOB, (job_id,))
+            conn.executemany(INSERT_SCORE, rows)
+
+    def load(self, job_id: str) -> List[Dict]:
+        """Stored candidates for a job, in the order they were saved"""
+        return [
+            {
+                'name': row[1],
+                'linkedin_url': row[0],
+                'headline': row[2],
+                'score_breakdown': dict(zip(DIMENSIONS, row[3:]))
+            }
+            for row in self.db.query_all(SELECT_JOB, (job_id,))
+        ]
+
+    def rerank(self, job_id: str, weights: Optional[Dict[str, float]] = None,
+               top_k: Optional[int] = None) -> List[Dict]:
+        """
+        Stored candidates ranked by fit score under weights (DEFAULT_WEIGHTS
+        if None), the best top_k of them if given. Raises KeyError for a job
+        with nothing stored and ValueError for an invalid weight vector or a
+        top_k below 1.
+        """
+        weights = validate_weights(weights)
+        if top_k is not None and top_k < 1:
+            raise ValueError(f"top_k must be at least 1, got {top_k}")
+        candidates = self.load(job_id)
+        if not candidates:
+            raise KeyError(job_id)
+        for candidate in candidates:
+            candidate['fit_score'] = weighted_total(candidate['score_breakdown'], weights)
+        candidates.sort(key=lambda c: c['fit_score'], reverse=True)
+        return candidates if top_k is None else candidates[:top_k]
+
+    def jobs(self) -> Dict[str, int]:
+        """Number of stored candidates per job"""
+        return dict(self.db.query_all(JOB_COUNTS))
@@ -0,0 +1,203 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from cache_db import get_database
+
+# Seconds an entry stays fresh, per entry type
+DEFAULT_TTLS = {
+    'search': 24 * 60 * 60,
+}
+
+SELECT_ENTRY = "SELECT value, expires_at, last_accessed FROM search_cache WHERE entry_type = ? AND key = ?"
+TOUCH_ENTRY = "UPDATE search_cache SET last_accessed = ? WHERE entry_type = ? AND key = ?"
+INSERT_ENTRY = (
+    "INSERT OR REPLACE INTO search_cache (entry_type, key, value, size_bytes, expires_at, last_accessed) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+DELETE_EXPIRED = "DELETE FROM search_cache WHERE expires_at <= ?"
+TOTALS = "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM search_cache"
+LRU_ENTRIES = "SELECT entry_type, key, size_bytes FROM search_cache ORDER BY last_accessed ASC"
+DELETE_ENTRY = "DELETE FROM search_cache WHERE entry_type = ? AND key = ?"
+
+
+class TieredCache:
+    """
+    Two-tier cache for search results: an in-process LRU in front of SQLite.
+
+    Values are stored as JSON. The memory tier keeps the serialized form and
+    decodes on every hit, so callers can mutate what they get back without
+    corrupting the cache. Expired rows are deleted (not just filtered out), and
+    prune() keeps the table within max_rows/max_bytes by dropping the least
+    recently used rows, then VACUUMs once enough space has been freed. A
+    disk hit only rewrites the row's access time once it is touch_interval
+    seconds old, so reads of hot rows stay plain SELECTs.
+    """
+
+    def __init__(self, db_path: str = "linkedin_cache.db", ttls: Optional[Dict[str, float]] = None,
+                 memory_entries: int = 1024, max_rows: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 prune_interval: float = 300.0, vacuum_threshold: int = 1000, touch_interval: float = 60.0):
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.memory_entries = memory_entries
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.prune_interval = prune_interval
+        self.vacuum_threshold = vacuum_threshold
+        self.touch_interval = touch_interval
+        self.db = get_database(db_path)
+        self._memory: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0,
+            'memory_evictions': 0, 'pruned_rows': 0, 'vacuums': 0,
+        }
+        self._freed_since_vacuum = 0
+        self._stop = threading.Event()
+        self._pruner: Optional[threading.Thread] = None
+        self._init_db()
+
+    def _init_db(self):
+        with self.db.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    entry_type TEXT,
+                    key TEXT,
+                    value TEXT,
+                    size_bytes INTEGER,
+                    expires_at REAL,
+                    last_accessed REAL,
+                    PRIMARY KEY (entry_type, key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_expires ON search_cache (expires_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache (last_accessed)")
+
+    def get(self, key: str, entry_type: str = 'search') -> Optional[Any]:
+        """Return the cached value, checking memory first, then SQLite"""
+        now = time.time()
+        mem_key = (entry_type, key)
+        with self._lock:
+            entry = self._memory.get(mem_key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._memory.move_to_end(mem_key)
+                    self._stats['memory_hits'] += 1
+                    return json.loads(payload)
+                del self._memory[mem_key]
+
+        row = self.db.query_one(SELECT_ENTRY, (entry_type, key))
+        if row is None or row[1] <= now:
+            with self._lock:
+                self._stats['misses'] += 1
+                if row is not None:
+                    self._stats['expired'] += 1
+            return None
+
+        payload, expires_at, last_accessed = row
+        if last_accessed is None or now - last_accessed >= self.touch_interval:
+            self.db.execute(TOUCH_ENTRY, (now, entry_type, key))
+        with self._lock:
+            self._stats['disk_hits'] += 1
+            self._remember(mem_key, expires_at, payload)
+        return json.loads(payload)
+
+    def put(self, key: str, value: Any, entry_type: str = 'search'):
+        """Store a JSON-serializable value in both tiers"""
+        now = time.time()
+        payload = json.dumps(value)
+        expires_at = now + self.ttls.get(entry_type, DEFAULT_TTLS['search'])
+        self.db.execute(INSERT_ENTRY, (entry_type, key, payload, len(payload), expires_at, now))
+        with self._lock:
+            self._remember((entry_type, key), expires_at, payload)
+
+    def _remember(self, mem_key: tuple, expires_at: float, payload: str):
+        """Insert into the memory tier (caller holds the lock)"""
+        self._memory[mem_key] = (expires_at, payload)
+        self._memory.move_to_end(mem_key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._stats['memory_evictions'] += 1
+
+    def prune(self) -> int:
+        """Delete expired rows and enforce the row/byte budget; returns rows removed"""
+        now = time.time()
+        with self.db.transaction() as conn:
+            removed = conn.execute(DELETE_EXPIRED, (now,)).rowcount
+            rows, total_bytes = conn.execute(TOTALS).fetchone()
+            if rows > self.max_rows or total_bytes > self.max_bytes:
+                evicted = []
+                for entry_type, key, size_bytes in conn.execute(LRU_ENTRIES).fetchall():
+                    if rows <= self.max_rows and total_bytes <= self.max_bytes:
+                        break
+                    evicted.append((entry_type, key))
+                    rows -= 1
+                    total_bytes -= size_bytes
+                conn.executemany(DELETE_ENTRY, evicted)
+                removed += len(evicted)
+                with self._lock:
+                    for mem_key in evicted:
+                        self._memory.pop(mem_key, None)
+
+        with self._lock:
+            self._stats['pruned_rows'] += removed
+            self._freed_since_vacuum += removed
+            needs_vacuum = self._freed_since_vacuum >= self.vacuum_threshold
+            if needs_vacuum:
+                self._freed_since_vacuum = 0
+        if needs_vacuum:
+            # VACUUM must run outside a transaction
+            self.db.connection().execute("VACUUM")
+            with self._lock:
+                self._stats['vacuums'] += 1
+        return removed
+
+    def start_pruner(self):
+        """Prune in a daemon thread every prune_interval seconds"""
+        if self._pruner is not None:
+            return
+        self._pruner = threading.Thread(target=self._prune_loop, name="search-cache-pruner", daemon=True)
+        self._pruner.start()
+
+    def stop_pruner(self):
+        self._stop.set()
+        if self._pruner is not None:
+            self._pruner.join()
+            self._pruner = None
+
+    def _prune_loop(self):
+        while not self._stop.wait(self.prune_interval):
+            try:
+                self.prune()
+            except Exception as e:
+                print(f"Error pruning search cache: {e}")
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters plus current tier sizes"""
+        rows, total_bytes = self.db.query_one(TOTALS)
+        with self._lock:
+            lookups = self._stats['memory_hits'] + self._stats['disk_hits'] + self._stats['misses']
+            hits = self._stats['memory_hits'] + self._stats['disk_hits']
+            return dict(
+                self._stats,
+                hit_rate=round(hits / lookups, 4) if lookups else 0.0,
+                memory_entries=len(self._memory),
+                disk_rows=rows,
+                disk_bytes=total_bytes,
+            )
+
+
+_caches: Dict[str, TieredCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_search_cache(db_path: str = "linkedin_cache.db") -> TieredCache:
+    """Shared TieredCache per database file, with its background pruner running"""
+    with _caches_lock:
+        if db_path not in _caches:
+            cache = TieredCache(db_path)
+            cache.start_pruner()
+            _caches[db_path] = cache
+        return _caches[db_path]
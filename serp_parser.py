@@ -0,0 +1,284 @@
+import os
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+PROFILE_MARKER = 'linkedin.com/in/'
+
+# Elements bs4 treats as empty; they never get an end tag
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'menuitem', 'meta', 'param', 'source', 'track', 'wbr',
+))
+# Text inside these is not part of a link's visible text
+NON_TEXT_ELEMENTS = frozenset(('script', 'style', 'template'))
+# Whitespace-only text is kept verbatim inside these, and collapsed elsewhere
+PRESERVE_WHITESPACE_ELEMENTS = frozenset(('pre', 'textarea'))
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+def clean_result_url(url: str) -> str:
+    """Remove Google redirect parameters from a result link"""
+    if url.startswith('/url?q='):
+        url = url.split('/url?q=')[1].split('&')[0]
+    elif '&ved=' in url:
+        url = url.split('&ved=')[0]
+    return url
+
+
+def build_profile(url: str, title: str) -> Optional[Dict]:
+    """Turn a result link and its title into a profile dict, or None if it has no usable name"""
+    # Extract name and headline
+    if '|' in title:
+        name, headline = title.split('|', 1)
+    elif ' - ' in title:
+        name, headline = title.split(' - ', 1)
+    else:
+        name = title
+        headline = ""
+
+    name = name.strip()
+    headline = headline.strip()
+
+    # Skip if no meaningful name
+    if len(name) < 2:
+        return None
+
+    return {
+        "name": name,
+        "linkedin_url": clean_result_url(url),
+        "headline": headline
+    }
+
+
+class SERPParser(ABC):
+    """
+    Interface for turning a Google results page into LinkedIn profile dicts.
+
+    parse() considers the first max_results profile links on the page (links
+    without a usable name are dropped after that cut), and titles come from
+    the link text, falling back to an h3 or div.title in the link's parent.
+    """
+    name = "base"
+
+    @abstractmethod
+    def parse(self, html: str, max_results: int = 10) -> List[Dict]:
+        """Profile dicts for the LinkedIn results on the page, in page order"""
+
+
+class SoupSERPParser(SERPParser):
+    """Builds the full BeautifulSoup tree (the historical parser, kept as the reference)"""
+    name = "soup"
+
+    def parse(self, html: str, max_results: int = 10) -> List[Dict]:
+        soup = BeautifulSoup(html, 'html.parser')
+        all_links = soup.find_all('a', href=True)
+        linkedin_links = [link for link in all_links if PROFILE_MARKER in link['href']]
+
+        results = []
+        for link in linkedin_links[:max_results]:
+            # Get title from link text or parent elements
+            title = link.get_text().strip()
+            if not title:
+                # Try to find title in parent elements
+                parent = link.parent
+                if parent:
+                    title_elem = parent.find('h3') or parent.find('div', class_='title')
+                    if title_elem:
+                        title = title_elem.get_text().strip()
+            profile = build_profile(link['href'], title)
+            if profile:
+                results.append(profile)
+        return results
+
+
+class StrainedSoupSERPParser(SERPParser):
+    """
+    BeautifulSoup restricted by a SoupStrainer to profile links.
+
+    Only the matching <a> elements (and their contents, where the h3 title
+    lives on current result pages) are built into the tree. Their parents are
+    never built, so links with no text of their own get no title.
+    """
+    name = "strainer"
+
+    def __init__(self):
+        self.strainer = SoupStrainer('a', href=re.compile(re.escape(PROFILE_MARKER)))
+
+    def parse(self, html: str, max_results: int = 10) -> List[Dict]:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=self.strainer)
+        results = []
+        for link in soup.find_all('a', limit=max_results):
+            profile = build_profile(link['href'], link.get_text().strip())
+            if profile:
+                results.append(profile)
+        return results
+
+
+class _Element:
+    __slots__ = ('tag', 'link', 'text', 'first_h3', 'first_title', 'pending')
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.link: Optional[Dict] = None  # result record when this is a profile link
+        self.text: Optional[List[str]] = None  # collected only for links, h3 and div.title
+        self.first_h3: Optional[str] = None
+        self.first_title: Optional[str] = None
+        self.pending: Optional[List[Dict]] = None  # child links waiting on this element's h3/div.title
+
+
+class _ResultStream(HTMLParser):
+    """
+    Single forward pass over the page that keeps only an element stack.
+
+    Text is collected only inside profile links and candidate title
+    elements. A profile link without text of its own is parked on its
+    parent until the parent closes, when the parent's first h3 (or
+    div.title) is known. Unclosed and stray end tags are resolved the way
+    bs4's html.parser builder resolves them, so output matches SoupSERPParser.
+    """
+
+    def __init__(self, max_results: int):
+        super().__init__(convert_charrefs=True)
+        self.max_results = max_results
+        self.links: List[Dict] = []
+        # The document node is the parent of top-level links, as in bs4
+        self.stack: List[_Element] = [_Element('[document]')]
+        self.collecting = 0  # open elements whose text is being collected
+        self.skipping = 0  # open script/style elements
+        self.preserving = 0  # open pre/textarea elements
+        self.pending_text: List[str] = []  # one text node can arrive in several handle_data calls
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag in VOID_ELEMENTS:
+            return
+        element = _Element(tag)
+        attributes = dict(attrs)  # last duplicate wins, as in bs4
+        if tag == 'a' and len(self.links) < self.max_results:
+            href = attributes.get('href')
+            if href and PROFILE_MARKER in href:
+                element.link = {'href': href, 'title': None}
+                self.links.append(element.link)
+        if element.link or tag == 'h3' or (tag == 'div' and 'title' in (attributes.get('class') or '').split()):
+            element.text = []
+            self.collecting += 1
+        if tag in NON_TEXT_ELEMENTS:
+            self.skipping += 1
+        if tag in PRESERVE_WHITESPACE_ELEMENTS:
+            self.preserving += 1
+        self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_data(self, data):
+        if self.collecting and not self.skipping:
+            self.pending_text.append(data)
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_decl(self, decl):
+        self._flush_text()
+
+    def handle_pi(self, data):
+        self._flush_text()
+
+    def _flush_text(self):
+        """Hand the finished text node to every collecting element"""
+        if not self.pending_text:
+            return
+        text = ''.join(self.pending_text)
+        self.pending_text = []
+        if not self.preserving and not text.strip(ASCII_SPACES):
+            # bs4 collapses whitespace-only strings to one character
+            text = '\n' if '\n' in text else ' '
+        for element in self.stack:
+            if element.text is not None:
+                element.text.append(text)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                break
+        else:
+            return  # stray end tag, ignored like bs4 does
+        while len(self.stack) > depth:
+            self._close(self.stack.pop())
+
+    def close(self):
+        super().close()
+        self._flush_text()
+        while self.stack:
+            self._close(self.stack.pop())
+
+    def _close(self, element: _Element):
+        parent = self.stack[-1] if self.stack else None
+        if element.tag in NON_TEXT_ELEMENTS:
+            self.skipping -= 1
+        if element.tag in PRESERVE_WHITESPACE_ELEMENTS:
+            self.preserving -= 1
+
+        # Links parked here only search descendants, so resolve them before this element's own text counts
+        if element.pending:
+            title = element.first_h3 if element.first_h3 is not None else element.first_title
+            for link in element.pending:
+                link['title'] = (title or '').strip()
+
+        if element.text is not None:
+            self.collecting -= 1
+            text = ''.join(element.text)
+            if element.tag == 'h3':
+                element.first_h3 = text
+            elif element.tag == 'div':
+                element.first_title = text
+            if element.link:
+                element.link['title'] = text.strip()
+                if not element.link['title'] and parent is not None:
+                    parent.pending = (parent.pending or []) + [element.link]
+
+        if parent is not None:
+            # First match in document order: earlier children closed first
+            if parent.first_h3 is None:
+                parent.first_h3 = element.first_h3
+            if parent.first_title is None:
+                parent.first_title = element.first_title
+
+
+class StreamingSERPParser(SERPParser):
+    """Standard-library HTMLParser pass that builds no tree at all"""
+    name = "stream"
+
+    def parse(self, html: str, max_results: int = 10) -> List[Dict]:
+        if PROFILE_MARKER not in html:
+            return []  # consent pages, captchas and empty result pages
+        stream = _ResultStream(max_results)
+        stream.feed(html)
+        stream.close()
+        results = []
+        for link in stream.links:
+            profile = build_profile(link['href'], link['title'] or '')
+            if profile:
+                results.append(profile)
+        return results
+
+
+PARSERS: Dict[str, SERPParser] = {
+    parser.name: parser for parser in (SoupSERPParser(), StrainedSoupSERPParser(), StreamingSERPParser())
+}
+
+
+def get_parser(name: Optional[str] = None) -> SERPParser:
+    """Look up a registered parser by name (default from SERP_PARSER, else 'stream')"""
+    name = name or os.getenv("SERP_PARSER", "stream")
+    try:
+        return PARSERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown SERP parser '{name}'. Choose from: {', '.join(PARSERS)}")
@@ -0,0 +1,71 @@
+import re
+from itertools import compress
+from typing import Dict, Iterable, List, Tuple
+
+# Words (letters/digits) and individual symbols; whitespace and underscores only separate tokens.
+# (The outer group is not redundant: sre scans noticeably faster with it.)
+TOKEN_PATTERN = re.compile(r'(?:[^\W_]+|[^\w\s])')
+
+# Trie key marking the end of a skill
+_END = ''
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Finds every vocabulary skill in a text in one pass over its tokens.
+
+    Skills are split into the same word and symbol tokens as the text
+    ("c++" is c + +, "scikit-learn" is scikit - learn), and stored in a
+    token trie. Matches can therefore only start and end on word
+    boundaries, so "r" no longer matches inside "transformer" and "java"
+    no longer matches inside "javascript"; a plain plural ("LLMs") still
+    counts. From each token the trie is walked forward as far as it
+    matches, which reports overlapping skills too: "gpt-4" yields both
+    "gpt" and "gpt-4". Cost is linear in the text length times the longest
+    skill (in tokens), independent of vocabulary size.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self.root: Dict = {}
+        self.size = 0
+        for skill in skills:
+            tokens = tokenize(skill)
+            if not tokens:
+                continue
+            self.size += 1
+            self._insert(tokens, skill)
+            # Profiles list "LLMs" and "GPUs"; a plain plural still counts as the skill
+            last = tokens[-1]
+            if len(last) > 1 and last.isalpha() and not last.endswith('s'):
+                self._insert(tokens[:-1] + [last + 's'], skill)
+
+    def _insert(self, tokens: List[str], skill: str):
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(_END, skill)
+
+    def find(self, text: str) -> List[str]:
+        """Skills found in text, each once, in order of first occurrence"""
+        return list(dict.fromkeys(skill for skill, _ in self.iter_matches(tokenize(text))))
+
+    def iter_matches(self, tokens: List[str]) -> Iterable[Tuple[str, int]]:
+        """Yield (skill, start token index) for every occurrence"""
+        n = len(tokens)
+        # Trie lookups for every token in C; only tokens that start some skill are walked in Python
+        heads = list(map(self.root.get, tokens))
+        for i in compress(range(n), heads):
+            node = heads[i]
+            j = i + 1
+            while node is not None:
+                skill = node.get(_END)
+                if skill is not None:
+                    yield skill, i
+                if j == n:
+                    break
+                node = node.get(tokens[j])
+                j += 1
@@ -0,0 +1,173 @@
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+VOCABULARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_vocabularies.json")
+
+# Vocabulary terms only match as whole words ("SF" must not match inside "transformation")
+WORD_START = r'(?<![a-z0-9])'
+WORD_END = r'(?![a-z0-9])'
+
+
+def _normalize(phrase: str) -> str:
+    return ' '.join(phrase.lower().split())
+
+
+def _trie_pattern(phrases: List[str]) -> str:
+    """
+    Regex alternation for lowercase phrases, factored into a character trie.
+
+    The regex engine then tests one branch per distinct first character at a
+    word start instead of every phrase; words may be separated by any
+    whitespace (or none). Longer continuations are tried first, so "gpt-4"
+    wins over "gpt".
+    """
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for ch in _normalize(phrase):
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node: Dict) -> str:
+        branches = [
+            (r'\s*' if ch == ' ' else re.escape(ch)) + emit(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not branches:
+            return ''
+        body = '(?:' + '|'.join(branches) + ')' if len(branches) > 1 or '' in node else branches[0]
+        return body + '?' if '' in node else body
+
+    return emit(trie)
+
+
+class TermExtractor:
+    """
+    Extracts the job title, skills and locations from job description text.
+
+    All vocabularies (title labels, title fallbacks, skills, locations) are
+    compiled once into a single regex of character tries and matched against
+    the lowercased text in one left-to-right pass. Every vocabulary is a
+    zero-width lookahead, so a match of one kind never consumes the text
+    another kind needs ("Generative AI" the skill does not hide the
+    "AI Engineer -" label, and a skill may run past a label line's newline),
+    exactly like the separate per-term scans these replace. The original
+    text is only used to return terms in their source casing.
+    """
+
+    def __init__(self, vocabulary: Dict):
+        self.vocabulary = vocabulary
+        self.labels = vocabulary['title_labels']
+        self.default_title = vocabulary['default_title']
+        self.search_config = vocabulary['search']
+
+        # Labels sharing a separator share one trie; the label index is looked up from the matched text
+        self.separators = list(dict.fromkeys(entry['separator'] for entry in self.labels))
+        self.label_index = {''.join(entry['label'].lower().split()): i for i, entry in enumerate(self.labels)}
+        label_parts = []
+        for k, separator in enumerate(self.separators):
+            phrases = [entry['label'] for entry in self.labels if entry['separator'] == separator]
+            label_parts.append(
+                (f"{_trie_pattern(phrases)}\\s*{re.escape(separator)}",
+                 f"(?P<label{k}>{_trie_pattern(phrases)})\\s*{re.escape(separator)}\\s*(?P<value{k}>.*?)\\n")
+            )
+        term_parts = [
+            (kind, f"{_trie_pattern(vocabulary[key])}{WORD_END}")
+            for kind, key in (('fallback', 'title_fallbacks'), ('skill', 'skills'), ('location', 'locations'))
+            if vocabulary[key]
+        ]
+        # Every alternative is a lookahead, so no match consumes text another one needs: the first
+        # lookahead finds a word start where any term begins, then each optional one records its own
+        any_term = '|'.join([head for head, _ in label_parts] + [part for _, part in term_parts])
+        self.pattern = re.compile(
+            WORD_START + f"(?={any_term})"
+            + ''.join(f"(?={labelled}|)" for _, labelled in label_parts)
+            + ''.join(f"(?=(?P<{kind}>{part})|)" for kind, part in term_parts)
+        ) if any_term else None
+        self.label_groups = [f'label{k}' for k in range(len(label_parts))]
+
+    @classmethod
+    def from_file(cls, path: str = VOCABULARY_PATH) -> "TermExtractor":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def extract(self, text: str) -> Dict:
+        """Return {'title', 'skills', 'locations'} found in a single pass over text"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few non-ASCII characters change length when lowercased; match per character instead
+            lowered = ''.join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+        # First occurrence of each label ("Proposed Role:" is also a "Role:"); other kinds
+        # don't overlap themselves, just as separate findall scans would not
+        label_values: Dict[int, str] = {}
+        fallback: Optional[str] = None
+        skills: List[str] = []
+        locations: List[str] = []
+        skill_end = location_end = 0
+        for match in self.pattern.finditer(lowered) if self.pattern else ():
+            for group in self.label_groups:
+                if match.group(group) is not None:
+                    value_start, value_end = match.span('value' + group[len('label'):])
+                    label_values.setdefault(self.label_index[''.join(match.group(group).split())],
+                                            text[value_start:value_end])
+            groups = match.groupdict()
+            if fallback is None and groups.get('fallback') is not None:
+                fallback = text[match.start():match.end('fallback')]
+            if groups.get('skill') is not None and match.start() >= skill_end:
+                skill_end = match.end('skill')
+                skills.append(text[match.start():skill_end])
+            if groups.get('location') is not None and match.start() >= location_end:
+                location_end = match.end('location')
+                locations.append(text[match.start():location_end])
+
+        title: Optional[str] = None
+        if label_values:
+            title = label_values[min(label_values)].strip()
+        if not title:
+            title = fallback or self.default_title
+
+        return {
+            'title': title,
+            'skills': list(dict.fromkeys(s.capitalize() for s in skills)),
+            'locations': list(dict.fromkeys(locations)),
+        }
+
+    def format_search_terms(self, title: str, skills: List[str], locations: List[str]) -> str:
+        """Build the Google search string from extracted job terms"""
+        config = self.search_config
+        terms = []
+
+        # Add title (but make it less specific)
+        if title:
+            simplify = config['simplify_titles']
+            if any(fragment in title for fragment in simplify['contains']):
+                terms.append(simplify['replacement'])
+            else:
+                terms.append(title)
+
+        # Add key skills (limit to most common ones)
+        common_skills = [s for s in skills if s.lower() in config['common_skills']]
+        terms.extend(common_skills[:config['max_skills']])
+
+        # Add location if found
+        if locations:
+            terms.append(locations[0])
+
+        # Clean up terms and remove empty/none values
+        terms = [t for t in terms if t and str(t).strip()]
+
+        # If still too specific, add some broader terms
+        if len(terms) < config['min_terms']:
+            terms.extend(config['broad_terms'])
+
+        return " ".join(terms)
+
+
+@lru_cache(maxsize=None)
+def get_term_extractor(path: str = VOCABULARY_PATH) -> TermExtractor:
+    """Compiled extractor for a vocabulary file, built once per process"""
+    return TermExtractor.from_file(path)
@@ -148,6 +148,54 @@ def test_api_documentation():
         print(f"Error: {e}")
         return False
 
+def test_pdf_job_candidates_can_be_reranked():
+    """A job processed through /process-pdf can be listed and re-ranked under the job_id it returns"""
+    import os
+    import tempfile
+    from fastapi.testclient import TestClient
+    # Importing api builds its agent; keep that agent's caches out of the repository's database too
+    os.environ.setdefault("CACHE_DB", os.path.join(tempfile.mkdtemp(), "cache.db"))
+    import api
+    from benchmarks import make_synthetic_pdf
+    from main_integrated import LinkedInSourcingAgent
+
+    profiles = [
+        {"name": "Ana Ruiz", "linkedin_url": "https://www.linkedin.com/in/ana-ruiz", "headline": "ML Engineer at Google",
+         "profile_data": {"education": ["Stanford University"], "experience": ["Google"], "skills": ["python", "pytorch"],
+                          "location": "Bangalore"}},
+        {"name": "Bo Li", "linkedin_url": "https://www.linkedin.com/in/bo-li", "headline": "Data Analyst",
+         "profile_data": {"education": [], "experience": ["Acme"], "skills": ["sql"], "location": "Remote"}},
+    ]
+    # An agent whose search, PDF, profile and score caches all live in a temporary database
+    original_agent = api.agent
+    api.agent = LinkedInSourcingAgent(cache_db=os.path.join(tempfile.mkdtemp(), "cache.db"))
+    api.agent.finder.find_profiles = lambda job, max_results=10: [dict(p) for p in profiles]
+    try:
+        client = TestClient(api.app)
+        pdf = make_synthetic_pdf(num_pages=1, lines_per_page=5)
+        response = client.post("/process-pdf", files={"file": ("role.pdf", pdf, "application/pdf")},
+                               data={"max_candidates": "2", "max_messages": "1"})
+        assert response.status_code == 200, response.text
+        job_id = response.json()["job_id"]
+        assert job_id.startswith("job_")
+
+        listed = client.get(f"/candidates/{job_id}")
+        assert listed.status_code == 200, listed.text
+        assert {c["name"] for c in listed.json()["candidates"]} == {"Ana Ruiz", "Bo Li"}
+
+        weights = {"education": 0, "trajectory": 0, "company": 0, "skills": 1, "location": 0, "tenure": 0}
+        reranked = client.post(f"/candidates/{job_id}/rerank", json={"weights": weights, "top_k": 1})
+        assert reranked.status_code == 200, reranked.text
+        assert len(reranked.json()["candidates"]) == 1
+        for bad_top_k in (0, -1):
+            assert client.get(f"/candidates/{job_id}", params={"top_k": bad_top_k}).status_code == 422
+            assert client.post(f"/candidates/{job_id}/rerank",
+                               json={"weights": weights, "top_k": bad_top_k}).status_code == 422
+        assert client.get("/candidates/job_unknown").status_code == 404
+    finally:
+        api.agent = original_agent
+    print("✅ /process-pdf jobs are found by /candidates")
+
 def main():
     """Run all API tests"""
     print("🚀 LinkedIn Sourcing Agent API Tests")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite-backed caches
+Every test uses its own temporary database file
+"""
+
+import os
+import tempfile
+import threading
+
+from cache_db import CacheDatabase
+from profile_cache import ProfileCache, canonical_profile_url
+from score_store import ScoreStore
+from search_cache import TieredCache
+
+PROFILES = [{"name": "Sarah Chen", "linkedin_url": "https://www.linkedin.com/in/sarah-chen", "headline": "ML Engineer"}]
+
+
+def make_db() -> CacheDatabase:
+    db = CacheDatabase(os.path.join(tempfile.mkdtemp(), "cache.db"), busy_timeout=2.0)
+    db.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT)")
+    return db
+
+
+def test_wal_and_busy_timeout():
+    db = make_db()
+    assert db.query_one("PRAGMA journal_mode")[0] == "wal"
+    assert db.query_one("PRAGMA busy_timeout")[0] == 2000
+    db.close()
+
+
+def test_connection_per_thread_is_reused():
+    """A thread always gets the same connection; other threads get their own"""
+    db = make_db()
+    main_conn = db.connection()
+    assert db.connection() is main_conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_conn
+    db.close()
+
+
+def test_connections_of_ended_threads_are_closed():
+    """Short-lived worker pools (one per batch request) do not accumulate connections"""
+    import gc
+    from concurrent.futures import ThreadPoolExecutor
+
+    db = make_db()
+    db.connection()
+    for _ in range(50):
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda i: db.query_one("SELECT COUNT(*) FROM kv"), range(6)))
+    del pool
+    gc.collect()
+    print(f"Open connections: {len(db._connections)}")
+    assert len(db._connections) == 1
+    db.close()
+
+
+def test_concurrent_writers_do_not_lock():
+    """Many threads writing at once neither fail nor lose rows"""
+    db = make_db()
+    errors = []
+
+    def writer(worker: int):
+        try:
+            for i in range(50):
+                db.execute("INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", (f"{worker}-{i}", "x" * 100))
+                db.query_one("SELECT value FROM kv WHERE key = ?", (f"{worker}-{i}",))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"Errors: {errors}")
+    assert not errors
+    assert db.query_one("SELECT COUNT(*) FROM kv")[0] == 8 * 50
+    db.close()
+
+
+def test_failed_transaction_rolls_back():
+    db = make_db()
+    try:
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO kv (key, value) VALUES ('a', '1')")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert db.query_one("SELECT COUNT(*) FROM kv")[0] == 0
+    db.close()
+
+
+def make_cache(**kwargs) -> TieredCache:
+    return TieredCache(os.path.join(tempfile.mkdtemp(), "cache.db"), **kwargs)
+
+
+def test_memory_tier_serves_hot_queries():
+    """Second lookup is answered from memory and returns an independent copy"""
+    cache = make_cache()
+    cache.put("AI Engineer", PROFILES)
+    first = cache.get("AI Engineer")
+    first[0]['profile_data'] = {'skills': ['python']}  # callers mutate results
+    second = cache.get("AI Engineer")
+
+    stats = cache.stats()
+    print(f"Stats: {stats}")
+    assert second == PROFILES
+    assert stats['memory_hits'] == 2 and stats['disk_hits'] == 0
+
+
+def test_disk_tier_refills_memory():
+    """A fresh process (empty memory tier) reads through to SQLite"""
+    cache = make_cache(memory_entries=1)
+    cache.put("query A", PROFILES)
+    cache.put("query B", PROFILES)  # evicts A from memory
+    assert cache.get("query A") == PROFILES
+    assert cache.get("query A") == PROFILES
+    stats = cache.stats()
+    assert stats['disk_hits'] == 1 and stats['memory_hits'] == 1
+    assert stats['memory_evictions'] >= 1
+
+
+def test_ttl_per_entry_type_and_prune_deletes_rows():
+    cache = make_cache(ttls={'search': -1, 'profile': 3600})
+    cache.put("stale query", PROFILES, 'search')
+    cache.put("https://www.linkedin.com/in/sarah-chen", {'skills': []}, 'profile')
+
+    assert cache.get("stale query", 'search') is None
+    assert cache.get("https://www.linkedin.com/in/sarah-chen", 'profile') == {'skills': []}
+    assert cache.prune() == 1
+    assert cache.stats()['disk_rows'] == 1
+
+
+def test_row_budget_evicts_least_recently_used():
+    cache = make_cache(max_rows=3, vacuum_threshold=2)
+    for i in range(5):
+        cache.put(f"query {i}", PROFILES)
+    assert cache.prune() == 2
+    stats = cache.stats()
+    assert stats['disk_rows'] == 3
+    assert stats['vacuums'] == 1
+    assert cache.get("query 0") is None
+    assert cache.get("query 4") == PROFILES
+
+
+def test_read_hits_skip_recent_access_time_writes():
+    """A disk hit only rewrites last_accessed once the stored time is touch_interval old"""
+    accessed = "SELECT last_accessed FROM search_cache WHERE key = ?"
+    cache = make_cache(memory_entries=0, touch_interval=60.0)
+    cache.put("AI Engineer", PROFILES)
+    stored = cache.db.query_one(accessed, ("AI Engineer",))[0]
+    assert cache.get("AI Engineer") == PROFILES
+    assert cache.db.query_one(accessed, ("AI Engineer",))[0] == stored
+
+    cache.touch_interval = 0.0
+    assert cache.get("AI Engineer") == PROFILES
+    assert cache.db.query_one(accessed, ("AI Engineer",))[0] > stored
+
+    profiles = ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db"))
+    profiles.put("https://www.linkedin.com/in/sarah-chen", {'name': 'Sarah Chen'})
+    stored = profiles.db.query_one("SELECT last_accessed FROM profile_cache")[0]
+    assert profiles.get("https://www.linkedin.com/in/sarah-chen")['fresh']
+    assert profiles.db.query_one("SELECT last_accessed FROM profile_cache")[0] == stored
+
+
+def test_legacy_cache_table_is_left_alone():
+    """Opening the search cache on an existing database keeps the pre-WAL 'cache' table and its rows"""
+    db = make_db()
+    db.execute("CREATE TABLE cache (query TEXT PRIMARY KEY, results TEXT, timestamp DATETIME)")
+    db.execute("INSERT INTO cache VALUES ('AI Engineer', '[]', '2025-07-01 07:08:39')")
+    TieredCache(db.path)
+    assert db.query_one("SELECT COUNT(*) FROM cache")[0] == 1
+    db.close()
+
+
+def test_canonical_profile_url():
+    for url in [
+        "https://www.linkedin.com/in/sarah-chen",
+        "http://in.linkedin.com/in/Sarah-Chen/",
+        "https://uk.linkedin.com/in/sarah-chen?trk=public_profile#experience",
+        "https://linkedin.com/in/sarah%2Dchen",
+    ]:
+        assert canonical_profile_url(url) == "https://www.linkedin.com/in/sarah-chen", url
+    assert canonical_profile_url("https://example.com/in/x/?a=1") == "https://example.com/in/x"
+
+
+def test_profile_cache_freshness_and_revalidation():
+    cache = ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db"), ttl=60)
+    assert cache.get("https://www.linkedin.com/in/sarah-chen") is None
+
+    cache.put("https://in.linkedin.com/in/sarah-chen/", {'skills': ['python']}, etag='"v1"')
+    entry = cache.get("https://www.linkedin.com/in/Sarah-Chen")
+    assert entry['fresh'] and entry['profile_data'] == {'skills': ['python']}
+    assert entry['etag'] == '"v1"' and entry['last_modified'] is None
+
+    cache.ttl = 0
+    stale = cache.get("https://www.linkedin.com/in/sarah-chen")
+    assert not stale['fresh']
+    cache.ttl = 60
+    cache.refresh("https://www.linkedin.com/in/sarah-chen")
+    assert cache.get("https://www.linkedin.com/in/sarah-chen")['fresh']
+
+    stats = cache.stats()
+    assert (stats['misses'], stats['stale_hits'], stats['revalidated'], stats['entries']) == (1, 1, 1, 1)
+
+
+def test_profile_cache_size_budget():
+    cache = ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db"), max_bytes=250)
+    for i in range(5):
+        cache.put(f"https://www.linkedin.com/in/person-{i}", {'summary': 'x' * 80})
+    assert cache.stats()['entries'] == 2
+    assert cache.get("https://www.linkedin.com/in/person-0") is None
+    assert cache.get("https://www.linkedin.com/in/person-4") is not None
+
+
+def test_score_store_reranks_without_rescoring():
+    """Stored breakdowns re-rank under new weights; default weights reproduce the original ranking"""
+    from candidate_scorer import CandidateScorer
+    scorer = CandidateScorer(profile_cache=ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db")))
+    store = ScoreStore(os.path.join(tempfile.mkdtemp(), "cache.db"))
+    profiles = {
+        'sarah-chen': {'location': 'Seattle', 'education': ['MIT'], 'experience': ['Google'], 'skills': ['python']},
+        'raj-patel': {'location': 'Berlin', 'experience': ['Acme', 'B', 'C', 'D', 'E'],
+                      'skills': ['python', 'aws', 'sql']},
+        'ann-lee': {'location': 'Seattle', 'education': ['MIT'], 'experience': ['Google'], 'skills': ['python']},
+    }
+    candidates = [{'name': slug.replace('-', ' ').title(), 'linkedin_url': f"https://www.linkedin.com/in/{slug}",
+                   'profile_data': profile} for slug, profile in profiles.items()]
+    scored = scorer.score_candidates(candidates, "Python, AWS and SQL engineer in Seattle")
+    store.save("job-1", scored)
+
+    ranked = store.rerank("job-1")
+    assert [(c['name'], c['fit_score']) for c in ranked] == [(c['name'], c['fit_score']) for c in scored]
+    skills_only = store.rerank("job-1", {'skills': 1.0})
+    assert [c['name'] for c in skills_only] == ['Raj Patel', 'Sarah Chen', 'Ann Lee']
+    assert skills_only[0]['fit_score'] == 8.0
+    assert len(store.rerank("job-1", {'location': 0.5, 'skills': 0.5}, top_k=2)) == 2
+
+    tuned = CandidateScorer(profile_cache=scorer.profile_cache, weights={'skills': 1.0})
+    assert tuned.calculate_fit_score(candidates[1], "Python, AWS and SQL")['total_score'] == 8.0
+
+    store.save("job-1", scored[:1])
+    assert store.jobs() == {"job-1": 1}
+    for bad in ({'iq': 1.0}, {'skills': -1.0}, {'skills': 0.0}):
+        try:
+            store.rerank("job-1", bad)
+            assert False, bad
+        except ValueError:
+            pass
+    for bad_top_k in (0, -1):
+        try:
+            store.rerank("job-1", top_k=bad_top_k)
+            assert False, bad_top_k
+        except ValueError:
+            pass
+    try:
+        store.rerank("unknown-job")
+        assert False
+    except KeyError:
+        pass
+
+
+if __name__ == "__main__":
+    test_wal_and_busy_timeout()
+    test_connection_per_thread_is_reused()
+    test_connections_of_ended_threads_are_closed()
+    test_concurrent_writers_do_not_lock()
+    test_failed_transaction_rolls_back()
+    test_memory_tier_serves_hot_queries()
+    test_disk_tier_refills_memory()
+    test_ttl_per_entry_type_and_prune_deletes_rows()
+    test_row_budget_evicts_least_recently_used()
+    test_read_hits_skip_recent_access_time_writes()
+    test_legacy_cache_table_is_left_alone()
+    test_canonical_profile_url()
+    test_profile_cache_freshness_and_revalidation()
+    test_profile_cache_size_budget()
+    test_score_store_reranks_without_rescoring()
+    print("\n✅ Cache tests completed!")
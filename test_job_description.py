@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for job description parsing
+Checks that a job description is parsed once into a reusable JobDescription
+"""
+
+import os
+import tempfile
+
+from job_description import JobDescription, job_text
+from linkedin_agent import LinkedInProfileFinder
+from term_extractor import TermExtractor, get_term_extractor
+
+SAMPLE_JD = """
+Proposed Role: Gen AI Solution Architect
+Location: Pan India (Bangalore / Hyderabad / Remote)
+We need Python, PyTorch, TensorFlow and Machine Learning experience with LLM and NLP systems.
+Experience with AWS, Azure or GCP and Docker/Kubernetes is a plus.
+"""
+
+
+def test_job_description_from_text():
+    """All derived fields are populated in one parse"""
+    finder = LinkedInProfileFinder(cache_db=os.path.join(tempfile.mkdtemp(), "cache.db"))
+    job = finder.job_description_from_text(SAMPLE_JD, source="sample.txt")
+    print(f"Title: {job.title}")
+    print(f"Skills: {job.skills}")
+    print(f"Locations: {job.locations}")
+    print(f"Search terms: {job.search_terms}")
+
+    assert job.title == "Gen AI Solution Architect"
+    assert "Python" in job.skills and "Pytorch" in job.skills
+    assert job.locations[0] == "Pan India"
+    assert job.search_terms == finder.extract_search_terms(SAMPLE_JD)
+    assert len(job.content_hash) == 64
+    assert job.job_id == job.content_hash[:12]
+    assert job.source == "sample.txt"
+
+
+def test_content_hash_is_stable():
+    """Identical text yields the same identity, different text does not"""
+    first = JobDescription(text=SAMPLE_JD, title="A")
+    second = JobDescription(text=SAMPLE_JD, title="B")
+    other = JobDescription(text=SAMPLE_JD + " ", title="A")
+    assert first.content_hash == second.content_hash
+    assert first.content_hash != other.content_hash
+
+
+def test_job_text_accepts_both_forms():
+    job = JobDescription(text="Python role", title="Engineer")
+    assert job_text(job) == "Python role"
+    assert job_text("Python role") == "Python role"
+
+
+def test_terms_match_whole_words_only():
+    """Short vocabulary entries no longer match inside other words"""
+    extractor = get_term_extractor()
+    terms = extractor.extract("Drive digital transformation with JavaScript and GPT-4 in Pune.\n")
+    print(f"Terms: {terms}")
+    assert terms['locations'] == ["Pune"]
+    assert "Java" not in terms['skills']
+    assert terms['skills'] == ["Gpt-4"]
+
+
+def test_title_label_priority():
+    """Earlier labels in the vocabulary win, and 'Proposed Role:' also counts as 'Role:'"""
+    extractor = get_term_extractor()
+    text = "Position: Data Scientist\nProposed Role: ML Engineer with Python\nRole: Ignored\n"
+    terms = extractor.extract(text)
+    assert terms['title'] == "ML Engineer with Python"
+    assert terms['skills'] == ["Python"]
+
+
+def test_title_fallback_and_nested_skill():
+    extractor = get_term_extractor()
+    terms = extractor.extract("We are hiring a Generative AI Solution Architect in Bangalore.")
+    assert terms['title'] == "Generative AI Solution Architect"
+    assert terms['skills'] == ["Generative ai"]
+    assert terms['locations'] == ["Bangalore"]
+    assert extractor.extract("No recognizable terms here.")['title'] == "Gen AI Solution Architect"
+
+
+def test_overlapping_label_and_term():
+    """A label inside a title fallback, or a skill across a label value's newline, is still found"""
+    extractor = get_term_extractor()
+    assert extractor.extract("Generative AI Engineer - Python Developer\n")['title'] == "Python Developer"
+    terms = extractor.extract("Role: Senior Machine\nLearning expert")
+    assert terms['skills'] == ["Machine\nlearning"]
+
+
+def test_vocabulary_is_data_driven():
+    vocabulary = {
+        "title_labels": [{"label": "Opening", "separator": ":"}],
+        "title_fallbacks": [],
+        "default_title": "Engineer",
+        "skills": ["Rust", "Go"],
+        "locations": ["Berlin"],
+        "search": {"simplify_titles": {"contains": [], "replacement": ""}, "common_skills": ["rust"],
+                   "max_skills": 3, "min_terms": 3, "broad_terms": ["Backend"]},
+    }
+    extractor = TermExtractor(vocabulary)
+    terms = extractor.extract("Opening: Systems Engineer\nRust and Go in Berlin\n")
+    assert terms == {'title': "Systems Engineer", 'skills': ["Rust", "Go"], 'locations': ["Berlin"]}
+    assert extractor.format_search_terms(**terms) == "Systems Engineer Rust Berlin"
+
+
+if __name__ == "__main__":
+    test_job_description_from_text()
+    test_content_hash_is_stable()
+    test_job_text_accepts_both_forms()
+    test_terms_match_whole_words_only()
+    test_title_label_priority()
+    test_title_fallback_and_nested_skill()
+    test_overlapping_label_and_term()
+    test_vocabulary_is_data_driven()
+    print("\n✅ Job description tests completed!")
@@ -237,6 +237,309 @@ def test_message_formatting():
     print(f"Formatted length: {len(formatted_message)} characters")
     print(f"Formatted message preview: {formatted_message[:200]}...")
 
+def test_compiled_templates_match_format():
+    """Precompiled rendering gives exactly the messages of format + regex cleanup, for the same seed"""
+    import random
+    import re
+
+    message_gen = MessageGenerator()
+    job = "Software Engineer, ML Research at Windsurf (Codeium)"
+
+    def legacy_message(candidate):
+        highlights = message_gen.extract_candidate_highlights(candidate, job)
+        score = candidate.get('fit_score', 5.0)
+        category = "high_score" if score >= 8.0 else "medium_score" if score >= 6.0 else "low_score"
+        try:
+            opening = random.choice(message_gen.templates[category]).format(**highlights)
+        except KeyError:
+            opening = f"Hi {highlights['name']}, I came across your profile and was impressed by your background."
+        message = f"{opening}\n\n{message_gen.generate_job_context(job)}\n\n{random.choice(message_gen.cta_templates)}"
+        return re.sub(r'\n\s*\n\s*\n', '\n\n', message).strip()
+
+    names = ["Dr. Sarah Chen", "", "Unknown", "  Padded  ", "Two\n\n\nLines", "\n", "{name}"]
+    candidates = [
+        {
+            "name": name,
+            "fit_score": score,
+            "score_breakdown": {"skills": 9.0, "company": 8.0, "education": 6.0, "location": 10.0},
+            "profile_data": {"skills": ["python", "pytorch"], "experience": ["Meta", "Startup"],
+                             "education": ["MIT"], "location": "Mountain View, CA"}
+        }
+        for name in names for score in (9.1, 6.5, 3.0)
+    ]
+    # Templates the renderer cannot shortcut: missing fields, format specs, blank lines, empty CTAs
+    message_gen.templates['low_score'].append("Hi {name}, about {missing_field}")
+    message_gen.templates['low_score'].append("{name:>12}\n\n\n{key_skill!r}")
+    message_gen.cta_templates.extend(["", "\n\n\nLet's talk!\n\n\n"])
+
+    for seed in range(20):
+        random.seed(seed)
+        expected = [legacy_message(c) for c in candidates]
+        random.seed(seed)
+        actual = [message_gen.generate_personalized_message(c, job) for c in candidates]
+        assert actual == expected
+
+    # Highlights are extracted once per candidate and reused as key_highlights
+    random.seed(1)
+    batch = message_gen.generate_messages_for_candidates(candidates, job, max_messages=len(candidates))
+    random.seed(1)
+    assert [m['message'] for m in batch] == [legacy_message(c) for c in candidates]
+    assert batch[0]['key_highlights'] == message_gen.extract_candidate_highlights(candidates[0], job)
+
+    # Editing the templates recompiles them
+    message_gen.templates['high_score'] = ["Hello {name}!"]
+    assert message_gen.generate_personalized_message(candidates[0], job).startswith("Hello Dr. Sarah Chen!")
+    print("✅ Compiled templates render the same messages as str.format + cleanup")
+
+def test_streaming_message_export():
+    """Messages are yielded one at a time and streamed to NDJSON / CSV with periodic flushes"""
+    import csv
+    import io
+    import os
+    import random
+    import tempfile
+    from outreach_export import CSV_FIELDS, CSVWriter, MessageWriter, NDJSONWriter, export_messages
+    from records import OutreachMessage
+
+    message_gen = MessageGenerator()
+    job = "Software Engineer, ML Research at Windsurf (Codeium)"
+    breakdown = {"education": 9.0, "trajectory": 7.0, "company": 8.5, "skills": 9.5, "location": 10.0, "tenure": 6.0}
+
+    consumed = []
+
+    def candidates(count):
+        for i in range(count):
+            consumed.append(i)
+            yield {"name": f"Candidate {i}", "linkedin_url": f"https://linkedin.com/in/candidate-{i}",
+                   "fit_score": 5.0 + i % 5, "score_breakdown": breakdown,
+                   "profile_data": {"skills": ["python", "pytorch"], "experience": ["Google"], "location": "Remote"}}
+
+    # Lazy: the first message is ready before the rest of the pool has been read
+    stream = message_gen.iter_messages(candidates(1000), job)
+    first = next(stream)
+    assert isinstance(first, OutreachMessage) and first.candidate_name == "Candidate 0"
+    assert consumed == [0]
+
+    # Same messages as the list-building API for the same seed
+    random.seed(3)
+    expected = message_gen.generate_messages_for_candidates(list(candidates(25)), job, max_messages=20, as_records=True)
+    random.seed(3)
+    streamed = list(message_gen.iter_messages(candidates(25), job, max_messages=20))
+    assert streamed == expected
+
+    class CountingBuffer(io.StringIO):
+        flushes = 0
+
+        def flush(self):
+            self.flushes += 1
+            super().flush()
+
+    buffer = CountingBuffer()
+    assert NDJSONWriter(buffer, flush_every=4).write_all(streamed) == 20
+    assert buffer.flushes == 6  # every 4 messages, plus once at the end
+    lines = buffer.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [m.to_dict() for m in streamed]
+
+    buffer = io.StringIO(newline='')
+    CSVWriter(buffer).write_all(streamed[:3])
+    rows = list(csv.DictReader(io.StringIO(buffer.getvalue(), newline='')))
+    assert list(rows[0]) == list(CSV_FIELDS)
+    assert rows[1]['message'] == streamed[1].message  # multi-line messages survive quoting
+    assert float(rows[1]['skills']) == 9.5
+    assert json.loads(rows[1]['key_highlights']) == streamed[1].key_highlights
+
+    # Files are picked by extension; dict messages work too
+    directory = tempfile.mkdtemp()
+    assert export_messages(message_gen.iter_messages(candidates(7), job), os.path.join(directory, "out.jsonl")) == 7
+    dicts = message_gen.generate_messages_for_candidates(list(candidates(2)), job)
+    assert export_messages(dicts, os.path.join(directory, "out.csv")) == 2
+    try:
+        export_messages([], os.path.join(directory, "out.xlsx"))
+        assert False, "unsupported format accepted"
+    except ValueError:
+        pass
+    try:
+        MessageWriter(io.StringIO())
+        assert False, "abstract writer instantiated"
+    except TypeError:
+        pass
+    print("✅ Messages stream to NDJSON and CSV")
+
+def test_single_pass_message_analysis():
+    """One-pass analysis matches the per-indicator substring checks; indicators follow the job"""
+    import random
+    from job_description import JobDescription
+    from message_analyzer import MessageAnalyzer, MessageIndicators
+
+    def legacy_analysis(message):
+        lowered = message.lower()
+        return {
+            'length': len(message),
+            'personalization_score': sum(1 for indicator in [
+                'your experience', 'your background', 'your work', 'your expertise',
+                'your skills', 'your role', 'your profile'] if indicator in lowered),
+            'professional_tone': True,
+            'has_call_to_action': any(cta in lowered for cta in ['would you', 'are you', 'i\'d love', 'i\'d appreciate', 'open to']),
+            'mentions_company': 'windsurf' in lowered or 'codeium' in lowered,
+            'mentions_role': 'ml research' in lowered or 'software engineer' in lowered,
+            'mentions_skills': any(skill in lowered for skill in ['python', 'ml', 'ai', 'llm', 'pytorch', 'tensorflow'])
+        }
+
+    fragments = ["Your Experience", "your work", "your workflow", "your skillset", "Would You", "OPEN TO",
+                 "I'd love", "Windsurf", "codeium", "ML Research", "software engineers", "HTML", "said",
+                 "pytorch", "tensorflow", "LLMs", "python", "hello", "\n\n", " ", "your", "you"]
+    rng = random.Random(0)
+    message_gen = MessageGenerator()
+    messages = [
+        {'candidate_name': f"Candidate {i}", 'fit_score': round(rng.uniform(3, 10), 1),
+         'message': ''.join(rng.choice(fragments) for _ in range(rng.randint(0, 12)))}
+        for i in range(500)
+    ]
+    for msg in messages:
+        assert message_gen.analyze_message_effectiveness(msg['message']) == legacy_analysis(msg['message'])
+
+    # The summary is built in the same traversal, from a stream as well as a list
+    summary = message_gen.create_message_summary(iter(messages))
+    assert summary['total_messages'] == 500
+    assert summary['average_score'] == sum(m['fit_score'] for m in messages) / 500
+    assert sum(summary['score_distribution'].values()) == 500
+    assert [a['analysis'] for a in summary['message_analysis']] == [legacy_analysis(m['message']) for m in messages]
+    assert message_gen.create_message_summary([])['average_score'] == 0
+
+    # Indicators come from the job rather than being fixed
+    indicators = MessageIndicators.for_job("Acme (Acme Labs)", "Solution Architect, Data", skills=["Spark", "AWS"])
+    assert indicators.company == ('acme', 'acme labs') and indicators.role == ('solution architect', 'data')
+    analysis = MessageAnalyzer(indicators).analyze("Hi! Acme Labs needs a Solution Architect with Spark.")
+    assert analysis['mentions_company'] and analysis['mentions_role'] and analysis['mentions_skills']
+    assert not MessageAnalyzer(indicators).analyze("Windsurf wants python")['mentions_company']
+    assert MessageIndicators().company == () and MessageIndicators().role == ()
+    assert not MessageAnalyzer().analyze("Windsurf (Codeium) ML Research")['mentions_company']
+
+    message_gen = MessageGenerator(job_context={'company': "Acme", 'role': "Platform Engineer"})
+    assert message_gen.job_context['location'] == "Mountain View, CA (or remote)"
+    assert "Platform Engineer position at Acme" in message_gen.generate_job_context("")
+    job = JobDescription(text="...", title="Gen AI Solution Architect", skills=["langchain"])
+    analysis = message_gen.analyze_message_effectiveness("Acme is hiring a Gen AI Solution Architect (LangChain)", job)
+    assert analysis['mentions_company'] and analysis['mentions_role'] and analysis['mentions_skills']
+    assert not message_gen.analyze_message_effectiveness("Windsurf")['mentions_company']
+    print("✅ Single-pass analysis matches substring checks")
+
+def test_distinct_message_variations():
+    """Variations are distinct, reproducible per seed, and enumerated lazily"""
+    import random
+    from message_renderer import shuffled_range
+
+    message_gen = MessageGenerator()
+    job = "Software Engineer, ML Research at Windsurf (Codeium)"
+    candidate = {
+        "name": "Dr. Sarah Chen",
+        "fit_score": 8.7,
+        "score_breakdown": {"skills": 9.5, "company": 9.0, "education": 9.5, "location": 8.0},
+        "profile_data": {"skills": ["python", "pytorch"], "experience": ["Google"], "education": ["Stanford"],
+                         "location": "Mountain View, CA"}
+    }
+
+    space = len(message_gen.templates['high_score']) * len(message_gen.cta_templates)
+    variations = message_gen.generate_message_variations(candidate, job, num_variations=100, seed=42)
+    assert len(variations) == len(set(variations)) == space
+    assert message_gen.generate_message_variations(candidate, job, 5, seed=42) == variations[:5]
+    assert message_gen.generate_message_variations(candidate, job, 5, seed=43) != variations[:5]
+
+    # Openings that fall back to the same text are not repeated
+    message_gen.templates['high_score'] = ["Hi {name}, {missing}", "Hello {name}, {missing}"]
+    variations = message_gen.generate_message_variations(candidate, job, 100, seed=1)
+    assert len(variations) == len(set(variations)) == len(message_gen.cta_templates)
+
+    # A large space costs only what is taken from it
+    message_gen.templates['high_score'] = [f"Hi {{name}}, template {i}" for i in range(1000)]
+    message_gen.cta_templates = [f"CTA {i}?" for i in range(1000)]
+    variations = list(message_gen.generate_message_variations(candidate, job, 3, seed=7))
+    assert len(set(variations)) == 3
+
+    order = list(shuffled_range(50, random.Random(0)))
+    assert sorted(order) == list(range(50)) and order != list(range(50))
+    print("✅ Message variations are distinct and seedable")
+
+def test_render_cache_reuses_bodies():
+    """Identical highlight sets render once; the name is swapped in and the output is unchanged"""
+    import random
+    from message_renderer import RenderCache
+
+    job = "Software Engineer, ML Research at Windsurf (Codeium)"
+    breakdown = {"education": 5.0, "trajectory": 6.0, "company": 5.0, "skills": 6.0, "location": 5.0, "tenure": 7.0}
+    # As in sourcing_results.json: empty profiles and one breakdown for everyone
+    candidates = [{"name": name, "fit_score": 5.6, "score_breakdown": breakdown, "profile_data": {}}
+                  for name in ["Ana Ruiz", "Bo Li", "", "Unknown", " Spaced ", "Multi\nLine", "X"] * 40]
+
+    cached = MessageGenerator()
+    uncached = MessageGenerator(render_cache_size=0)
+    assert uncached.render_cache is None
+
+    # The default templates: one body per (template, CTA) pair, whatever the name
+    random.seed(3)
+    expected = uncached.generate_messages_for_candidates(candidates, job, max_messages=100)
+    random.seed(3)
+    assert cached.generate_messages_for_candidates(candidates, job, max_messages=100) == expected
+    stats = cached.render_cache.stats()
+    space = len(cached.templates['low_score']) * len(cached.cta_templates)
+    assert stats['entries'] <= space and stats['hits'] >= 50 - space
+    hits, lookups = stats['hits'], stats['hits'] + stats['misses']
+
+    # Multi-paragraph openings get the full cleanup, once per highlight set
+    for generator in (cached, uncached):
+        generator.templates['low_score'] = [
+            "Hi {name},\n\n\nYour {key_skill} background stood out.",
+            "Hello {name},\n\nI noticed your work at {company_experience}.",
+            "{name} -\n\n\n\nquick note about {key_skill}"
+        ]
+    random.seed(5)
+    expected = [uncached.generate_personalized_message(c, job) for c in candidates]
+    random.seed(5)
+    assert [cached.generate_personalized_message(c, job) for c in candidates] == expected
+
+    stats = cached.render_cache.stats()
+    # One body per (template, CTA) pair; names that could interact with the cleanup bypass the cache
+    space = len(cached.templates['low_score']) * len(cached.cta_templates)
+    assert stats['entries'] <= space and stats['hits'] + stats['misses'] - lookups == 200
+    assert stats['hits'] - hits >= 200 - space
+
+    # Bounded, least recently used evicted first
+    cache = RenderCache(maxsize=2)
+    cache.put(('a',), "A")
+    cache.put(('b',), "B")
+    assert cache.get(('a',)) == "A"
+    cache.put(('c',), "C")
+    assert cache.get(('b',)) is None and cache.get(('a',)) == "A"
+    assert cache.stats()['evictions'] == 1 and cache.stats()['entries'] == 2
+
+    # Safe to share between threads: every lookup is counted, the bound holds
+    from concurrent.futures import ThreadPoolExecutor
+    shared = RenderCache(maxsize=8)
+
+    def churn(worker):
+        for i in range(2000):
+            if shared.get((worker, i % 16)) is None:
+                shared.put((worker, i % 16), ("piece",))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(churn, range(4)))
+    shared_stats = shared.stats()
+    assert shared_stats['hits'] + shared_stats['misses'] == 8000 and shared_stats['entries'] == 8
+
+    # Too few repeats in the first sample lookups: rendered directly from then on, until cleared
+    sampled = RenderCache(maxsize=8, sample=10)
+    for i in range(20):
+        sampled.get((i,))
+    assert sampled.stats()['bypassed'] and sampled.stats()['misses'] == 20
+    sampled.clear()
+    assert not sampled.bypassed
+
+    # Changing the templates empties the cache
+    cached.templates['low_score'] = ["Hey {name}!\n\n\nBye"]
+    assert cached.generate_personalized_message(candidates[0], job).startswith("Hey Ana Ruiz!\n\nBye")
+    assert cached.render_cache.stats()['entries'] == 1
+    print("✅ Render cache reuses message bodies")
+
 if __name__ == "__main__":
     # Test individual message generation
     test_message_generation()
@@ -247,6 +550,21 @@ if __name__ == "__main__":
     # Test message formatting
     test_message_formatting()
     
+    # Test compiled template rendering
+    test_compiled_templates_match_format()
+    
+    # Test streaming export
+    test_streaming_message_export()
+    
+    # Test message analysis
+    test_single_pass_message_analysis()
+    
+    # Test message variations
+    test_distinct_message_variations()
+    
+    # Test render cache
+    test_render_cache_reuses_bodies()
+    
     print("\n✅ Message generation tests completed!")
     print("\nNext steps:")
     print("1. Run 'python main_integrated.py' to test complete pipeline")
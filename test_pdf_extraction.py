@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for PDF text extraction
+Uses the bundled job description PDF and an isolated cache database
+"""
+
+import os
+import shutil
+import tempfile
+
+from linkedin_agent import LinkedInProfileFinder
+from pdf_cache import PDFTextCache, hash_pdf_bytes
+from pdf_extraction import PDFTextExtractor, available_backends
+
+PDF_PATH = "Data & AI-JD-Gen AI Solution architect.pdf"
+
+
+def make_finder() -> LinkedInProfileFinder:
+    return LinkedInProfileFinder(cache_db=os.path.join(tempfile.mkdtemp(), "cache.db"))
+
+
+def test_repeat_upload_hits_cache():
+    """The second extraction of identical bytes is served from the cache"""
+    finder = make_finder()
+    first = finder.extract_text_from_pdf(PDF_PATH)
+
+    # Same bytes under a different name still hit
+    renamed = os.path.join(tempfile.mkdtemp(), "renamed_upload.pdf")
+    shutil.copy(PDF_PATH, renamed)
+    second = finder.extract_text_from_pdf(renamed)
+
+    stats = finder.pdf_cache.stats()
+    print(f"Cache stats: {stats}")
+    assert first and first == second
+    assert stats['misses'] == 1 and stats['hits'] == 1
+    assert stats['entries'] == 1
+
+
+def test_cache_entry_metadata():
+    finder = make_finder()
+    text = finder.extract_text_from_pdf(PDF_PATH)
+    with open(PDF_PATH, 'rb') as f:
+        entry = finder.pdf_cache.get(hash_pdf_bytes(f.read()), finder.pdf_extractor.version)
+    assert entry['text'] == text
+    assert entry['page_count'] == 4
+    assert entry['extractor_version'] == finder.pdf_extractor.version
+
+
+def test_extractor_version_mismatch_is_a_miss():
+    cache = PDFTextCache(os.path.join(tempfile.mkdtemp(), "cache.db"))
+    cache.put("abc", "some text", 1, "old-extractor")
+    assert cache.get("abc", "new-extractor") is None
+    assert cache.get("abc", "old-extractor")['text'] == "some text"
+
+
+def test_size_bounded_eviction():
+    """Least recently used entries are evicted once the byte budget is exceeded"""
+    # touch_interval=0 records every access, so the order below is exact
+    cache = PDFTextCache(os.path.join(tempfile.mkdtemp(), "cache.db"), max_bytes=250, touch_interval=0.0)
+    cache.put("a", "a" * 100, 1, "v1")
+    cache.put("b", "b" * 100, 1, "v1")
+    cache.get("a", "v1")  # touch "a" so "b" is the LRU entry
+    cache.put("c", "c" * 100, 1, "v1")
+
+    assert cache.get("b", "v1") is None
+    assert cache.get("a", "v1") is not None
+    assert cache.get("c", "v1") is not None
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['total_bytes'] <= 250
+
+
+def test_image_only_pdf_is_cached_too():
+    """Scanned PDFs with no text layer are not re-parsed on every upload"""
+    finder = make_finder()
+    assert finder.extract_text_from_pdf("Job_Description.pdf") == ""
+    assert finder.extract_text_from_pdf("Job_Description.pdf") == ""
+    assert finder.pdf_cache.stats()['hits'] == 1
+
+
+def test_backends_extract_same_content():
+    """Every installed backend finds the same words in the bundled PDF"""
+    with open(PDF_PATH, 'rb') as f:
+        data = f.read()
+    for name in available_backends():
+        text, page_count = PDFTextExtractor(backend=name).extract(data)
+        print(f"{name}: {page_count} pages, {len(text)} chars")
+        assert page_count == 4
+        assert "champions" in text
+
+
+def test_parallel_extraction_matches_serial():
+    """Page-parallel extraction joins pages back in document order"""
+    with open(PDF_PATH, 'rb') as f:
+        data = f.read()
+    serial = PDFTextExtractor(backend="pypdf2").extract(data)
+    parallel = PDFTextExtractor(backend="pypdf2", workers=2, min_parallel_pages=1).extract(data)
+    assert parallel == serial
+
+
+if __name__ == "__main__":
+    test_repeat_upload_hits_cache()
+    test_cache_entry_metadata()
+    test_extractor_version_mismatch_is_a_miss()
+    test_size_bounded_eviction()
+    test_image_only_pdf_is_cached_too()
+    test_backends_extract_same_content()
+    test_parallel_extraction_matches_serial()
+    print("\n✅ PDF extraction tests completed!")
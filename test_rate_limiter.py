@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared per-host rate limiter
+Uses a mocked transport, so timings only reflect the limiter
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import httpx
+
+from candidate_scorer import CandidateScorer
+from http_client import SharedHttpClient
+from rate_limiter import RateLimiter, TokenBucket, parse_retry_after
+
+
+def make_client(handler, host_rates) -> SharedHttpClient:
+    return SharedHttpClient(transport=httpx.MockTransport(handler), rate_limiter=RateLimiter(host_rates))
+
+
+def test_requests_are_paced_across_threads():
+    """Many threads share one budget: 1 burst token plus 20/s"""
+    client = make_client(lambda request: httpx.Response(200), {'google.com': (20.0, 1)})
+    sent = []
+
+    def worker():
+        for _ in range(3):
+            client.get_sync("https://www.google.com/search?q=x")
+            sent.append(time.perf_counter())
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    print(f"12 requests at 20/s took {elapsed:.2f}s")
+
+    assert len(sent) == 12
+    assert elapsed >= 11 / 20 * 0.9
+    stats = client.rate_limiter.stats()['google.com']
+    assert stats['requests'] == 12
+    assert stats['wait_seconds'] > 0
+    client.close()
+
+
+def test_hosts_have_separate_buckets():
+    limiter = RateLimiter({'linkedin.com': (0.5, 2)}, default_rate=(3.0, 1))
+    assert limiter.bucket("https://in.linkedin.com/in/a") is limiter.bucket("https://www.linkedin.com/in/b")
+    assert limiter.bucket("https://example.com/") is not limiter.bucket("https://www.linkedin.com/")
+    assert limiter.current_rate("uk.linkedin.com") == 0.5
+    assert limiter.current_rate("https://example.com/x") == 3.0
+
+
+def test_backoff_and_recovery():
+    """429/503 halve the rate and pause; successes climb back to, never past, the budget"""
+    bucket = TokenBucket(max_rate=4.0, burst=2, recovery=0.25)
+    bucket.record(429)
+    assert bucket.rate == 2.0
+    assert bucket.paused_until > time.monotonic()
+    bucket.record(503, retry_after=30)
+    assert bucket.rate == 1.0
+    assert bucket.stats()['paused_for'] > 29
+    assert bucket.throttled == 2
+
+    for _ in range(10):
+        bucket.record(200)
+    assert bucket.rate == 4.0
+
+    for _ in range(20):
+        bucket.record(429, retry_after=0)
+    assert bucket.rate == bucket.min_rate == 0.25
+
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_throttled_response_slows_the_host():
+    """A 429 with Retry-After holds back the next request to that host"""
+    statuses = iter([429, 200])
+    client = make_client(
+        lambda request: httpx.Response(next(statuses), headers={'Retry-After': '0.3'}),
+        {'linkedin.com': (100.0, 5)}
+    )
+    assert client.get_sync("https://www.linkedin.com/in/a").status_code == 429
+    assert client.rate_limiter.current_rate("www.linkedin.com") == 50.0
+
+    start = time.perf_counter()
+    assert client.get_sync("https://www.linkedin.com/in/a").status_code == 200
+    assert time.perf_counter() - start >= 0.25
+    client.close()
+
+
+def test_profile_fetches_use_shared_client():
+    """CandidateScorer fetches profiles through the rate-limited client"""
+    page = "<html><head><title>Sarah Chen | LinkedIn</title></head><body>python pytorch</body></html>"
+    client = make_client(lambda request: httpx.Response(200, text=page), {'linkedin.com': (100.0, 5)})
+    scorer = CandidateScorer(http_client=client, cache_db=os.path.join(tempfile.mkdtemp(), "cache.db"))
+    profile = scorer.extract_profile_data("https://www.linkedin.com/in/sarah-chen")
+    assert profile['name'] == "Sarah Chen"
+    assert 'python' in profile['skills']
+    assert client.rate_limiter.stats()['linkedin.com']['requests'] == 1
+    client.close()
+
+
+if __name__ == "__main__":
+    test_requests_are_paced_across_threads()
+    test_hosts_have_separate_buckets()
+    test_backoff_and_recovery()
+    test_throttled_response_slows_the_host()
+    test_profile_fetches_use_shared_client()
+    print("\n✅ Rate limiter tests completed!")
@@ -4,9 +4,26 @@ Test script for candidate scoring functionality
 Demonstrates the fit score algorithm with sample data
 """
 
-from candidate_scorer import CandidateScorer
-from run import LinkedInProfileFinder
+from batch_scoring import BatchScorer, CandidateColumns
+from candidate_scorer import CandidateScorer, JobRequirements, job_requirements
+from job_description import JobDescription
+from http_client import SharedHttpClient
+from linkedin_agent import LinkedInProfileFinder
+from rate_limiter import RateLimiter
+from skill_matcher import SkillMatcher
+from profile_cache import ProfileCache
+from profile_parser import parse_profile_html
+from ranking import TopKRanker
+from records import Candidate, OutreachMessage, ProfileData, to_jsonable
+from message_generator import MessageGenerator
+import asyncio
+import httpx
 import json
+import os
+import random
+import tempfile
+import threading
+import time
 
 def test_scoring_with_sample_data():
     """Test scoring with sample candidate data"""
@@ -73,8 +90,8 @@ def test_scoring_with_sample_data():
         }
     ]
     
-    # Initialize scorer
-    scorer = CandidateScorer()
+    # Initialize scorer (its profile cache in a temporary database)
+    scorer = CandidateScorer(profile_cache=ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db")))
     
     print("🎯 Testing Candidate Scoring System")
     print("=" * 50)
@@ -132,9 +149,13 @@ def test_integration_with_linkedin_search():
     pdf_path = "Data & AI-JD-Gen AI Solution architect.pdf"
     
     try:
-        # Step 1: Find candidates
+        # Step 1: Parse the job description once and find candidates
         print("Step 1: Finding LinkedIn profiles...")
-        candidates = finder.find_profiles_from_pdf(pdf_path, max_results=5)
+        job = finder.parse_job_description(pdf_path)
+        if not job:
+            print("Could not read the job description PDF.")
+            return
+        candidates = finder.find_profiles(job, max_results=5)
         
         if not candidates:
             print("No candidates found. Using sample data for demonstration.")
@@ -144,8 +165,7 @@ def test_integration_with_linkedin_search():
         
         # Step 2: Score candidates
         print("\nStep 2: Scoring candidates...")
-        job_description = finder.extract_text_from_pdf(pdf_path)
-        scored_candidates = scorer.score_candidates(candidates, job_description)
+        scored_candidates = scorer.score_candidates(candidates, job)
         
         # Step 3: Display top results
         print(f"\n🏆 TOP {min(3, len(scored_candidates))} CANDIDATES")
@@ -170,9 +190,286 @@ def test_integration_with_linkedin_search():
     except Exception as e:
         print(f"Error during integration test: {e}")
 
+def test_concurrent_profile_fetching():
+    """Profile fetches overlap up to the concurrency limit and the ranking matches sequential scoring"""
+    skills_by_profile = ["python", "python pytorch llm", "", "pytorch", "python nlp", "", "llm gpt", "python"]
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    async def handler(request):
+        with lock:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+        await asyncio.sleep(0.1)
+        with lock:
+            in_flight.pop()
+        i = int(str(request.url).rsplit('-', 1)[1])
+        return httpx.Response(200, text=f"<html><title>Person {i} | LinkedIn</title><body>{skills_by_profile[i]}</body></html>")
+
+    limiter = RateLimiter(host_rates={}, default_rate=(1000.0, 1000))
+    client = SharedHttpClient(transport=httpx.MockTransport(handler), rate_limiter=limiter)
+    scorer = CandidateScorer(http_client=client, max_concurrency=4,
+                             profile_cache=ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db"), ttl=0))
+    job = "ML engineer with Python, PyTorch and LLM experience"
+
+    def candidates():
+        return [{"name": f"Person {i}", "linkedin_url": f"https://www.linkedin.com/in/person-{i}"}
+                for i in range(len(skills_by_profile))]
+
+    start = time.perf_counter()
+    concurrent = scorer.score_candidates(candidates(), job)
+    elapsed = time.perf_counter() - start
+    sequential = scorer.score_candidates(candidates(), job, concurrent=False)
+    print(f"Concurrent scoring of 8 profiles took {elapsed:.2f}s (peak in-flight {max(peak)})")
+
+    assert max(peak) == 4
+    assert elapsed < 8 * 0.1 * 0.75
+    assert [c['linkedin_url'] for c in concurrent] == [c['linkedin_url'] for c in sequential]
+    assert [c['fit_score'] for c in concurrent] == sorted((c['fit_score'] for c in concurrent), reverse=True)
+    # Equal scores keep their input order
+    tied = [c['linkedin_url'] for c in concurrent if c['fit_score'] == concurrent[-1]['fit_score']]
+    assert tied == sorted(tied, key=lambda url: int(url.rsplit('-', 1)[1]))
+    client.close()
+
+def test_profile_cache_revalidation():
+    """Repeat profiles are served from the cache, and stale ones revalidate with a conditional GET"""
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(dict(request.headers))
+        if request.headers.get('if-none-match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Oct 2025 10:00:00 GMT'},
+                              text="<html><title>Sarah Chen | LinkedIn</title><body>python pytorch</body></html>")
+
+    limiter = RateLimiter(host_rates={}, default_rate=(1000.0, 1000))
+    client = SharedHttpClient(transport=httpx.MockTransport(handler), rate_limiter=limiter)
+    cache = ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db"), ttl=60)
+    scorer = CandidateScorer(http_client=client, profile_cache=cache)
+
+    first = scorer.extract_profile_data("https://www.linkedin.com/in/sarah-chen")
+    assert first['name'] == "Sarah Chen"
+    # Same profile under another URL form: fresh, so no request at all
+    assert scorer.extract_profile_data("https://in.linkedin.com/in/Sarah-Chen/?trk=x") == first
+    assert len(requests_seen) == 1
+
+    cache.ttl = 0
+    assert scorer.extract_profile_data("https://www.linkedin.com/in/sarah-chen") == first
+    assert len(requests_seen) == 2
+    assert requests_seen[1]['if-none-match'] == '"v1"'
+    assert requests_seen[1]['if-modified-since'] == 'Wed, 01 Oct 2025 10:00:00 GMT'
+    assert cache.stats()['revalidated'] == 1
+
+    # Duplicates within one batch share a single fetch
+    candidates = [{"linkedin_url": "https://www.linkedin.com/in/sarah-chen"} for _ in range(3)]
+    scorer.score_candidates(candidates, "Python engineer")
+    assert len(requests_seen) == 3
+    client.close()
+
+def test_skill_matcher_word_boundaries():
+    """Skills match whole words only, overlapping skills are all reported, in text order"""
+    matcher = CandidateScorer(profile_cache=ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db"))).skill_matcher
+    text = ("Transformer models, GPT-4 and LLMs at scale. C++/CUDA on GPUs. "
+            "Scikit-learn, Hugging Face; javascript frontends. Programming in R and Julia.")
+    assert matcher.find(text) == [
+        'gpt', 'gpt-4', 'llm', 'c++', 'cuda', 'gpu', 'scikit-learn', 'hugging face', 'r', 'julia'
+    ]
+    assert matcher.find("Partner at a transformation consultancy") == []
+
+    big = SkillMatcher([f"skill{i}" for i in range(20000)] + ["deep learning", "learning"])
+    assert big.size == 20002
+    assert big.find("Deep learning and skill19999, not skill7x or deep-learning") == [
+        'deep learning', 'learning', 'skill19999'
+    ]
+
+def test_batch_scoring_matches_per_candidate():
+    """BatchScorer gives exactly calculate_fit_score's numbers, including empty and missing fields"""
+    scorer = CandidateScorer(profile_cache=ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db")))
+    batch = BatchScorer(scorer)
+    phrases = [
+        "MIT", "Stanford University", "State College", "Maintenance Academy", "Computer Science", "",
+        "Google", "Acme Inc", "Senior Data Scientist", "Lead", "Director of ML", "Head of Platform",
+        "San Francisco, CA", "Bay Area", "Remote", "Bengaluru, India", "python", "PyTorch", "llm", "r", "c++"
+    ]
+    rng = random.Random(7)
+
+    def text():
+        return ' '.join(rng.choice(phrases) for _ in range(rng.randint(0, 3)))
+
+    candidates = []
+    for _ in range(500):
+        profile = {field: [text() for _ in range(rng.randint(0, 8))]
+                   for field in ('education', 'experience', 'skills') if rng.random() < 0.9}
+        profile['headline'] = text()
+        if rng.random() < 0.9:
+            profile['location'] = rng.choice([text(), None])
+        candidates.append({'name': f"Candidate {len(candidates)}", 'profile_data': profile})
+
+    jobs = [
+        "Senior ML Engineer in San Francisco: Python, PyTorch, LLM, AWS, R and C++",
+        "Data scientist, remote from anywhere",
+        "Analytics lead in India",
+        "",
+    ]
+    for job in jobs:
+        expected = [scorer.calculate_fit_score(c, job) for c in candidates]
+        assert batch.calculate_fit_scores(candidates, job) == expected
+        print(f"{len(candidates)} candidates, {len({r['total_score'] for r in expected})} distinct totals: identical")
+
+    ranked = batch.score_candidates(candidates, jobs[0])
+    assert [c['name'] for c in ranked] == [c['name'] for c in scorer.score_candidates(candidates, jobs[0])]
+
+    columns = CandidateColumns.from_profiles([c['profile_data'] for c in candidates])
+    assert columns.size == 500
+    assert len(columns.skills.values.categories) < len(columns.skills.values.codes)
+
+    # List fields present but None (as scraped profiles can have) score like empty lists
+    nulls = [{'name': 'Null Lists', 'profile_data': {'education': None, 'experience': None, 'skills': None,
+                                                      'headline': "Senior Data Scientist", 'location': "Remote"}}]
+    empties = [{'name': 'Null Lists', 'profile_data': {**nulls[0]['profile_data'],
+                                                        'education': [], 'experience': [], 'skills': []}}]
+    for job in jobs:
+        assert ([r['total_score'] for r in batch.calculate_fit_scores(nulls, job)]
+                == [scorer.calculate_fit_score(c, job)['total_score'] for c in empties])
+    assert CandidateColumns.from_profiles([nulls[0]['profile_data']]).skills.offsets.tolist() == [0, 0]
+
+def test_job_requirements_compiled_once():
+    """A job is compiled once into JobRequirements; scores match scoring from the raw text"""
+    text = "Senior ML Engineer, San Francisco or Remote. Python, PyTorch, LLMs and C++."
+    job = JobDescription(text=text, title="ML Engineer", skills=["python", "pytorch", "rust"])
+    requirements = job_requirements(job)
+    assert requirements.locations == ('san francisco', 'remote')
+    assert requirements.remote
+    assert requirements.skills == {'python', 'pytorch'}
+    assert requirements.mentions('llm') and requirements.mentions('c++') and not requirements.mentions('rust')
+    assert requirements.mentions('ML') is False  # profile skills are not lowercased, as before
+    assert job_requirements(job) is requirements
+    assert job_requirements(text) is job_requirements(text)
+    assert job_requirements(requirements) is requirements
+    assert JobRequirements.compile("On-site in Austin").locations == ('austin',)
+
+    scorer = CandidateScorer(profile_cache=ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db")))
+    candidate = {'profile_data': {
+        'headline': 'Lead Engineer', 'location': 'Bay Area', 'education': ['Stanford University'],
+        'experience': ['Google', 'Acme Inc'], 'skills': ['python', 'pytorch', 'llm', 'c++', 'rust']
+    }}
+    expected = scorer.calculate_fit_score(candidate, text)
+    assert scorer.calculate_fit_score(candidate, job) == expected
+    assert scorer.calculate_fit_score(candidate, requirements) == expected
+    assert expected['breakdown']['skills'] == 8.0 and expected['breakdown']['location'] == 8.0
+
+def test_streaming_top_k_ranking():
+    """rank_candidates yields leaderboards as it goes and ends with score_candidates' top k"""
+    scorer = CandidateScorer(profile_cache=ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db")))
+    rng = random.Random(3)
+    schools = ["MIT", "State College", "Community School", ""]
+    companies = ["Google", "Senior Engineer at DataCo", "Acme Inc", "Consultant"]
+    candidates = [
+        {'name': f"Candidate {i}", 'linkedin_url': f"https://www.linkedin.com/in/candidate-{i}",
+         'profile_data': {'education': rng.sample(schools, rng.randint(0, 2)),
+                          'experience': rng.sample(companies, rng.randint(0, 4)),
+                          'skills': rng.sample(["python", "pytorch", "aws", "java"], rng.randint(0, 4)),
+                          'location': rng.choice(["Seattle", "Berlin", ""])}}
+        for i in range(230)
+    ]
+    job = "Senior Python engineer in Seattle with PyTorch and AWS"
+
+    leaderboards = list(scorer.rank_candidates(iter(candidates), job, top_k=7, batch_size=50))
+    assert [board['summary']['scored'] for board in leaderboards] == [50, 100, 150, 200, 230]
+    final = leaderboards[-1]
+    expected = scorer.score_candidates(candidates, job)
+    # Many candidates tie, so this also checks ties keep input order
+    assert [c['name'] for c in final['top_candidates']] == [c['name'] for c in expected[:7]]
+    assert all('profile_data' in c for c in final['top_candidates'])
+    assert not any('profile_data' in c for board in leaderboards[:-1] for c in board['top_candidates']
+                   if c not in final['top_candidates'])
+
+    summary = final['summary']
+    scores = [c['fit_score'] for c in expected]
+    assert summary['max_score'] == max(scores) and summary['min_score'] == min(scores)
+    assert sum(summary['score_distribution'].values()) == 230
+    assert summary['average_score'] == round(sum(scores) / len(scores), 2)
+
+    assert list(scorer.rank_candidates([], job)) == [{'top_candidates': [], 'summary': TopKRanker(1).summary.to_dict()}]
+
+def test_candidate_records():
+    """as_records=True gives slotted records that read like the dicts and serialize to the same JSON"""
+    scorer = CandidateScorer(profile_cache=ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db")))
+    job = "Senior Python engineer in Seattle with PyTorch and AWS"
+    candidates = [
+        {'name': name, 'linkedin_url': f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}",
+         'headline': 'ML Engineer',
+         'profile_data': json.loads(json.dumps({
+             'name': name, 'headline': 'Lead ML Engineer', 'location': 'Seattle, WA',
+             'education': ['Stanford University'], 'experience': ['Google', 'Acme Inc'],
+             'skills': ['python', 'pytorch'], 'summary': ''
+         }))}
+        for name in ("Sarah Chen", "Raj Patel")
+    ]
+    dicts = scorer.score_candidates(candidates, job)
+    records = scorer.score_candidates(candidates, job, as_records=True)
+
+    assert [r.to_dict() for r in records] == dicts
+    assert json.loads(json.dumps(to_jsonable(records))) == dicts
+    first, second = records
+    assert not hasattr(first, '__dict__')
+    assert first['fit_score'] == first.fit_score and first.get('missing', 'x') == 'x'
+    assert first['profile_data'].get('skills', []) == ('python', 'pytorch')
+    # Strings shared across candidates are stored once
+    assert first.profile_data.education[0] is second.profile_data.education[0]
+    assert first.profile_data.location is second.profile_data.location
+
+    unscored = Candidate.from_dict({'name': 'Ann Lee', 'linkedin_url': 'https://www.linkedin.com/in/ann-lee'})
+    assert 'profile_data' not in unscored and unscored.to_dict() == {
+        'name': 'Ann Lee', 'linkedin_url': 'https://www.linkedin.com/in/ann-lee', 'headline': ''
+    }
+    assert Candidate.from_dict(dicts[0]) == first
+
+    messages = MessageGenerator().generate_messages_for_candidates(records, job, max_messages=1, as_records=True)
+    assert isinstance(messages[0], OutreachMessage)
+    assert messages[0].score_breakdown is first.score_breakdown
+    assert messages[0]['candidate_name'] == "Sarah Chen"
+    assert set(to_jsonable(messages[0])) == {
+        'candidate_name', 'linkedin_url', 'fit_score', 'message', 'score_breakdown', 'key_highlights'
+    }
+
+def test_profile_parsing_in_worker_processes():
+    """parse_profile_html is pure, so profile pages can be parsed in a process pool"""
+    page = ("<html><head><title>Sarah Chen | LinkedIn</title></head><body>"
+            "<div class='text-body-medium'>Lead ML Engineer</div><span class='text-body-small'>Seattle</span>"
+            "<section id='experience'><h3>Google</h3></section><section id='education'><h3>MIT</h3></section>"
+            "<p>PyTorch and LLMs in production</p></body></html>")
+    profile = parse_profile_html(page, frozenset({'pytorch', 'llm', 'java'}))
+    assert profile == ProfileData(name='Sarah Chen', headline='Lead ML Engineer', location='Seattle',
+                                  education=('MIT',), experience=('Google',), skills=('pytorch', 'llm'))
+
+    client = SharedHttpClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=page)),
+                              rate_limiter=RateLimiter(host_rates={}, default_rate=(1000.0, 1000)))
+    scorer = CandidateScorer(http_client=client, parse_workers=1,
+                             profile_cache=ProfileCache(os.path.join(tempfile.mkdtemp(), "cache.db")))
+    try:
+        fetched = scorer.extract_profile_data("https://www.linkedin.com/in/sarah-chen")
+        assert scorer.parse_executor is not None
+        assert fetched == scorer.parse_profile_page(page)
+        assert fetched['experience'] == ['Google'] and 'pytorch' in fetched['skills']
+        # Scorers share one pool per worker count instead of starting their own processes
+        other = CandidateScorer(http_client=client, parse_workers=1, profile_cache=scorer.profile_cache)
+        assert other.parse_executor is scorer.parse_executor
+    finally:
+        client.close()
+
 if __name__ == "__main__":
     # Test with sample data first
     test_scoring_with_sample_data()
+    test_concurrent_profile_fetching()
+    test_profile_cache_revalidation()
+    test_skill_matcher_word_boundaries()
+    test_batch_scoring_matches_per_candidate()
+    test_job_requirements_compiled_once()
+    test_streaming_top_k_ranking()
+    test_candidate_records()
+    test_profile_parsing_in_worker_processes()
     
     # Test integration with LinkedIn search
     test_integration_with_linkedin_search()
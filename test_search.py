@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Test script for the LinkedIn search layer
+Runs searches against a mocked Google transport so no live traffic is sent
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+import httpx
+
+from http_client import SharedHttpClient
+from linkedin_agent import LinkedInProfileFinder
+from rate_limiter import RateLimiter
+from serp_parser import PARSERS, get_parser
+
+SERP_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "serp")
+
+SAMPLE_SERP = """
+<html><body>
+<div class="g"><a href="/url?q=https://www.linkedin.com/in/sarah-chen&sa=U"><h3>Sarah Chen - Senior ML Engineer - Google</h3></a></div>
+<div class="g"><a href="https://www.linkedin.com/in/alex-rodriguez"><h3>Alex Rodriguez | AI Engineer</h3></a></div>
+<div class="g"><a href="https://example.com/not-a-profile"><h3>Unrelated</h3></a></div>
+</body></html>
+"""
+
+
+def make_finder(handler) -> LinkedInProfileFinder:
+    """Finder with an isolated cache and a mocked HTTP transport"""
+    cache_db = os.path.join(tempfile.mkdtemp(), "cache.db")
+    # Effectively unlimited, so tests measure concurrency rather than pacing
+    limiter = RateLimiter(host_rates={}, default_rate=(1000.0, 1000))
+    client = SharedHttpClient(transport=httpx.MockTransport(handler), rate_limiter=limiter)
+    return LinkedInProfileFinder(http_client=client, cache_db=cache_db)
+
+
+def test_sync_wrapper_parses_results():
+    """The blocking wrapper returns parsed profiles from the async path"""
+    finder = make_finder(lambda request: httpx.Response(200, text=SAMPLE_SERP))
+    profiles = finder.search_linkedin_via_google("AI Solution Architect Python", max_results=10)
+    print(f"Parsed profiles: {profiles}")
+
+    assert [p['linkedin_url'] for p in profiles] == [
+        "https://www.linkedin.com/in/sarah-chen",
+        "https://www.linkedin.com/in/alex-rodriguez",
+    ]
+    assert profiles[0]['name'] == "Sarah Chen"
+    assert profiles[0]['headline'] == "Senior ML Engineer - Google"
+    assert profiles[1]['headline'] == "AI Engineer"
+    finder.http_client.close()
+
+
+def test_searches_share_one_loop():
+    """Concurrent searches overlap on the shared loop instead of queueing"""
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    async def handler(request):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        await asyncio.sleep(0.2)
+        with lock:
+            active.pop()
+        return httpx.Response(200, text=SAMPLE_SERP)
+
+    finder = make_finder(handler)
+    queries = [f"AI Engineer query {i}" for i in range(8)]
+
+    start = time.perf_counter()
+    results = finder.search_many(queries)
+    elapsed = time.perf_counter() - start
+    print(f"8 searches took {elapsed:.2f}s (peak in-flight: {max(peak)})")
+
+    assert len(results) == 8
+    assert all(len(r) == 2 for r in results)
+    assert max(peak) > 1
+    assert elapsed < 8 * 0.2
+    finder.http_client.close()
+
+
+def test_network_error_returns_empty():
+    """HTTP errors are reported and yield no profiles"""
+    finder = make_finder(lambda request: httpx.Response(429, text="Too Many Requests"))
+    assert finder.search_linkedin_via_google("AI Engineer", max_results=5) == []
+    finder.http_client.close()
+
+
+def serp_for(*slugs: str) -> str:
+    links = ''.join(
+        f'<div class="g"><a href="https://www.linkedin.com/in/{slug}"><h3>{slug.title()} - AI Engineer</h3></a></div>'
+        for slug in slugs
+    )
+    return f"<html><body>{links}</body></html>"
+
+
+def fallback_handler(pages, delays, served):
+    """Empty page for the job's own query; per-fallback pages after per-fallback delays"""
+    async def handler(request):
+        query = request.url.params['q'].replace('site:linkedin.com/in ', '')
+        await asyncio.sleep(delays.get(query, 0))
+        served.append(query)
+        return httpx.Response(200, text=pages.get(query, "<html></html>"))
+    return handler
+
+
+def test_fallbacks_race_and_cancel():
+    """Fallback queries run together; the first to find anyone wins and the rest are cancelled"""
+    served = []
+    pages = {"AI Engineer Python": serp_for("fast-one"), "Data Scientist Python": serp_for("slow-one")}
+    delays = {"AI Solution Architect Python": 0.3, "Machine Learning Engineer Python": 0.3,
+              "AI Engineer Python": 0.1, "Data Scientist Python": 0.2, "Software Engineer AI": 0.5}
+    finder = make_finder(fallback_handler(pages, delays, served))
+    job = finder.job_description_from_text("Role: Prompt Whisperer\nAnywhere\n")
+
+    start = time.perf_counter()
+    profiles = finder.find_profiles(job, max_results=5)
+    elapsed = time.perf_counter() - start
+    print(f"Fallback race took {elapsed:.2f}s, served {served}")
+
+    assert [p['linkedin_url'] for p in profiles] == ["https://www.linkedin.com/in/fast-one"]
+    assert elapsed < 0.3
+    time.sleep(0.5)
+    assert "Software Engineer AI" not in served  # cancelled before it was answered
+    finder.http_client.close()
+
+
+def test_fallbacks_merge_and_dedupe():
+    served = []
+    pages = {
+        "AI Solution Architect Python": serp_for("ana", "bo"),
+        "Machine Learning Engineer Python": serp_for("bo", "cy"),
+        "AI Engineer Python": serp_for("cy", "di"),
+    }
+    finder = make_finder(fallback_handler(pages, {}, served))
+    job = finder.job_description_from_text("Role: Prompt Whisperer\nAnywhere\n")
+
+    profiles = finder.find_profiles(job, max_results=10, fallback="merge")
+    assert sorted(p['linkedin_url'].rsplit('/', 1)[1] for p in profiles) == ["ana", "bo", "cy", "di"]
+
+    capped = finder.find_profiles(job, max_results=3, fallback="merge")
+    assert len(capped) == 3
+    assert len({p['linkedin_url'] for p in capped}) == 3
+
+    try:
+        finder.find_profiles(job, fallback="sequential")
+        assert False, "unknown fallback strategy should raise"
+    except ValueError:
+        pass
+    finder.http_client.close()
+
+
+def paged_handler(pages, served, delay=0.0):
+    """Serve pages[start // 10] for each results page request"""
+    async def handler(request):
+        start = int(request.url.params.get('start', 0))
+        served.append(start)
+        await asyncio.sleep(delay)
+        page = start // 10
+        return httpx.Response(200, text=serp_for(*pages[page]) if page < len(pages) else "<html></html>")
+    return handler
+
+
+def test_iter_profiles_pages_lazily():
+    """Profiles arrive page by page; paging stops at the first page with nothing new"""
+    served = []
+    pages = [["ana-1", "bo-1"], ["cy-2", "ana-1"], ["di-3"]]
+    finder = make_finder(paged_handler(pages, served))
+
+    urls = [p['linkedin_url'].rsplit('/', 1)[1] for p in finder.iter_profiles("AI Engineer", max_pages=10)]
+    assert urls == ["ana-1", "bo-1", "cy-2", "di-3"]
+    assert served[:4] == [0, 10, 20, 30]
+    assert max(served) <= 40  # the empty page ends paging, plus at most one prefetch
+    finder.http_client.close()
+
+
+def test_iter_profiles_stops_with_consumer():
+    """Breaking out early cancels prefetched pages instead of fetching the rest"""
+    served = []
+    pages = [[f"page{i}-a", f"page{i}-b"] for i in range(10)]
+    finder = make_finder(paged_handler(pages, served, delay=0.1))
+
+    start = time.perf_counter()
+    first = None
+    for profile in finder.iter_profiles("AI Engineer", max_pages=10, prefetch=1):
+        first = first or time.perf_counter() - start
+        if profile['linkedin_url'].endswith("page1-a"):
+            break
+    time.sleep(0.3)
+    print(f"First profile after {first:.2f}s; pages served: {served}")
+
+    assert first < 0.2  # the first page is yielded before later pages finish
+    assert sorted(served) == [0, 10, 20]  # current page + one prefetch, never the rest
+    finder.http_client.close()
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(SERP_FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_streaming_parser_matches_full_soup():
+    """The streaming parser returns exactly what the full-tree parser did, on every saved page"""
+    for name in sorted(os.listdir(SERP_FIXTURES)):
+        html = load_fixture(name)
+        for max_results in (1, 3, 10, 50):
+            expected = PARSERS['soup'].parse(html, max_results)
+            assert PARSERS['stream'].parse(html, max_results) == expected, (name, max_results)
+
+
+def test_fixture_results():
+    desktop = get_parser('stream').parse(load_fixture("desktop_results.html"), 10)
+    assert len(desktop) == 10
+    assert all('linkedin.com/in/' in p['linkedin_url'] for p in desktop)
+    assert all(p['name'].count(' - ') == 2 and p['headline'].startswith("LinkedIn") for p in desktop)
+
+    basic = get_parser('stream').parse(load_fixture("basic_html_results.html"), 10)
+    assert all(p['linkedin_url'].startswith("https://in.linkedin.com/in/") for p in basic)
+    assert all('&' not in p['linkedin_url'] for p in basic)
+
+    # Image-only links take their title from an h3 or div.title beside them
+    sibling = get_parser('stream').parse(load_fixture("sibling_titles.html"), 10)
+    assert sibling[0] == {"name": "Fatima Tanaka", "headline": "Gen AI Architect",
+                          "linkedin_url": "https://www.linkedin.com/in/fatima-tanaka-c3fde9"}
+    assert sibling[1]['headline'] == "Principal AI Engineer at Infosys"
+    assert sibling[1]['linkedin_url'] == "https://www.linkedin.com/in/priya-novak-6c5a44"
+
+    assert get_parser('stream').parse(load_fixture("consent_page.html"), 10) == []
+
+
+def test_strainer_parser_reads_titles_inside_links():
+    """Strained parsing only sees the links themselves"""
+    html = load_fixture("desktop_results.html")
+    assert PARSERS['strainer'].parse(html, 10) == PARSERS['soup'].parse(html, 10)
+    assert PARSERS['strainer'].parse(load_fixture("sibling_titles.html"), 10) == []
+
+
+def test_parser_selection():
+    assert get_parser('soup') is PARSERS['soup']
+    try:
+        get_parser('lxml-magic')
+        assert False, "unknown parser should raise"
+    except ValueError as e:
+        assert 'stream' in str(e)
+
+    finder = make_finder(lambda request: httpx.Response(200, text=SAMPLE_SERP))
+    finder.serp_parser = get_parser('strainer')
+    profiles = finder.search_linkedin_via_google("AI Engineer", max_results=10)
+    assert [p['name'] for p in profiles] == ["Sarah Chen", "Alex Rodriguez"]
+    finder.http_client.close()
+
+
+if __name__ == "__main__":
+    test_sync_wrapper_parses_results()
+    test_searches_share_one_loop()
+    test_network_error_returns_empty()
+    test_fallbacks_race_and_cancel()
+    test_fallbacks_merge_and_dedupe()
+    test_iter_profiles_pages_lazily()
+    test_iter_profiles_stops_with_consumer()
+    test_streaming_parser_matches_full_soup()
+    test_fixture_results()
+    test_strainer_parser_reads_titles_inside_links()
+    test_parser_selection()
+    print("\n✅ Search tests completed!")